@@ -58,6 +58,16 @@ def parse_args() -> argparse.Namespace:
                         help="Enable AI video generation using Azure Sora-2 model")
     parser.add_argument("--deep-research", dest="deep_research", action="store_true",
                         help="Enable deep research mode with multi-agent planning and execution")
+    parser.add_argument("--research-concurrency", dest="research_concurrency", type=int, default=3,
+                        help="Research dimensions researched in parallel in deep research mode")
+    parser.add_argument("--search-cache", dest="search_cache", default="artifacts/search_cache.sqlite",
+                        help="SQLite file caching web search results across runs")
+    parser.add_argument("--no-search-cache", dest="search_cache", action="store_const", const=None,
+                        help="Always call the search API instead of using the cache")
+    parser.add_argument("--search-cache-ttl", dest="search_cache_ttl", type=float, default=24 * 3600,
+                        help="Seconds a cached search result stays fresh")
+    parser.add_argument("--offline-search", dest="offline_search", action="store_true",
+                        help="Serve searches only from the cache (replay a previous run)")
     parser.add_argument("--debug", action="store_true",
                         help="Enable debug output showing agent execution details")
     return parser.parse_args()
@@ -74,6 +84,10 @@ def main() -> None:
             enable_image_generation=args.enable_image_gen,
             enable_video_generation=args.enable_video_gen,
             enable_deep_research=args.deep_research,
+            research_concurrency=args.research_concurrency,
+            search_cache_path=args.search_cache,
+            search_cache_ttl=args.search_cache_ttl,
+            search_cache_offline=args.offline_search,
             debug=args.debug,
         ),
     )
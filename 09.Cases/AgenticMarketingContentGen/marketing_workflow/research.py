@@ -3,6 +3,7 @@
 import asyncio
 import json
 import sys
+import time
 from typing import Any, Mapping, Optional
 
 from agent_framework import (
@@ -21,6 +22,51 @@ from typing import Annotated
 from .schemas import MarketingStrategy
 from .utils import extract_json_object
 
+# Dispatch order for research dimensions; unknown priorities rank as medium.
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+DIMENSION_RESEARCHER_INSTRUCTIONS = """You are a market researcher. Research exactly ONE dimension of a marketing topic.
+
+**Task**: Execute the search queries given for this dimension and summarize findings.
+
+**Workflow**:
+1. Run all of the dimension's search queries in ONE web_search_batch call (use web_search only for follow-up queries)
+2. Use search_depth="advanced" to get more comprehensive results
+3. Extract key information: data, trends, case studies, pain points, opportunities
+4. Record information sources
+
+**Output format**:
+```json
+{
+  "dimension": "Research dimension",
+  "key_insights": ["Insight 1", "Insight 2"],
+  "data_points": ["Specific data or statistics"],
+  "trends": ["Discovered trends"],
+  "sources": ["Source URLs"],
+  "overview": "What this dimension reveals about the overall market",
+  "competitive_notes": "Competitors and positioning found (empty string if none)",
+  "opportunity_areas": ["Identified opportunity areas"]
+}
+```
+
+⚠️ Important: You MUST actually call the search tools to get real data, do not fabricate information!
+Output only JSON, do not include other content.
+"""
+
+
+def create_dimension_researcher(
+    chat_client: ChatClientProtocol,
+    search_tool: Any,
+    batch_search_tool: Any = None,
+) -> ChatAgent:
+    """Create a researcher agent for a single research dimension (one per concurrent run)."""
+    return ChatAgent(
+        chat_client=chat_client,
+        name="researcher",
+        instructions=DIMENSION_RESEARCHER_INSTRUCTIONS,
+        tools=[search_tool] + ([batch_search_tool] if batch_search_tool is not None else []),
+    )
+
 
 def create_research_agents(
     chat_client: ChatClientProtocol,
@@ -158,7 +204,8 @@ class DeepResearchExecutor(Executor):
     This executor replaces the simple strategy_agent with a multi-agent research
     workflow that:
     1. Plans the research strategy
-    2. Executes multiple searches across different dimensions
+    2. Researches each dimension in its own researcher run, up to
+       ``max_concurrency`` at a time, high-priority dimensions first
     3. Synthesizes findings into a comprehensive MarketingStrategy
     
     The output format matches what downstream agents expect from strategy_agent.
@@ -171,12 +218,18 @@ class DeepResearchExecutor(Executor):
         *,
         debug: bool = False,
         max_rounds: int = 10,
+        max_concurrency: int = 3,
+        dimension_timeout: Optional[float] = 300.0,
+        batch_search_tool: Any = None,
     ) -> None:
         super().__init__(id="deep-research-executor")
         self._chat_client = chat_client
         self._search_tool = search_tool
+        self._batch_search_tool = batch_search_tool
         self._debug = debug
         self._max_rounds = max_rounds
+        self._max_concurrency = max(1, max_concurrency)
+        self._dimension_timeout = dimension_timeout
         self._author = "strategy_agent"  # Use same author name for compatibility
         
         # Create research agents
@@ -263,7 +316,120 @@ class DeepResearchExecutor(Executor):
             }
 
     async def _run_research(self, topic: str, plan: dict[str, Any]) -> dict[str, Any]:
-        """Run the researcher agent to execute searches."""
+        """Research every plan dimension concurrently and merge the findings.
+
+        Dimensions are independent, so each gets its own researcher run. At most
+        ``max_concurrency`` run at once and high-priority dimensions are started
+        first; the merge follows plan order, so the result does not depend on
+        which run finishes first.
+        """
+        dimensions = [d for d in plan.get("research_dimensions") or [] if isinstance(d, dict)]
+        if not dimensions:
+            return await self._run_research_single(topic, plan)
+
+        order = sorted(
+            range(len(dimensions)),
+            key=lambda i: (PRIORITY_ORDER.get(str(dimensions[i].get("priority", "")).lower(), 1), i),
+        )
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        started = time.perf_counter()
+
+        async def research(index: int) -> dict[str, Any]:
+            async with semaphore:  # FIFO: tasks are created in priority order
+                return await self._research_dimension(topic, plan, dimensions[index])
+
+        tasks = {i: asyncio.create_task(research(i)) for i in order}
+        results = await asyncio.gather(*(tasks[i] for i in range(len(dimensions))))
+        self._debug_print(
+            f"   {len(dimensions)} dimensions researched in {time.perf_counter() - started:.1f}s "
+            f"(concurrency {self._max_concurrency})"
+        )
+        return self._merge_findings(topic, results)
+
+    async def _research_dimension(
+        self,
+        topic: str,
+        plan: dict[str, Any],
+        dimension: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Run one researcher on a single dimension. Failures become an empty finding."""
+        name = str(dimension.get("dimension") or "Unnamed dimension")
+        researcher = create_dimension_researcher(
+            self._chat_client, self._search_tool, self._batch_search_tool
+        )
+        prompt = f"""Please research the following dimension of a marketing topic.
+
+**Topic**: {topic}
+
+**Topic Analysis**: {plan.get("topic_analysis", "")}
+
+**Dimension**:
+{json.dumps(dimension, ensure_ascii=False, indent=2)}
+
+Run this dimension's search queries (web_search_batch runs them all in one call) and summarize findings.
+"""
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(researcher.run(prompt), timeout=self._dimension_timeout)
+            finding = json.loads(extract_json_object(response.text or ""))
+            if not isinstance(finding, dict):
+                raise ValueError("finding is not a JSON object")
+        except Exception as e:
+            self._debug_print(f"⚠️ Research failed for '{name}': {type(e).__name__}: {e}")
+            finding = {}
+        self._debug_print(f"   ✓ {name} ({time.perf_counter() - started:.1f}s)")
+        finding["dimension"] = name
+        return finding
+
+    @staticmethod
+    def _merge_findings(topic: str, results: list[dict[str, Any]]) -> dict[str, Any]:
+        """Combine per-dimension findings (in plan order) into the research_findings JSON."""
+
+        def as_list(value: Any) -> list[str]:
+            if value is None:
+                return []
+            if isinstance(value, str):
+                return [value] if value.strip() else []
+            if not isinstance(value, (list, tuple)):
+                value = [value]  # e.g. a bare number or object from the model
+            return [str(v) for v in value if str(v).strip()]
+
+        def unique(items: list[str]) -> list[str]:
+            seen: set[str] = set()
+            out = []
+            for item in items:
+                key = item.strip().lower()
+                if key not in seen:
+                    seen.add(key)
+                    out.append(item)
+            return out
+
+        findings = []
+        overviews, competition, opportunities = [], [], []
+        for result in results:
+            name = result["dimension"]
+            findings.append({
+                "dimension": name,
+                "key_insights": as_list(result.get("key_insights")),
+                "data_points": as_list(result.get("data_points")),
+                "trends": as_list(result.get("trends")),
+                "sources": unique(as_list(result.get("sources"))),
+            })
+            if str(result.get("overview") or "").strip():
+                overviews.append(f"{name}: {str(result['overview']).strip()}")
+            if str(result.get("competitive_notes") or "").strip():
+                competition.append(f"{name}: {str(result['competitive_notes']).strip()}")
+            opportunities.extend(as_list(result.get("opportunity_areas")))
+
+        return {
+            "research_findings": findings,
+            "market_overview": "\n".join(overviews) or f"Research on {topic}",
+            "competitive_landscape": "\n".join(competition) or "To be analyzed",
+            "opportunity_areas": unique(opportunities),
+        }
+
+    async def _run_research_single(self, topic: str, plan: dict[str, Any]) -> dict[str, Any]:
+        """Run the researcher agent on the whole plan (used when it lists no dimensions)."""
         researcher = self._research_agents["researcher"]
         
         # Build research prompt with plan
@@ -6,23 +6,40 @@ import asyncio
 import base64
 import inspect
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Annotated, Any, Optional, List
+from typing import Annotated, Any, Optional, List, Sequence
 
 from agent_framework import ai_function
 
 from .schemas import CampaignPackage
-from .utils import dump_json, ensure_directory, slugify, timestamp_id
+from .search_cache import SearchCache
+from .utils import dump_json, ensure_directory, normalize_url, slugify, timestamp_id
 
 
 class TavilySearchTools:
-    """Web search tool using Tavily API for market research and content gathering."""
+    """Web search tool using Tavily API for market research and content gathering.
 
-    def __init__(self, *, api_key: Optional[str] = None) -> None:
+    ``TavilyClient.search`` is blocking, so searches run on a bounded thread pool
+    (``max_workers``) and the tools are async: a search never blocks the
+    workflow's event loop, and ``search_many`` runs a batch of queries at once.
+    When a ``SearchCache`` is given, repeated searches are served from it.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: Optional[str] = None,
+        max_workers: int = 4,
+        cache: Optional[SearchCache] = None,
+    ) -> None:
         self._api_key = api_key or os.getenv("Tvly_API_KEY")
         self._client: Any = None
+        self._cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tavily")
         self._search_tool = self._create_search_tool()
+        self._search_batch_tool = self._create_search_batch_tool()
 
     def _get_client(self) -> Any:
         """Lazily initialize the Tavily client."""
@@ -41,20 +58,97 @@ class TavilySearchTools:
         """Return the bound tool function for use with ChatAgent."""
         return self._search_tool
 
+    @property
+    def search_batch(self) -> Any:
+        """Return the bound batch-search tool function for use with ChatAgent."""
+        return self._search_batch_tool
+
     def _create_search_tool(self) -> Any:
         """Create a bound ai_function tool for web search."""
 
         @ai_function(description="Search the web for current information, market trends, competitor analysis, or any topic research. Use this to gather real-time data and insights for marketing strategy and content creation.")
-        def web_search(
+        async def web_search(
             query: Annotated[str, "The search query. Be specific and include relevant keywords for better results."],
             search_depth: Annotated[str, "Search depth: 'basic' for quick results, 'advanced' for comprehensive research"] = "basic",
             max_results: Annotated[int, "Maximum number of results to return (1-10)"] = 5,
         ) -> dict[str, Any]:
             """Search the web using Tavily and return relevant results."""
-            return self._do_search(query, search_depth, max_results)
+            return await self.asearch(query, search_depth, max_results)
 
         return web_search
 
+    def _create_search_batch_tool(self) -> Any:
+        """Create a bound ai_function tool that runs several searches concurrently."""
+
+        @ai_function(description="Run several web searches at once and get one merged, deduplicated result list ranked by relevance. Prefer this over repeated web_search calls when you have multiple queries.")
+        async def web_search_batch(
+            queries: Annotated[list[str], "The search queries to run, e.g. one per language or angle."],
+            search_depth: Annotated[str, "Search depth: 'basic' for quick results, 'advanced' for comprehensive research"] = "basic",
+            max_results: Annotated[int, "Maximum number of results per query (1-10)"] = 5,
+        ) -> dict[str, Any]:
+            """Search the web for every query using Tavily and return merged results."""
+            return await self.search_many(queries, search_depth=search_depth, max_results=max_results)
+
+        return web_search_batch
+
+    async def asearch(
+        self,
+        query: str,
+        search_depth: str = "basic",
+        max_results: int = 5,
+    ) -> dict[str, Any]:
+        """Run one search on the search thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._do_search, query, search_depth, max_results)
+
+    async def search_many(
+        self,
+        queries: Sequence[str],
+        *,
+        search_depth: str = "basic",
+        max_results: int = 5,
+    ) -> dict[str, Any]:
+        """Run ``queries`` concurrently and merge their results.
+
+        Duplicate queries run once. Results are deduplicated by normalized URL,
+        keeping the entry with the best score (and every query that found it),
+        and ranked by score; ties keep first-seen order.
+        """
+        unique: dict[str, str] = {}
+        for query in queries:
+            if isinstance(query, str) and query.strip():
+                unique.setdefault(" ".join(query.split()).casefold(), query.strip())
+        responses = await asyncio.gather(
+            *(self.asearch(q, search_depth, max_results) for q in unique.values())
+        )
+
+        merged: dict[str, dict[str, Any]] = {}
+        answers: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        for response in responses:
+            query = response["query"]
+            if response.get("error"):
+                errors[query] = response["error"]
+            if response.get("answer"):
+                answers[query] = response["answer"]
+            for item in response.get("results", []):
+                key = normalize_url(item["url"]) if item.get("url") else f"{query}#{len(merged)}"
+                best = merged.get(key)
+                if best is None:
+                    merged[key] = {**item, "queries": [query]}
+                    continue
+                best["queries"].append(query)
+                if (item.get("score") or 0) > (best.get("score") or 0):
+                    best.update(item)
+
+        ranked = sorted(merged.values(), key=lambda r: -(r.get("score") or 0))  # stable
+        return {
+            "queries": list(unique.values()),
+            "results": ranked,
+            "answers": answers,
+            "errors": errors,
+        }
+
     def _do_search(
         self,
         query: str,
@@ -63,32 +157,19 @@ class TavilySearchTools:
     ) -> dict[str, Any]:
         """Internal method to perform web search."""
         try:
-            client = self._get_client()
-            
             # Clamp max_results to valid range
             max_results = max(1, min(10, max_results))
-            
-            response = client.search(
-                query=query,
-                search_depth=search_depth,
-                max_results=max_results,
+
+            if self._cache is None:
+                return self._fetch_search(query, search_depth, max_results)
+            result = self._cache.get_or_fetch(
+                "tavily",
+                query,
+                search_depth,
+                max_results,
+                lambda: self._fetch_search(query, search_depth, max_results),
             )
-            
-            # Format results for agent consumption
-            results = []
-            for item in response.get("results", []):
-                results.append({
-                    "title": item.get("title", ""),
-                    "url": item.get("url", ""),
-                    "content": item.get("content", ""),
-                    "score": item.get("score", 0),
-                })
-            
-            return {
-                "query": query,
-                "results": results,
-                "answer": response.get("answer", ""),
-            }
+            return {**result, "query": query}
         except Exception as e:
             # Return error info instead of raising exception
             # This allows the agent to handle the error gracefully
@@ -104,6 +185,31 @@ class TavilySearchTools:
             }
 
 
+    def _fetch_search(self, query: str, search_depth: str, max_results: int) -> dict[str, Any]:
+        """Call the Tavily API and format the response for agent consumption."""
+        client = self._get_client()
+        response = client.search(
+            query=query,
+            search_depth=search_depth,
+            max_results=max_results,
+        )
+
+        results = []
+        for item in response.get("results", []):
+            results.append({
+                "title": item.get("title", ""),
+                "url": item.get("url", ""),
+                "content": item.get("content", ""),
+                "score": item.get("score", 0),
+            })
+
+        return {
+            "query": query,
+            "results": results,
+            "answer": response.get("answer", ""),
+        }
+
+
 class SoraVideoGenerationTools:
     """Tool for generating videos using Azure OpenAI Sora-2 model.
     
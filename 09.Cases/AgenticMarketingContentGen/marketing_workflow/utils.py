@@ -7,9 +7,11 @@ import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 _JSON_BLOCK_RE = re.compile(r"```(?:json)?(.*?)```", re.DOTALL | re.IGNORECASE)
 _NON_ALNUM_RE = re.compile(r"[^a-z0-9]+", re.IGNORECASE)
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref_src"}
 
 
 def slugify(value: str, *, max_length: int = 60) -> str:
@@ -22,6 +24,31 @@ def slugify(value: str, *, max_length: int = 60) -> str:
     return slug[:max_length]
 
 
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for deduplicating search results.
+
+    Lowercases scheme and host, drops ``www.``, default ports, the fragment,
+    tracking parameters (``utm_*``, ``gclid``, ...) and a trailing slash, and
+    sorts the remaining query parameters. A URL that cannot be parsed (e.g. a
+    non-numeric port) is returned unchanged.
+    """
+
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").lower().removeprefix("www.")
+        if parts.port and (parts.scheme, parts.port) not in (("http", 80), ("https", 443)):
+            host = f"{host}:{parts.port}"
+    except ValueError:
+        return url
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
 def extract_json_object(payload: str) -> str:
     """Best-effort extraction of a JSON object from agent text output.
     
@@ -30,6 +30,7 @@ from agent_framework._workflows._events import ExecutorInvokedEvent, ExecutorCom
 from .agents import MarketingAgents, create_marketing_agents
 from .research import DeepResearchExecutor
 from .schemas import CampaignPackage, CopywritingContent, ImageContent, MarketingStrategy, VideoScript
+from .search_cache import SearchCache
 from .tools import FluxImageGenerationTools, ImageGenerationTools, PackagingTools, SoraVideoGenerationTools, TavilySearchTools
 from .utils import extract_json_object, slugify, timestamp_id
 
@@ -43,6 +44,10 @@ class MarketingWorkflowConfig:
     enable_image_generation: bool = False
     enable_video_generation: bool = False
     enable_deep_research: bool = False
+    research_concurrency: int = 3
+    search_cache_path: Optional[str] = "artifacts/search_cache.sqlite"
+    search_cache_ttl: float = 24 * 3600
+    search_cache_offline: bool = False
     debug: bool = False
     checkpoint_storage: Optional[CheckpointStorage] = None
     default_agent_options: Optional[Mapping[str, Any]] = None
@@ -63,8 +68,15 @@ class AgenticMarketingWorkflow:
         self._config = config or MarketingWorkflowConfig()
         self._packaging_tools = PackagingTools(base_output_dir=Path(self._config.output_dir))
         
-        # Initialize Tavily search tools for research
-        self._tavily_tools = TavilySearchTools()
+        # Initialize Tavily search tools for research, backed by the on-disk search cache
+        self._search_cache: Optional[SearchCache] = None
+        if self._config.search_cache_path:
+            self._search_cache = SearchCache(
+                self._config.search_cache_path,
+                ttl=self._config.search_cache_ttl,
+                offline=self._config.search_cache_offline,
+            )
+        self._tavily_tools = TavilySearchTools(cache=self._search_cache)
         
         # Initialize image tools based on configuration (output_dir set at runtime)
         self._flux_image_tools: Optional[FluxImageGenerationTools] = None
@@ -93,11 +105,13 @@ class AgenticMarketingWorkflow:
             self._deep_research_executor = DeepResearchExecutor(
                 chat_client=chat_client,
                 search_tool=self._tavily_tools.search,
+                batch_search_tool=self._tavily_tools.search_batch,
                 debug=self._config.debug,
+                max_concurrency=self._config.research_concurrency,
             )
         
         # Register web search tool for strategy and copywriting agents
-        tool_registry["strategy_agent"] = [self._tavily_tools.search]
+        tool_registry["strategy_agent"] = [self._tavily_tools.search, self._tavily_tools.search_batch]
         tool_registry["copywriting_agent"] = [self._tavily_tools.search]
         
         if self._flux_image_tools is not None:
@@ -268,6 +282,14 @@ class AgenticMarketingWorkflow:
             if isinstance(event, WorkflowOutputEvent) and isinstance(event.data, CampaignPackage):
                 final_package = event.data
 
+        if debug and self._search_cache is not None:
+            stats = self._search_cache.stats()
+            self._debug_print(
+                f"🔍 Search Cache: {stats['hits']} hits, {stats['stale_hits']} stale hits, "
+                f"{stats['misses']} misses (hit rate {stats['hit_rate']:.0%}), "
+                f"{stats['entries']} entries, {stats['evictions']} evicted"
+            )
+
         if final_package is None:
             raise RuntimeError("Workflow finished without emitting a CampaignPackage payload.")
 
@@ -0,0 +1,106 @@
+"""
+Benchmark HTML-to-markdown extraction of fetched pages.
+
+Compares, over a corpus of saved HTML pages:
+- markdownify: the whole page converted, as fetch_raw_content used to do
+- extract: html_extract.extract_markdown with a character budget, one page at a time
+- extract (pool): the same spread over a process pool, as utils does for fetched pages
+
+Usage:
+    python bench_html_extract.py --corpus ./saved_pages        # *.html / *.htm files
+    python bench_html_extract.py --synthetic 20 --page-kb 800  # generated pages
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from html_extract import extract_markdown
+
+
+def load_corpus(directory: str) -> List[bytes]:
+    paths = sorted(p for p in Path(directory).rglob("*") if p.suffix.lower() in (".html", ".htm"))
+    if not paths:
+        raise SystemExit(f"No .html/.htm files found under {directory}")
+    return [p.read_bytes() for p in paths]
+
+
+def synthetic_corpus(pages: int, page_kb: int) -> List[bytes]:
+    """Pages shaped like news/blog articles: heavy head, navigation, long body, footer."""
+    corpus = []
+    for i in range(pages):
+        head = (
+            f"<head><title>Article {i}</title>"
+            + "<script>" + "var tracker = {id: 1, events: []};" * 400 + "</script>"
+            + "<style>" + ".c{margin:0;padding:0}" * 400 + "</style></head>"
+        )
+        nav = "<header><nav>" + "".join(f"<a href='/s{j}'>Section {j}</a>" for j in range(80)) + "</nav></header>"
+        paragraph = (
+            "<p>Local language models make it possible to run research agents on a laptop, "
+            "keeping data private while trading some quality for latency and cost. </p>"
+        )
+        body, size, section = [], 0, 0
+        while size < page_kb * 1024:
+            block = f"<h2>Part {section}</h2>" + paragraph * 20 + "<ul>" + "<li>key point</li>" * 10 + "</ul>"
+            body.append(block)
+            size += len(block)
+            section += 1
+        footer = "<footer>" + "<a href='/legal'>Legal</a>" * 50 + "</footer>"
+        corpus.append(f"<html>{head}<body>{nav}<main>{''.join(body)}</main>{footer}</body></html>".encode())
+    return corpus
+
+
+def time_serial(convert: Callable[[bytes], str], corpus: List[bytes]) -> Tuple[List[float], int]:
+    timings, chars = [], 0
+    for page in corpus:
+        start = time.perf_counter()
+        chars += len(convert(page))
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, chars
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved HTML pages")
+    parser.add_argument("--synthetic", type=int, default=20, help="generated pages when no corpus is given")
+    parser.add_argument("--page-kb", type=int, default=500, help="size of each generated page")
+    parser.add_argument("--max-chars", type=int, default=2000, help="extraction character budget")
+    parser.add_argument("--workers", type=int, default=2, help="extraction processes for the pool run")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.synthetic, args.page_kb)
+    total_mb = sum(len(page) for page in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} pages, {total_mb:.1f} MB, budget {args.max_chars} chars\n")
+    print(f"{'method':<16} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'avg chars':>10}")
+
+    def report(label: str, timings: List[float], total: float, chars: int) -> None:
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(f"{label:<16} {total:>9.2f} {statistics.median(timings):>9.1f} {p95:>9.1f} {chars // len(corpus):>10}")
+
+    try:
+        from markdownify import markdownify
+    except ImportError:
+        print(f"{'markdownify':<16} skipped (markdownify not installed)")
+    else:
+        start = time.perf_counter()
+        timings, chars = time_serial(lambda page: markdownify(page.decode("utf-8", errors="replace")), corpus)
+        report("markdownify", timings, time.perf_counter() - start, chars)
+
+    start = time.perf_counter()
+    timings, chars = time_serial(lambda page: extract_markdown(page, max_chars=args.max_chars), corpus)
+    report("extract", timings, time.perf_counter() - start, chars)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(extract_markdown, corpus[: args.workers]))  # start the workers
+        start = time.perf_counter()
+        results = list(pool.map(extract_markdown, corpus, ["utf-8"] * len(corpus), [args.max_chars] * len(corpus)))
+        total = time.perf_counter() - start
+    per_page = total * 1000 / len(corpus)
+    report("extract (pool)", [per_page] * len(corpus), total, sum(len(r) for r in results))
+
+
+if __name__ == "__main__":
+    main()
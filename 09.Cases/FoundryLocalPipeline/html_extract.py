@@ -0,0 +1,187 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple, Union
+
+# Elements whose whole subtree is boilerplate rather than page content.
+# No "form": ASP.NET WebForms pages wrap the whole body in one.
+SKIP_TAGS = {
+    "head", "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "aside", "button", "select", "dialog",
+}
+# Site chrome at page level, but an article's own headline / byline inside CONTENT_TAGS
+PAGE_CHROME_TAGS = {"header", "footer"}
+CONTENT_TAGS = {"article", "main"}
+# ARIA landmark roles that mark the same boilerplate on generic elements
+SKIP_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "blockquote", "figure", "figcaption",
+    "table", "tr", "ul", "ol", "dl", "dt", "dd", "br", "hr",
+}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+
+class MarkdownExtractor(HTMLParser):
+    """
+    Incremental HTML-to-markdown extractor with a character budget.
+
+    Feed the document in chunks; boilerplate subtrees (script, style, nav,
+    page-level header and footer, ...) are dropped, and once `max_chars` characters of
+    content have been produced `done` becomes True and further input is ignored,
+    so callers can stop reading the page.
+    """
+
+    def __init__(self, max_chars: int = 2000) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip: Optional[Tuple[str, int]] = None  # (tag, nesting depth) of the skipped subtree
+        self._pre = 0
+        self._pending_break = ""
+        self._prefix = ""  # heading / list marker, written with the element's first text
+        self._content = 0  # open article / main elements
+
+    def feed(self, data: str) -> None:
+        if not self.done:
+            super().feed(data)
+
+    def result(self) -> str:
+        """The markdown extracted so far, at most `max_chars` characters."""
+        text = "".join(self._parts)
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        text = re.sub(r"\n{3,}", "\n\n", text).strip()
+        return text[: self.max_chars]
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._skip is not None:
+            if tag == self._skip[0] and tag not in VOID_TAGS:
+                self._skip = (tag, self._skip[1] + 1)
+            return
+        attributes = dict(attrs)
+        if (
+            tag in SKIP_TAGS
+            or (tag in PAGE_CHROME_TAGS and not self._content)
+            or attributes.get("role") in SKIP_ROLES
+            or "hidden" in attributes
+            or attributes.get("aria-hidden") == "true"
+        ):
+            if tag not in VOID_TAGS:
+                self._skip = (tag, 1)
+            return
+        if tag in CONTENT_TAGS:
+            self._content += 1
+        if tag in HEADING_TAGS:
+            self._break("\n\n")
+            self._prefix = "#" * HEADING_TAGS[tag] + " "
+        elif tag == "li":
+            self._break("\n")
+            self._prefix = "- "
+        elif tag == "pre":
+            self._break("\n\n")
+            self._emit("```\n")
+            self._pre += 1
+        elif tag in ("td", "th"):
+            self._emit(" | ")
+        elif tag in BLOCK_TAGS:
+            self._break("\n\n" if tag in ("p", "blockquote", "table") else "\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip is not None:
+            if tag == self._skip[0]:
+                depth = self._skip[1] - 1
+                self._skip = (tag, depth) if depth else None
+            return
+        if tag in CONTENT_TAGS and self._content:
+            self._content -= 1
+        if tag in HEADING_TAGS or tag == "li":
+            self._prefix = ""
+        if tag in HEADING_TAGS or tag in ("p", "blockquote", "table"):
+            self._break("\n\n")
+        elif tag == "pre" and self._pre:
+            self._pre -= 1
+            self._emit("\n```")
+            self._break("\n\n")
+        elif tag in BLOCK_TAGS or tag == "li":
+            self._break("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip is not None or self.done:
+            return
+        if not self._pre:
+            data = re.sub(r"\s+", " ", data)
+            if not data.strip():
+                if self._parts and not self._parts[-1].endswith((" ", "\n")) and not self._pending_break:
+                    self._pending_break = " "
+                return
+            if self._parts and self._parts[-1].endswith((" ", "\n")):
+                data = data.lstrip(" ")             # text split across feed() calls
+        self._emit(data)
+
+    def _break(self, separator: str) -> None:
+        if self._parts and len(separator) > len(self._pending_break.strip(" ")):
+            self._pending_break = separator
+
+    def _emit(self, text: str) -> None:
+        if self.done:
+            return
+        if self._prefix:
+            text = self._prefix + text.lstrip(" ")
+            self._prefix = ""
+        if self._pending_break:
+            text = self._pending_break + text.lstrip(" ")
+            self._pending_break = ""
+        self._parts.append(text)
+        self._length += len(text)
+        if self._length >= self.max_chars:
+            self.done = True
+
+
+def extract_markdown(
+    html: Union[bytes, str],
+    encoding: str = "utf-8",
+    max_chars: int = 2000,
+    chunk_size: int = 16 * 1024,
+) -> str:
+    """
+    Convert the main content of an HTML page to markdown, within a character budget.
+
+    The page is decoded and parsed `chunk_size` bytes at a time, and parsing
+    stops as soon as `max_chars` characters of content have been extracted, so
+    the tail of a large page is never decoded or parsed.
+
+    Args:
+        html: The raw page, as bytes or already decoded text
+        encoding: Encoding used to decode bytes input
+        max_chars: Character budget of the extracted markdown
+        chunk_size: Size of each incremental parsing step
+
+    Returns:
+        The extracted markdown, at most `max_chars` characters
+    """
+    extractor = MarkdownExtractor(max_chars=max_chars)
+    if isinstance(html, str):
+        for start in range(0, len(html), chunk_size):
+            extractor.feed(html[start:start + chunk_size])
+            if extractor.done:
+                break
+    else:
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        view = memoryview(html)
+        for start in range(0, len(view), chunk_size):
+            extractor.feed(decoder.decode(view[start:start + chunk_size]))
+            if extractor.done:
+                break
+        else:
+            extractor.feed(decoder.decode(b"", final=True))
+    if not extractor.done:
+        extractor.close()
+    return extractor.result()
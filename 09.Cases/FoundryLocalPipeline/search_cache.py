@@ -0,0 +1,203 @@
+"""Persistent, TTL-bounded cache for web search results.
+
+The same module ships as AgenticMarketingContentGen/marketing_workflow/search_cache.py:
+each sample stays standalone, so a change to one copy belongs in the other.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key      TEXT PRIMARY KEY,
+    engine   TEXT NOT NULL,
+    query    TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    expires  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed);
+"""
+
+
+class SearchCacheMiss(LookupError):
+    """Raised in offline mode when a search has no cached result."""
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries share an entry."""
+    return " ".join(query.split()).casefold()
+
+
+def cache_key(engine: str, query: str, depth: str, max_results: int) -> str:
+    """Stable key for a search request."""
+    raw = json.dumps([engine.lower(), normalize_query(query), str(depth).lower(), int(max_results)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """SQLite-backed search cache with per-entry TTL, LRU eviction and stale-while-revalidate.
+
+    Entries are keyed by normalized ``(engine, query, depth, max_results)`` and
+    stored as JSON, so one cache file can be shared by runs, processes and the
+    different search tools. ``get_or_fetch`` resolves a lookup as:
+
+    - fresh entry: returned without calling the API;
+    - expired, but within ``stale_ttl`` of expiry: returned at once while one
+      background refresh per key replaces it;
+    - otherwise: fetched synchronously and stored (unless ``cacheable`` says no).
+
+    With ``offline=True`` any cached entry is served regardless of age and a
+    miss raises ``SearchCacheMiss`` instead of calling the API, which replays a
+    previous run from its cache file alone.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        ttl: float = 24 * 3600,
+        stale_ttl: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        offline: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.offline = offline
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-cache")
+        self._refreshing: set[str] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "evictions": 0}
+
+    def get_or_fetch(
+        self,
+        engine: str,
+        query: str,
+        depth: str,
+        max_results: int,
+        fetch: Callable[[], Any],
+        *,
+        ttl: Optional[float] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached result for the request, calling ``fetch`` only when needed."""
+        key = cache_key(engine, query, depth, max_results)
+        entry = self._get(key)
+        now = time.time()
+        if entry is not None:
+            value, expires = entry
+            if now < expires or self.offline:
+                self._count("hits")
+                return value
+            if now < expires + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh(key, engine, query, fetch, ttl, cacheable)
+                return value
+        if self.offline:
+            self._count("misses")
+            raise SearchCacheMiss(f"No cached {engine} result for {query!r} (offline mode)")
+        self._count("misses")
+        value = fetch()
+        if cacheable is None or cacheable(value):
+            self._put(key, engine, query, value, ttl)
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry count."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._refresher.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Optional[tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0]), row[1]
+
+    def _put(self, key: str, engine: str, query: str, value: Any, ttl: Optional[float]) -> None:
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, engine, query, value, created, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, engine, normalize_query(query), json.dumps(value, ensure_ascii=False), now, expires, now),
+            )
+            # Least recently used entries go first once the cache is over budget.
+            excess = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY accessed ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._stats["evictions"] += excess
+            self._conn.commit()
+
+    def _refresh(
+        self,
+        key: str,
+        engine: str,
+        query: str,
+        fetch: Callable[[], Any],
+        ttl: Optional[float],
+        cacheable: Optional[Callable[[Any], bool]],
+    ) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                value = fetch()
+                if cacheable is None or cacheable(value):
+                    self._put(key, engine, query, value, ttl)
+                    self._count("refreshes")
+                else:
+                    self._count("refresh_errors")
+            except Exception:
+                self._count("refresh_errors")  # keep serving the stale entry
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(run)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
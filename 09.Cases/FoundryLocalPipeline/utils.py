@@ -1,36 +1,214 @@
+import asyncio
+import atexit
+import functools
 import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
 import httpx
-import requests
 from typing import List, Dict, Any, Union, Optional
-from markdownify import markdownify
 from dotenv import load_dotenv
 
+from html_extract import extract_markdown
+from search_cache import SearchCache
+
 load_dotenv()
 
-def fetch_raw_content(url: str) -> Optional[str]:
+# Search results are cached on disk so identical searches (within a run or
+# across runs) skip SerpAPI; set SEARCH_CACHE_PATH="" to disable the cache.
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> Optional[SearchCache]:
     """
-    Fetch HTML content from a URL and convert it to markdown format.
+    Return the shared search cache configured from the environment.
+    
+    SEARCH_CACHE_PATH (default .search_cache/search_cache.sqlite), SEARCH_CACHE_TTL
+    (seconds, default 86400), SEARCH_CACHE_OFFLINE=1 to replay from the cache only.
+    
+    Returns:
+        The SearchCache, or None if caching is disabled
+    """
+    global _search_cache
+    path = os.getenv("SEARCH_CACHE_PATH", ".search_cache/search_cache.sqlite")
+    if _search_cache is None and path:
+        _search_cache = SearchCache(
+            path,
+            ttl=float(os.getenv("SEARCH_CACHE_TTL", 24 * 3600)),
+            offline=os.getenv("SEARCH_CACHE_OFFLINE", "").lower() in ("1", "true", "yes"),
+        )
+    return _search_cache
+
+
+# ---------------------------------------------------------------------------
+# Pooled page fetching
+# ---------------------------------------------------------------------------
+# Every HTTP request (SerpAPI and page fetches) goes through one connection-pooled
+# httpx.AsyncClient owned by a background event loop, so the sync helpers below
+# work from plain scripts and from inside a running workflow loop alike.
+
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", 10.0))
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", 512 * 1024))
+FETCH_MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", 20))
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", 2))
+# Markdown kept per page (search_web previews the first 1000 characters) and the
+# processes converting pages off the event loop (0 = a worker thread instead)
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", 2000))
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", 2))
+
+_TEXT_CONTENT_TYPES = ("text/", "application/xhtml", "application/xml")
+
+
+class _PageFetcher:
+    """Shared AsyncClient and per-host limits, running on a dedicated event loop thread."""
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="page-fetcher", daemon=True)
+        self._thread.start()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._extract_pool: Optional[Executor] = None
+
+    def run(self, coro: Any, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the fetcher loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=FETCH_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=FETCH_MAX_CONNECTIONS,
+                    max_keepalive_connections=FETCH_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    def host_limit(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(FETCH_PER_HOST_LIMIT)
+        return self._host_limits[host]
+
+    async def extract(self, body: bytes, encoding: str) -> str:
+        """Convert a fetched page to markdown in the extraction process pool."""
+        if EXTRACT_WORKERS <= 0:
+            return await asyncio.to_thread(extract_markdown, body, encoding, EXTRACT_MAX_CHARS)
+        if self._extract_pool is None:
+            self._extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._extract_pool, extract_markdown, body, encoding, EXTRACT_MAX_CHARS)
+
+    def close(self) -> None:
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown(cancel_futures=True)
+        if self._client is not None:
+            self.run(self._client.aclose(), timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_fetcher: Optional[_PageFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def _get_fetcher() -> _PageFetcher:
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = _PageFetcher()
+            atexit.register(_fetcher.close)
+    return _fetcher
+
+
+async def _fetch_page(fetcher: _PageFetcher, url: str) -> Optional[str]:
+    """
+    Stream one page, stopping after FETCH_MAX_BYTES, and extract its main content.
     
-    Uses a 10-second timeout to avoid hanging on slow sites or large pages.
+    Scripts, styles and navigation are dropped and at most EXTRACT_MAX_CHARS
+    characters of markdown are kept (see html_extract.extract_markdown).
     
     Args:
+        fetcher: The page fetcher owning the shared client
         url: The URL to fetch content from
         
     Returns:
         The fetched content converted to markdown if successful,
-        None if any error occurs during fetching or conversion
+        None if any error occurs or the page is not text
     """
     try:
-        # Create a client with reasonable timeout
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return markdownify(response.text)
+        async with fetcher.host_limit(url):
+            async with fetcher.client.stream("GET", url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "text/html").lower()
+                if not content_type.startswith(_TEXT_CONTENT_TYPES):
+                    print(f"Warning: Skipping non-text page {url} ({content_type})")
+                    return None
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= FETCH_MAX_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
+        return await fetcher.extract(bytes(body[:FETCH_MAX_BYTES]), encoding)
     except Exception as e:
         print(f"Warning: Failed to fetch full page content for {url}: {str(e)}")
         return None
 
 
+async def _fetch_pages(urls: List[str]) -> List[Optional[str]]:
+    """
+    Fetch several pages concurrently on the shared client (runs on the fetcher loop).
+    
+    Args:
+        urls: The URLs to fetch content from
+        
+    Returns:
+        Markdown content per URL, in order, None where fetching failed
+    """
+    fetcher = _get_fetcher()
+    return list(await asyncio.gather(*(_fetch_page(fetcher, url) for url in urls)))
+
+
+def fetch_many(urls: List[str]) -> List[Optional[str]]:
+    """
+    Fetch several pages concurrently and convert them to markdown.
+    
+    Each fetch is bounded by FETCH_TIMEOUT and FETCH_MAX_BYTES, and at most
+    FETCH_PER_HOST_LIMIT requests run against the same host at once.
+    
+    Args:
+        urls: The URLs to fetch content from
+        
+    Returns:
+        Markdown content per URL, in order, None where fetching failed
+    """
+    if not urls:
+        return []
+    return _get_fetcher().run(_fetch_pages(urls))
+
+
+def fetch_raw_content(url: str) -> Optional[str]:
+    """
+    Fetch HTML content from a URL and convert it to markdown format.
+    
+    Args:
+        url: The URL to fetch content from
+        
+    Returns:
+        The fetched content converted to markdown if successful,
+        None if any error occurs during fetching or conversion
+    """
+    return fetch_many([url])[0]
+
+
+async def _serpapi_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    response = await _get_fetcher().client.get("https://serpapi.com/search", params=params)
+    response.raise_for_status()
+    return response.json()
+
+
 def web_search(
     query: str, 
     max_results: int = 3, 
@@ -51,7 +229,8 @@ def web_search(
     """
     # Get SerpAPI key from environment variable
     api_key = os.getenv("SERPAPI_API_KEY")
-    if not api_key:
+    cache = get_search_cache()
+    if not api_key and not (cache and cache.offline):
         raise ValueError("Please set SERPAPI_API_KEY environment variable")
     
     # Normalize engines to list
@@ -69,13 +248,32 @@ def web_search(
     # Search with each engine
     for engine in engines:
         try:
-            results = _search_with_engine(
+            # Bound now: a stale-while-revalidate refresh may run after the loop moves on
+            search = functools.partial(
+                _search_with_engine,
                 query=query,
                 engine=engine,
                 max_results=max_results,
                 api_key=api_key,
                 fetch_full_page=fetch_full_page
             )
+            
+            if cache is None:
+                results = search()
+            else:
+                # Full-page results carry fetched content, so they are cached separately
+                depth = "full_page" if fetch_full_page else "snippet"
+                results = cache.get_or_fetch(
+                    engine, query, depth, max_results, search,
+                    cacheable=_pages_fetched if fetch_full_page else None,
+                )
+                if os.getenv("SEARCH_CACHE_DEBUG"):
+                    stats = cache.stats()
+                    print(
+                        f"[search cache] {engine} '{query}': hits={stats['hits']} "
+                        f"stale_hits={stats['stale_hits']} misses={stats['misses']} "
+                        f"entries={stats['entries']}"
+                    )
             all_results.extend(results)
         except Exception as e:
             print(f"Warning: Search with {engine} failed: {str(e)}")
@@ -84,6 +282,11 @@ def web_search(
     return all_results
 
 
+def _pages_fetched(results: List[Dict[str, Any]]) -> bool:
+    """Whether every full-page result has its page; a failed fetch must not be cached."""
+    return all(result.get("raw_content") is not None for result in results)
+
+
 def _search_with_engine(
     query: str,
     engine: str,
@@ -118,10 +321,8 @@ def _search_with_engine(
         params["num"] = max_results  # Baidu also supports num parameter
     
     try:
-        # Send request to SerpAPI
-        response = requests.get("https://serpapi.com/search", params=params)
-        response.raise_for_status()
-        data = response.json()
+        # Send request to SerpAPI on the shared pooled client
+        data = _get_fetcher().run(_serpapi_search(params))
         
         # Parse search results
         results = []
@@ -137,26 +338,27 @@ def _search_with_engine(
                 print(f"Warning: Incomplete result from {engine}: {result}")
                 continue
             
-            # Fetch full page content if needed
-            raw_content = content
-            if fetch_full_page:
-                raw_content = fetch_raw_content(url)
-            
             # Add result to list
             search_result = {
                 "title": title,
                 "url": url,
                 "content": content,
-                "raw_content": raw_content,
+                "raw_content": content,
                 "position": result.get("position", 0),
                 "source_engine": engine,
             }
             
             results.append(search_result)
         
+        # Fetch full page content for all results concurrently if needed
+        if fetch_full_page:
+            pages = fetch_many([r["url"] for r in results])
+            for search_result, page in zip(results, pages):
+                search_result["raw_content"] = page
+        
         return results
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Error in {engine} search: {str(e)}")
         print(f"Full error details: {type(e).__name__}")
         raise Exception(f"SerpAPI request failed for {engine}: {str(e)}")
@@ -0,0 +1,96 @@
+"""
+benchmarks/bench_blocking_tools.py
+===================================
+Do other sessions make progress while one tool blocks?
+
+One session calls a blocking sync tool (`time.sleep(--block)`, standing in for a
+slow HTTP fetch or subprocess); `--sessions` other sessions meanwhile run quick
+tool calls back to back. Measured over the blocking call:
+
+    inline     the sync tool called directly on the event loop (the old
+               `result = fn(input_data, vault=...)` dispatch)
+    executor   the same tool through Sandbox.execute, which runs sync tools on
+               the SandboxManager's bounded thread pool
+
+Reported: quick calls completed by the other sessions while the tool blocked,
+their worst latency, and the event loop's worst scheduling lag.
+
+Usage (from maf_harness_managed_agent/):
+    python -m benchmarks.bench_blocking_tools
+    python -m benchmarks.bench_blocking_tools --sessions 20 --block 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from maf_harness.sandbox.sandbox import SandboxManager, SandboxResources, VaultStore
+
+
+def _slow_tool(seconds: str, **_) -> str:
+    time.sleep(float(seconds))
+    return "slow done"
+
+
+async def _slow_inline(seconds: str, **kwargs) -> str:
+    return _slow_tool(seconds, **kwargs)             # blocks the loop, as before
+
+
+async def _lag_probe(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - t0 - interval)
+    return worst * 1000
+
+
+async def _quick_session(mgr: SandboxManager, sid: str, stop: asyncio.Event) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await mgr.execute(sid, "web_search", "status")
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.001)
+    return latencies
+
+
+async def _case(tool: str, sessions: int, block: float) -> tuple[int, float, float, float]:
+    mgr = SandboxManager(VaultStore(), tool_workers=4)
+    mgr.register_tool("slow_inline", _slow_inline)
+    mgr.register_tool("slow", _slow_tool)
+    resources = SandboxResources(timeout_sec=int(block) + 10)
+    sids      = [await mgr.provision(resources) for _ in range(sessions + 1)]
+
+    stop   = asyncio.Event()
+    probe  = asyncio.create_task(_lag_probe(stop))
+    quick  = [asyncio.create_task(_quick_session(mgr, sid, stop)) for sid in sids[1:]]
+    await asyncio.sleep(0.05)                        # let the quick sessions get going
+    t0 = time.perf_counter()
+    await mgr.execute(sids[0], tool, str(block))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    results = await asyncio.gather(*quick)
+    lag_ms  = await probe
+    await mgr.aclose()
+
+    latencies = [ms for r in results for ms in r]
+    return len(latencies), max(latencies, default=0.0), lag_ms, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int,   default=10,  help="sessions making quick calls")
+    parser.add_argument("--block",    type=float, default=1.0, help="seconds the slow tool blocks")
+    args = parser.parse_args()
+
+    print(f"{'dispatch':>9} {'quick calls':>12} {'worst call ms':>14} {'loop lag ms':>12} {'slow tool s':>12}")
+    for label, tool in (("inline", "slow_inline"), ("executor", "slow")):
+        calls, worst, lag, elapsed = asyncio.run(_case(tool, args.sessions, args.block))
+        print(f"{label:>9} {calls:>12} {worst:>14.1f} {lag:>12.1f} {elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+benchmarks/bench_redact.py
+===========================
+Credential redaction cost: per-pattern loops vs. the compiled Redactor.
+
+Cases:
+    replace loop     one `str.replace` per vault secret (the old CredentialVault.redact)
+    marker loop      `any(p in str(msg) for p in patterns)` per message (the old
+                     security middleware — detects only, drops the message)
+    redactor         Redactor(secrets, markers).redact() — one pass, masks in place
+    stream           the same Redactor fed in 4 KB chunks through StreamRedactor
+
+The output is `--size` bytes of log-like text (short words and punctuation) with a few secrets and
+markers planted in it; the one-off compile time is reported separately. Before timing, the
+Redactor is checked to flag every message the marker loop would drop, bare markers included.
+
+Usage (from maf_harness_managed_agent/):
+    python -m benchmarks.bench_redact
+    python -m benchmarks.bench_redact --secrets 10 100 1000 --size 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import string
+import time
+
+from maf_harness.middleware.redact import DEFAULT_MARKERS, Redactor
+
+_SEPARATORS = "  \n.,:{}\"'=/"
+
+
+def _secret(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(24, 48)))
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    """Log-like text: short alphanumeric words between spaces and punctuation."""
+    words, n = [], 0
+    while n < size:
+        word = "".join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(1, 12)))
+        words.append(word + rng.choice(_SEPARATORS))
+        n += len(word) + 1
+    return "".join(words)[:size]
+
+
+def _output(rng: random.Random, size: int, secrets: list[str], planted: int = 20) -> str:
+    parts = [_filler(rng, size // (planted + 1)) for _ in range(planted + 1)]
+    for i in range(planted):
+        parts.insert(2 * i + 1, rng.choice(secrets) if i % 2 else f" Bearer {_secret(rng)} ")
+    return "".join(parts)
+
+
+def _time(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _replace_loop(text: str, secrets: list[str]) -> str:
+    for secret in secrets:
+        if secret and secret in text:
+            text = text.replace(secret, "***REDACTED***")
+    return text
+
+
+def _marker_loop(messages: list[str], patterns: tuple[str, ...]) -> list[str]:
+    return [m for m in messages if not any(p in str(m) for p in patterns)]
+
+
+# Messages the old marker loop dropped must all still be caught, bare markers included.
+_PARITY_CASES = (
+    "FoundryKey",
+    "the key is FoundryKey\n",
+    "Authorization: Bearer ",
+    "password=",
+    "sk-live-1234",
+    "token=\"abc\"",
+    "nothing sensitive here",
+)
+
+
+def _check_parity(redactor: Redactor) -> None:
+    for case in _PARITY_CASES:
+        flagged = any(p in case for p in DEFAULT_MARKERS)
+        assert redactor.contains(case) == flagged, f"marker parity broken for {case!r}"
+        if flagged:
+            assert "***REDACTED***" in redactor.redact(case), f"marker not masked in {case!r}"
+
+
+def _stream(redactor: Redactor, text: str, chunk: int = 4096) -> str:
+    sr  = redactor.stream()
+    out = [sr.feed(text[i:i + chunk]) for i in range(0, len(text), chunk)]
+    out.append(sr.flush())
+    return "".join(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secrets", type=int, nargs="+", default=[10, 100, 1_000])
+    parser.add_argument("--size",    type=int, default=1_000_000, help="tool output size in bytes")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'secrets':>8} {'compile ms':>11} {'replace ms':>11} {'marker ms':>10} "
+          f"{'redactor ms':>12} {'stream ms':>10}")
+    for n in args.secrets:
+        rng     = random.Random(n)
+        secrets = [_secret(rng) for _ in range(n)]
+        text    = _output(rng, args.size, secrets)
+        # The middleware sees the output as one message among a turn's worth of context.
+        messages = [text] + [_filler(rng, 2_000) for _ in range(20)]
+
+        t0       = time.perf_counter()
+        redactor = Redactor(secrets, DEFAULT_MARKERS)
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        _check_parity(redactor)
+        expected = redactor.redact(text)
+        assert _stream(redactor, text) == expected, "stream output differs from one-shot redaction"
+        assert not any(s in expected for s in secrets), "a secret survived redaction"
+
+        replace_ms  = _time(lambda: _replace_loop(text, secrets), args.repeats)
+        marker_ms   = _time(lambda: _marker_loop(messages, DEFAULT_MARKERS), args.repeats)
+        redactor_ms = _time(lambda: [redactor.redact(m) for m in messages], args.repeats)
+        stream_ms   = _time(lambda: _stream(redactor, text), args.repeats)
+        print(f"{n:>8} {compile_ms:>11.2f} {replace_ms:>11.2f} {marker_ms:>10.2f} "
+              f"{redactor_ms:>12.2f} {stream_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+benchmarks/bench_session_log.py
+================================
+Emit / read throughput of SessionLog at increasing session concurrency.
+
+Compares:
+    global-lock   the original SessionLog storage: one asyncio.Lock around every
+                  emit/get/count, and get_context_window copying the full log
+    striped       InMemoryBackend: per-session write locks, lock-free reads
+    sqlite        SqliteBackend (WAL, group commit) — only with --sqlite
+
+Each session runs `--events` iterations of: emit one event, read the last 10
+events (get_context_window), read the event count.
+
+Usage (from maf_harness_managed_agent/):
+    python -m benchmarks.bench_session_log
+    python -m benchmarks.bench_session_log --sessions 1 10 100 1000 --events 200 --sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from maf_harness.session.backends import InMemoryBackend, SessionBackend, SqliteBackend
+from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
+
+
+class GlobalLockBackend(InMemoryBackend):
+    """Reproduces the pre-striping storage: a single lock and full-copy reads."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._global = asyncio.Lock()
+
+    async def append(self, session_id, event):
+        async with self._global:
+            self._store.setdefault(session_id, []).append(event)
+
+    async def read(self, session_id, start=0, end=None, kind_filter=None):
+        async with self._global:
+            events = list(self._store.get(session_id, []))   # full copy, then slice
+        sliced = events[start:end]
+        if kind_filter:
+            sliced = [e for e in sliced if e.kind in kind_filter]
+        return sliced
+
+    async def count(self, session_id):
+        async with self._global:
+            return len(self._store.get(session_id, []))
+
+
+async def _run(backend: SessionBackend, n_sessions: int, n_events: int) -> tuple[float, float, float]:
+    log = SessionLog(backend)
+    sids = [await log.create_session(f"bench-{i}") for i in range(n_sessions)]
+    emit_s = read_s = 0.0
+
+    async def worker(sid: str) -> tuple[float, float]:
+        e = r = 0.0
+        for i in range(n_events):
+            t0 = time.perf_counter()
+            await log.emit_event(sid, SessionEvent(kind=EventKind.TOOL_CALL, payload={"i": i}))
+            t1 = time.perf_counter()
+            await log.get_context_window(sid, last_n=10)
+            await log.event_count(sid)
+            t2 = time.perf_counter()
+            e += t1 - t0
+            r += t2 - t1
+        return e, r
+
+    wall = time.perf_counter()
+    for e, r in await asyncio.gather(*(worker(s) for s in sids)):
+        emit_s += e
+        read_s += r
+    wall = time.perf_counter() - wall
+    await log.close()
+
+    total = n_sessions * n_events
+    return total / wall, (emit_s / total) * 1e6, (read_s / total) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--events",   type=int, default=500, help="iterations per session")
+    parser.add_argument("--sqlite",   action="store_true", help="also benchmark SqliteBackend")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-session-")
+    factories = {
+        "global-lock": GlobalLockBackend,
+        "striped":     InMemoryBackend,
+    }
+    if args.sqlite:
+        factories["sqlite"] = lambda: SqliteBackend(
+            os.path.join(tmpdir, f"bench-{time.monotonic_ns()}.db")
+        )
+
+    print(f"{'backend':<12} {'sessions':>8} {'ops/s':>12} {'emit µs/op':>12} {'read µs/op':>12}")
+    for n in args.sessions:
+        for name, factory in factories.items():
+            ops, emit_us, read_us = asyncio.run(_run(factory(), n, args.events))
+            print(f"{name:<12} {n:>8} {ops:>12,.0f} {emit_us:>12.1f} {read_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+benchmarks/bench_wake.py
+=========================
+Per-turn wake latency as a session grows.
+
+Modes:
+    full        read the entire log (what wake() did before compaction/snapshots)
+    compacted   SessionLog.wake()          — latest COMPACTION + events since
+    snapshot    SessionLog.wake_snapshot() — latest snapshot + delta
+
+For each size the session is filled with SANDBOX_EXEC events, compacted once and
+snapshotted once, then `--turns` more events are appended (the delta a real turn
+produces) before timing each mode.
+
+Usage (from maf_harness_managed_agent/):
+    python -m benchmarks.bench_wake
+    python -m benchmarks.bench_wake --sizes 100 10000 100000 --sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from maf_harness.session.backends import InMemoryBackend, SessionBackend, SqliteBackend
+from maf_harness.session.compaction import Compactor
+from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
+
+
+def _event(i: int) -> SessionEvent:
+    return SessionEvent(
+        kind=EventKind.SANDBOX_EXEC,
+        payload={"tool": "run_python", "input": f"print({i})", "result": str(i)},
+    )
+
+
+async def _fill(log: SessionLog, sid: str, n: int, chunk: int = 1000) -> None:
+    for lo in range(0, n, chunk):
+        await asyncio.gather(*(log.emit_event(sid, _event(i)) for i in range(lo, min(n, lo + chunk))))
+
+
+async def _time(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def _run(backend: SessionBackend, size: int, turns: int, repeats: int) -> dict[str, float]:
+    log = SessionLog(backend)
+    sid = await log.create_session("bench")
+    await _fill(log, sid, size)
+    await Compactor(log, budget_tokens=2_000).maybe_compact(sid)
+    await log.save_snapshot(sid)
+    await _fill(log, sid, turns)
+
+    result = {
+        "full":      await _time(lambda: log.get_events(sid), repeats),
+        "compacted": await _time(lambda: log.wake(sid), repeats),
+        "snapshot":  await _time(lambda: log.wake_snapshot(sid), repeats),
+    }
+    await log.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes",   type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--turns",   type=int, default=10, help="events appended after the snapshot")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--sqlite",  action="store_true", help="use SqliteBackend instead of in-memory")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-wake-")
+    print(f"{'events':>8} {'full ms':>10} {'compacted ms':>13} {'snapshot ms':>12}")
+    for size in args.sizes:
+        backend = (
+            SqliteBackend(os.path.join(tmpdir, f"wake-{size}.db")) if args.sqlite else InMemoryBackend()
+        )
+        r = asyncio.run(_run(backend, size, args.turns, args.repeats))
+        print(f"{size:>8} {r['full']:>10.3f} {r['compacted']:>13.3f} {r['snapshot']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
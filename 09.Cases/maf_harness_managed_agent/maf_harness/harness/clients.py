@@ -0,0 +1,212 @@
+"""
+maf_harness.harness.clients
+============================
+Process-wide FoundryChatClient registry.
+
+Every FoundryChatClient owns its own HTTP connection pool, and every
+DefaultAzureCredential acquires its own tokens. Building one per agent / harness
+/ brain therefore costs a TLS handshake and a token fetch each — 50 parallel
+brains meant 50 of both. The registry hands out one shared client per
+
+    (endpoint, model, credential kind)
+
+so all callers reuse a single pooled transport, and one credential per kind whose
+token is cached and refreshed ahead of expiry in the background.
+
+    client = get_foundry_client()            # shared
+    ...
+    await close_foundry_clients()            # on shutdown
+
+make_foundry_client() still builds an unshared client for callers that need one.
+"""
+
+from __future__ import annotations
+
+import atexit
+import inspect
+import os
+import threading
+import time
+from typing import Any
+
+from agent_framework.foundry import FoundryChatClient
+
+
+# ── Credentials ─────────────────────────────────────────────────────────────────
+
+class CachedTokenCredential:
+    """
+    Wrap a sync TokenCredential: one token per scope set, shared by every client.
+
+    A token within `refresh_margin` seconds of expiry is still returned, while a
+    background thread fetches its replacement, so requests never block on a
+    refresh. Only an expired (or missing) token is fetched inline.
+    """
+
+    _EXPIRY_SKEW = 30.0   # treat tokens this close to expiry as already expired
+
+    def __init__(self, inner: Any, refresh_margin: float = 300.0) -> None:
+        self._inner          = inner
+        self._refresh_margin = refresh_margin
+        self._tokens: dict[tuple[str, ...], Any] = {}
+        self._refreshing: set[tuple[str, ...]]   = set()
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        if kwargs:
+            # claims / tenant_id challenges must not be served from the cache.
+            return self._inner.get_token(*scopes, **kwargs)
+        token = self._tokens.get(scopes)
+        now   = time.time()
+        if token is None or token.expires_on - now < self._EXPIRY_SKEW:
+            with self._lock:
+                token = self._tokens.get(scopes)
+                if token is None or token.expires_on - time.time() < self._EXPIRY_SKEW:
+                    token = self._tokens[scopes] = self._inner.get_token(*scopes)
+            return token
+        if token.expires_on - now < self._refresh_margin:
+            self._refresh_in_background(scopes)
+        return token
+
+    def _refresh_in_background(self, scopes: tuple[str, ...]) -> None:
+        with self._lock:
+            if scopes in self._refreshing:
+                return
+            self._refreshing.add(scopes)
+
+        def _refresh() -> None:
+            try:
+                self._tokens[scopes] = self._inner.get_token(*scopes)
+            except Exception as exc:
+                print(f"[CLIENTS] Token refresh failed ({exc}); retrying on next request.")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(scopes)
+
+        threading.Thread(target=_refresh, name="token-refresh", daemon=True).start()
+
+    def close(self) -> None:
+        close = getattr(self._inner, "close", None)
+        if close is not None:
+            close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Hide get_token_info so azure-core policies go through the cached get_token.
+        if name == "get_token_info":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+
+def _credential_kind() -> str:
+    return "api_key" if os.getenv("FOUNDRY_API_KEY") else "default"
+
+
+def _build_credential(kind: str) -> Any:
+    if kind == "api_key":
+        from azure.core.credentials import AzureKeyCredential
+        return AzureKeyCredential(os.environ["FOUNDRY_API_KEY"])
+    from azure.identity import DefaultAzureCredential
+    return CachedTokenCredential(DefaultAzureCredential())
+
+
+# ── Factory ─────────────────────────────────────────────────────────────────────
+
+def make_foundry_client(model: str | None = None, credential: Any = None) -> FoundryChatClient:
+    """
+    Build an unshared FoundryChatClient.
+
+    Authentication priority:
+      1. FOUNDRY_API_KEY env var  → AzureKeyCredential (dev / CI)
+      2. DefaultAzureCredential   → az login / Managed Identity (production)
+
+    Configured via environment variables (if not explicitly passed):
+      FOUNDRY_PROJECT_ENDPOINT
+      FOUNDRY_MODEL
+
+    Prefer get_foundry_client() unless the client must not be shared.
+    """
+    endpoint = os.getenv("FOUNDRY_PROJECT_ENDPOINT")
+    model    = model or os.getenv("FOUNDRY_MODEL", "gpt-5.4")
+    return FoundryChatClient(
+        project_endpoint=endpoint,
+        model=model,
+        credential=credential or _build_credential(_credential_kind()),
+    )
+
+
+# ── Registry ────────────────────────────────────────────────────────────────────
+
+_clients:     dict[tuple[str | None, str, str], FoundryChatClient] = {}
+_credentials: dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_foundry_client(model: str | None = None) -> FoundryChatClient:
+    """Return the shared client for (endpoint, model, credential kind), building it once."""
+    endpoint = os.getenv("FOUNDRY_PROJECT_ENDPOINT")
+    model    = model or os.getenv("FOUNDRY_MODEL", "gpt-5.4")
+    kind     = _credential_kind()
+    key      = (endpoint, model, kind)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            credential = _credentials.get(kind)
+            if credential is None:
+                credential = _credentials[kind] = _build_credential(kind)
+            client = _clients[key] = make_foundry_client(model=model, credential=credential)
+    return client
+
+
+def foundry_client_stats() -> dict:
+    return {
+        "clients":     len(_clients),
+        "credentials": sorted(_credentials),
+    }
+
+
+async def _maybe_await(result: Any) -> None:
+    if inspect.isawaitable(result):
+        await result
+
+
+async def close_foundry_clients() -> None:
+    """Close every shared client and credential. Safe to call more than once."""
+    with _registry_lock:
+        clients     = list(_clients.values())
+        credentials = list(_credentials.values())
+        _clients.clear()
+        _credentials.clear()
+
+    for client in clients:
+        close = getattr(client, "close", None) or getattr(client, "aclose", None)
+        if close is not None:
+            try:
+                await _maybe_await(close())
+            except Exception as exc:
+                print(f"[CLIENTS] Closing client failed: {exc}")
+    for credential in credentials:
+        _close_credential(credential)
+
+
+def _close_credential(credential: Any) -> None:
+    close = getattr(credential, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+@atexit.register
+def _close_credentials_at_exit() -> None:
+    # Fallback for processes that never call close_foundry_clients(): the async
+    # client transports die with the loop, but sync credentials can still be closed.
+    with _registry_lock:
+        credentials = list(_credentials.values())
+        _credentials.clear()
+    for credential in credentials:
+        _close_credential(credential)
@@ -22,7 +22,7 @@ Authentication (DefaultAzureCredential precedence):
 from __future__ import annotations
 
 import asyncio
-import os
+import time
 import warnings
 from dataclasses import dataclass, field
 from typing import Annotated, Any, Callable
@@ -36,50 +36,25 @@ from agent_framework import (
 )
 from agent_framework.foundry import FoundryChatClient
 
+from maf_harness.harness.clients import get_foundry_client, make_foundry_client  # noqa: F401 (re-export)
 from maf_harness.middleware.middleware import (
     GLOBAL_METRICS,
+    end_run,
     make_observability_middleware,
     make_rate_limit_middleware,
     make_security_middleware,
     make_session_logging_middleware,
+    record_tool_time,
+    start_run,
 )
+from maf_harness.middleware.telemetry import span
+from maf_harness.sandbox.lease import SandboxLease
 from maf_harness.sandbox.sandbox import SandboxManager, SandboxResources
+from maf_harness.session.compaction import Compactor, LLMSummarizer, Summarizer
 from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
 from maf_harness.skills.skills import build_skills_provider
 
 
-# ── Foundry Client Factory ──────────────────────────────────────────────────
-
-def make_foundry_client(model: str | None = None) -> FoundryChatClient:
-    """
-    Build FoundryChatClient.
-
-    Authentication priority:
-      1. FOUNDRY_API_KEY env var  → AzureKeyCredential (dev / CI)
-      2. DefaultAzureCredential   → az login / Managed Identity (production)
-
-    Configured via environment variables (if not explicitly passed):
-      FOUNDRY_PROJECT_ENDPOINT
-      FOUNDRY_MODEL
-    """
-    api_key  = os.getenv("FOUNDRY_API_KEY")
-    endpoint = os.getenv("FOUNDRY_PROJECT_ENDPOINT")
-    model    = model or os.getenv("FOUNDRY_MODEL", "gpt-5.4")
-
-    if api_key:
-        from azure.core.credentials import AzureKeyCredential
-        credential = AzureKeyCredential(api_key)
-    else:
-        from azure.identity import DefaultAzureCredential
-        credential = DefaultAzureCredential()
-
-    return FoundryChatClient(
-        project_endpoint=endpoint,
-        model=model,
-        credential=credential,
-    )
-
-
 # ── Harness Configuration ───────────────────────────────────────────────────────
 
 @dataclass
@@ -88,14 +63,25 @@ class HarnessConfig:
     agent_name:          str       = "ManagedAgent"
     model:               str       = ""          # Falls back to FOUNDRY_MODEL env var
     max_iterations:      int       = 20
-    context_window_size: int       = 30          # Events reloaded on wake()
+    context_window_size: int       = 30          # Events since last compaction shown in the prompt
+    compact_at_tokens:   int       = 8_000       # Compact once the live tail exceeds this
+    compact_keep_recent: int       = 5           # Newest events never folded into a summary
+    snapshot_every:      int       = 50          # Snapshot after this many new events (0 = off)
     skill_names:         list[str] = field(default_factory=lambda: [
                                         "research", "code_execution",
                                         "summarise", "orchestration",
                                     ])
     rate_limit_rpm:      int       = 60
+    rate_limit_tpm:      int       = 0           # Tokens per minute (0 = unlimited)
     sandbox_timeout_sec: int       = 30
 
+    def sandbox_resources(self) -> SandboxResources:
+        """What the harness's sandbox lease provisions (also the warm-pool profile to prime)."""
+        return SandboxResources(
+            allowed_tools=["run_python", "web_search", "read_file", "write_file"],
+            timeout_sec=self.sandbox_timeout_sec,
+        )
+
 
 # ── Sandbox Tool Wrappers ───────────────────────────────────────────────────────
 
@@ -103,51 +89,39 @@ def build_sandbox_tools(
     sandbox_mgr: SandboxManager,
     session_log: SessionLog,
     session_id:  str,
+    lease:       SandboxLease | None = None,
 ) -> list[Callable]:
     """
     Wraps sandbox.execute(name, input) as typed AF tool functions.
     Sandboxes are lazily created on first tool call — reasoning-only sessions
-    never incur creation overhead (TTFT optimization).
+    never incur creation overhead (TTFT optimization). Later calls reuse the
+    session's sandbox through a SandboxLease (renewed on use, replaced if it dies).
     """
-    _state: dict[str, str | None] = {"sandbox_id": None}
-
-    async def _ensure() -> str:
-        if _state["sandbox_id"] is None:
-            sid = await sandbox_mgr.provision(SandboxResources(
-                allowed_tools=["run_python", "web_search", "read_file", "write_file"],
-            ))
-            _state["sandbox_id"] = sid
-            await session_log.emit_event(
-                session_id,
-                SessionEvent(
-                    kind=EventKind.SANDBOX_SPAWN,
-                    session_id=session_id,
-                    payload={"sandbox_id": sid},
-                ),
-            )
-        return _state["sandbox_id"]
+    lease = lease or SandboxLease(
+        sandbox_mgr,
+        SandboxResources(allowed_tools=["run_python", "web_search", "read_file", "write_file"]),
+        session_id=session_id,
+        session_log=session_log,
+    )
 
     async def _exec(name: str, data: str) -> str:
-        for attempt in range(2):
-            try:
-                sid    = await _ensure()
-                result = await sandbox_mgr.execute(sid, name, data)
-                await session_log.emit_event(
-                    session_id,
-                    SessionEvent(
-                        kind=EventKind.SANDBOX_EXEC,
-                        session_id=session_id,
-                        payload={"tool": name, "input": data[:200], "result": result[:500]},
-                    ),
-                )
-                return result
-            except RuntimeError as exc:
-                if _state["sandbox_id"]:
-                    sandbox_mgr.reclaim(_state["sandbox_id"])
-                    _state["sandbox_id"] = None
-                if attempt == 1:
-                    return f"[SANDBOX FAILED after retry] {exc}"
-        return "[SANDBOX FAILED]"
+        start = time.perf_counter()
+        try:
+            return await _exec_logged(name, data)
+        finally:
+            record_tool_time((time.perf_counter() - start) * 1000)
+
+    async def _exec_logged(name: str, data: str) -> str:
+        result = await lease.execute(name, data)
+        await session_log.emit_event(
+            session_id,
+            SessionEvent(
+                kind=EventKind.SANDBOX_EXEC,
+                session_id=session_id,
+                payload={"tool": name, "input": data[:200], "result": result[:500]},
+            ),
+        )
+        return result
 
     # ── Typed AF Tool Functions ───────────────────────────────────────────────
 
@@ -199,7 +173,8 @@ class AgentHarness:
         await harness.shutdown()
 
     On crash: create a new harness, call start(same session_id).
-    wake() rehydrates full event history — zero data loss.
+    wake() rehydrates the latest compaction summary plus every event since —
+    zero data loss, and prompt size stays bounded as the session grows.
     """
 
     def __init__(
@@ -208,14 +183,19 @@ class AgentHarness:
         sandbox_mgr: SandboxManager,
         config:      HarnessConfig | None      = None,
         client:      FoundryChatClient | None  = None,
+        summarizer:  Summarizer | None         = None,
     ) -> None:
         self.session_log = session_log
         self.sandbox_mgr = sandbox_mgr
         self.config      = config or HarnessConfig()
         self._client     = client   # Inject pre-built client (testing / reuse)
+        self._summarizer = summarizer   # Default: LLMSummarizer on the harness client
+        self._compactor: Compactor | None = None
+        self._snapshot_upto = 0
         self._agent:           Agent | None                 = None
         self._session_id:      str | None                   = None
         self._history_provider: InMemoryHistoryProvider | None = None
+        self._lease:           SandboxLease | None          = None
 
     # ── Start / Wake ──────────────────────────────────────────────────────────────
 
@@ -223,26 +203,45 @@ class AgentHarness:
         """
         Attach to a session. If session has existing events, perform
         wake() — harness rebuilds context from durable log without losing any history.
+        Rehydration reads the latest snapshot plus only the events after it.
         """
         self._session_id = session_id
 
-        _session, past_events = await self.session_log.wake(session_id)
+        with span("harness.wake", session_id=session_id) as wake_span:
+            _session, snapshot, past_events = await self.session_log.wake_snapshot(session_id)
+            wake_span.set_attribute("events", len(past_events))
+        self._snapshot_upto = snapshot.upto if snapshot else 0
         verb = "Resuming" if len(past_events) > 1 else "Starting"
         print(f"[HARNESS] {verb} session {session_id[:8]}… ({len(past_events)} past events)")
 
         self._history_provider = self.session_log.get_history_provider(session_id)
 
-        tools           = build_sandbox_tools(self.sandbox_mgr, self.session_log, session_id)
+        if self._lease is not None:
+            await self._lease.release()
+        self._lease = SandboxLease(
+            self.sandbox_mgr,
+            self.config.sandbox_resources(),
+            session_id=session_id,
+            session_log=self.session_log,
+        )
+        tools           = build_sandbox_tools(self.sandbox_mgr, self.session_log, session_id, self._lease)
         skills_provider = build_skills_provider(self.config.skill_names)
 
         middleware = [
             make_session_logging_middleware(self.session_log, session_id),
-            make_security_middleware(),
-            make_rate_limit_middleware(self.config.rate_limit_rpm),
+            make_security_middleware(vault=self.sandbox_mgr.vault),
+            make_rate_limit_middleware(self.config.rate_limit_rpm, self.config.rate_limit_tpm),
             make_observability_middleware(),
         ]
 
-        client = self._client or make_foundry_client(model=self.config.model or None)
+        client = self._client or get_foundry_client(model=self.config.model or None)
+
+        self._compactor = Compactor(
+            self.session_log,
+            summarizer=self._summarizer or LLMSummarizer(client),
+            budget_tokens=self.config.compact_at_tokens,
+            keep_recent=self.config.compact_keep_recent,
+        )
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -270,8 +269,11 @@ class AgentHarness:
             "- If approaching context limits, call get_session_context() and continue.\n"
             "- Be concise and actionable.\n"
         )
+        if past_events and past_events[0].kind == EventKind.COMPACTION:
+            base += f"\n\nSession summary (compacted history):\n{past_events[0].payload['summary']}\n"
+            past_events = past_events[1:]
         if past_events:
-            recent  = past_events[-5:]
+            recent  = past_events[-self.config.context_window_size:]
             summary = "\n".join(
                 f"  [{e.kind.value}] {str(e.payload)[:120]}" for e in recent
             )
@@ -285,7 +287,8 @@ class AgentHarness:
         if self._agent is None or self._session_id is None:
             raise RuntimeError("Harness not started. Call start(session_id) first.")
         try:
-            result = await self._agent.run(user_input)
+            with span("agent.run", session_id=self._session_id, agent=self.config.agent_name):
+                result = await self._agent.run(user_input)
             await self.session_log.emit_event(
                 self._session_id,
                 SessionEvent(
@@ -294,6 +297,9 @@ class AgentHarness:
                     payload={"response": str(result)[:500]},
                 ),
             )
+            if self._compactor is not None:
+                await self._compactor.maybe_compact(self._session_id)
+            await self._maybe_snapshot()
             return str(result)
         except Exception as exc:
             await self.session_log.emit_event(
@@ -306,22 +312,82 @@ class AgentHarness:
             )
             raise
 
+    async def _maybe_snapshot(self) -> None:
+        """Persist a snapshot once `snapshot_every` events have accrued since the last one."""
+        every = self.config.snapshot_every
+        if not every or self._session_id is None:
+            return
+        if await self.session_log.event_count(self._session_id) - self._snapshot_upto >= every:
+            snapshot = await self.session_log.save_snapshot(
+                self._session_id, recent_n=self.config.context_window_size,
+            )
+            self._snapshot_upto = snapshot.upto
+
     async def run_streaming(self, user_input: str):
-        """Yield response text chunks as they arrive from Foundry."""
-        if self._agent is None:
+        """
+        Yield response text chunks as they arrive from Foundry.
+
+        Logs the response to the session like run(), and records real TTFT,
+        inter-token latency and total generation time into GLOBAL_METRICS.
+        Vault tokens are masked incrementally, so a chunk may be held back until
+        it can no longer be the start of a secret.
+        """
+        if self._agent is None or self._session_id is None:
             raise RuntimeError("Harness not started.")
-        async for chunk in self._agent.run(user_input, stream=True):
-            if chunk.text:
-                yield chunk.text
+        timer, token = start_run(GLOBAL_METRICS)
+        scrub = self.sandbox_mgr.vault.redactor().stream()     # vault tokens never reach the caller
+        parts: list[str] = []
+        try:
+            with span("agent.run", session_id=self._session_id, agent=self.config.agent_name, stream=True):
+                async for chunk in self._agent.run(user_input, stream=True):
+                    if chunk.text:
+                        timer.token()
+                        text = scrub.feed(chunk.text)
+                        if text:
+                            parts.append(text)
+                            yield text
+                tail = scrub.flush()
+                if tail:
+                    parts.append(tail)
+                    yield tail
+            timer.finish()
+            await self.session_log.emit_event(
+                self._session_id,
+                SessionEvent(
+                    kind=EventKind.AGENT_RESPONSE,
+                    session_id=self._session_id,
+                    payload={"response": "".join(parts)[:500], "streamed": True},
+                ),
+            )
+            if self._compactor is not None:
+                await self._compactor.maybe_compact(self._session_id)
+            await self._maybe_snapshot()
+        except Exception as exc:
+            timer.finish()
+            await self.session_log.emit_event(
+                self._session_id,
+                SessionEvent(
+                    kind=EventKind.HARNESS_CRASH,
+                    session_id=self._session_id,
+                    payload={"error": str(exc)},
+                ),
+            )
+            raise
+        finally:
+            end_run(token)
 
     async def shutdown(self) -> None:
-        """Emit SESSION_END event to durable log."""
+        """Release the session's sandbox and emit SESSION_END (with lease stats) to the durable log."""
+        sandbox = None
+        if self._lease is not None:
+            await self._lease.release()
+            sandbox, self._lease = self._lease.stats(), None
         if self._session_id:
             await self.session_log.emit_event(
                 self._session_id,
                 SessionEvent(
                     kind=EventKind.SESSION_END,
                     session_id=self._session_id,
-                    payload={"graceful": True},
+                    payload={"graceful": True, "sandbox": sandbox},
                 ),
             )
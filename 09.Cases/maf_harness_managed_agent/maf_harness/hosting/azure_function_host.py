@@ -8,6 +8,7 @@ Endpoints:
     POST /sessions                   → create session, return session_id
     POST /sessions/{id}/run          → execute one agent turn
     GET  /sessions/{id}/events       → query session event log
+    GET  /sessions/{id}/events/stream → server-sent events, live tail of the log
     POST /sessions/{id}/wake         → rehydrate harness from session log
     GET  /health                     → endpoint & model health check
 
@@ -20,16 +21,29 @@ local.settings.json:
         "FOUNDRY_PROJECT_ENDPOINT": "https://<hub>.services.ai.azure.com",
         "FOUNDRY_MODEL":            "gpt-5.4",
         "AGENT_NAME":               "ManagedAgent",
-        "MAX_ITERATIONS":           "20"
+        "MAX_ITERATIONS":           "20",
+        "SESSION_DB_PATH":          "/home/data/sessions.db",
+        "HARNESS_POOL_SIZE":        "64",
+        "HARNESS_POOL_TTL_SEC":     "300",
+        "RATE_LIMIT_RPM":           "60",
+        "RATE_LIMIT_TPM":           "90000",
+        "RATE_LIMIT_DB_PATH":       "/home/data/ratelimit.db"
       }
     }
 
+SESSION_DB_PATH is optional; when unset the session log is in-memory only.
+HARNESS_POOL_SIZE / HARNESS_POOL_TTL_SEC bound the per-instance warm harness
+pool; a size of 0 disables it (one fresh harness per request).
+RATE_LIMIT_DB_PATH shares the RPM/TPM budget between worker processes.
+OTEL_EXPORTER_OTLP_ENDPOINT enables OpenTelemetry spans and histograms.
+
 Local development (FastAPI):
     uvicorn maf_harness.hosting.azure_function_host:local_app --reload
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 
@@ -42,38 +56,126 @@ try:
 except ImportError:
     _AZURE = False
 
-from maf_harness.harness.harness import AgentHarness, HarnessConfig, make_foundry_client
+from maf_harness.harness.clients import close_foundry_clients, foundry_client_stats, get_foundry_client
+from maf_harness.harness.harness import AgentHarness, HarnessConfig
+from maf_harness.hosting.harness_pool import HarnessPool
+from maf_harness.middleware.ratelimit import SqliteRateLimitBackend, set_default_backend, shared_rate_limiter
+from maf_harness.middleware.telemetry import configure_telemetry
+from maf_harness.sandbox.limits import CgroupV2
+from maf_harness.sandbox.python_pool import WarmPythonPool
 from maf_harness.sandbox.sandbox import SandboxManager, VaultStore
-from maf_harness.session.session_log import SessionLog
+from maf_harness.sandbox.warm_pool import WarmPoolConfig
+from maf_harness.session.backends import InMemoryBackend, SqliteBackend
+from maf_harness.session.session_log import EventKind, SessionLog
 
 
 # ── Singleton Infrastructure (per cold-start container) ───────────────────────────
 
+# SESSION_DB_PATH selects the durable SQLite backend so wake() survives host
+# restarts; without it sessions live only as long as this worker process.
+_session_db  = os.getenv("SESSION_DB_PATH")
 _vault       = VaultStore()
-_session_log = SessionLog()
-_sandbox_mgr = SandboxManager(_vault)
+_session_log = SessionLog(SqliteBackend(_session_db) if _session_db else InMemoryBackend())
+# run_python jobs start on pre-started interpreters with PYTHON_POOL_PRELOAD already
+# imported; each worker still runs a single job. 0 starts every job cold.
+# SANDBOX_CGROUP_ROOT (a delegated cgroup v2 dir) makes memory / cpu / pids limits
+# exact per job; without it the workers are limited by rlimits alone, and the
+# process limit only caps new tasks on top of what the service user already runs.
+# SANDBOX_TOOL_WORKERS bounds the threads shared by blocking (sync) tools.
+# SANDBOX_WARM_MAX > 0 pre-provisions sandboxes per resources profile, sized by
+# predicted demand (seeded at startup from the session log, see below); 0 keeps
+# provisioning purely on demand.
+_warm_max    = int(os.getenv("SANDBOX_WARM_MAX", "0"))
+_sandbox_mgr = SandboxManager(
+    _vault,
+    python_pool=WarmPythonPool(
+        size=int(os.getenv("PYTHON_POOL_SIZE", "2")),
+        preload=[m.strip() for m in os.getenv("PYTHON_POOL_PRELOAD", "").split(",") if m.strip()],
+        cgroups=CgroupV2.from_path(os.getenv("SANDBOX_CGROUP_ROOT")),
+    ),
+    tool_workers=int(os.getenv("SANDBOX_TOOL_WORKERS", "16")),
+    warm_pool=WarmPoolConfig(
+        min_idle=int(os.getenv("SANDBOX_WARM_MIN", "0")),
+        max_idle=_warm_max,
+        idle_ttl_sec=float(os.getenv("SANDBOX_WARM_TTL_SEC", "120")),
+    ) if _warm_max > 0 else None,
+)
+
+# OTEL_EXPORTER_OTLP_ENDPOINT turns on harness spans/histograms (AF OTLP providers);
+# without it telemetry stays disabled and costs next to nothing.
+if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+    configure_telemetry(use_agent_framework=True)
+
+# RATE_LIMIT_DB_PATH makes every worker process on the host draw from one
+# RPM/TPM budget; without it each process enforces the limits on its own.
+_rate_limit_db = os.getenv("RATE_LIMIT_DB_PATH")
+if _rate_limit_db:
+    set_default_backend(SqliteRateLimitBackend(_rate_limit_db))
 
 _config = HarnessConfig(
     agent_name=os.getenv("AGENT_NAME", "ManagedAgent"),
     model=os.getenv("FOUNDRY_MODEL", "gpt-5.4"),
     max_iterations=int(os.getenv("MAX_ITERATIONS", "20")),
+    rate_limit_rpm=int(os.getenv("RATE_LIMIT_RPM", "60")),
+    rate_limit_tpm=int(os.getenv("RATE_LIMIT_TPM", "0")),
 )
 
 # Lazy build on first request — avoid cold-start failure when env vars not yet injected
-# (e.g., during module import in test environments).
-_foundry_client = None
+# (e.g., during module import in test environments). The registry shares the client
+# with any other harness or agent in this worker.
+def _get_client():
+    return get_foundry_client(model=_config.model)
 
 
-def _get_client():
-    global _foundry_client
-    if _foundry_client is None:
-        _foundry_client = make_foundry_client(model=_config.model)
-    return _foundry_client
+def _new_harness() -> AgentHarness:
+    return AgentHarness(
+        session_log=_session_log,
+        sandbox_mgr=_sandbox_mgr,
+        config=_config,
+        client=_get_client(),
+    )
+
+
+# Warm harnesses keyed by session_id — a cache only; the session log stays the
+# source of truth, so a miss (or another instance) simply wakes from the log.
+_harness_pool = HarnessPool(
+    factory=_new_harness,
+    max_size=int(os.getenv("HARNESS_POOL_SIZE", "64")),
+    idle_ttl_sec=float(os.getenv("HARNESS_POOL_TTL_SEC", "300")),
+    session_log=_session_log,
+)
+
+
+# With a warm sandbox pool and a durable log, the pool starts from the demand
+# recorded before the restart (SANDBOX_SPAWN events of the last few minutes)
+# instead of cold. Runs once: awaited on FastAPI startup, in the background on
+# the first Azure Functions request.
+_PRIME_WINDOW_SEC   = 300.0
+_PRIME_MAX_SESSIONS = 1000            # most recently created sessions scanned
+_prime_task: asyncio.Task | None = None
+
+
+async def _prime_sandbox_pool() -> None:
+    pool = _sandbox_mgr.warm_pool
+    if pool is None:
+        return
+    spawns = []
+    for sid in _session_log.list_sessions()[-_PRIME_MAX_SESSIONS:]:
+        spawns += await _session_log.get_events(sid, kind_filter=[EventKind.SANDBOX_SPAWN])
+    pool.prime(_config.sandbox_resources(), spawns, window_sec=_PRIME_WINDOW_SEC)
+    await pool.start()
+
+
+def _ensure_primed() -> None:
+    global _prime_task
+    if _prime_task is None and _sandbox_mgr.warm_pool is not None:
+        _prime_task = asyncio.get_running_loop().create_task(_prime_sandbox_pool())
 
 
 # ── Handler Logic (shared by Azure Functions and FastAPI) ────────────────────────────
 
 async def _handle_create_session(body: dict) -> dict:
+    _ensure_primed()
     task       = body.get("task", "")
     metadata   = body.get("metadata", {})
     session_id = await _session_log.create_session(task, metadata)
@@ -84,17 +186,17 @@ async def _handle_run_turn(session_id: str, body: dict) -> dict:
     user_input = body.get("input", "")
     if not user_input:
         return {"error": "Missing 'input' field."}
-
-    # Create a new stateless harness per request — wakes from durable session log
-    harness = AgentHarness(
-        session_log=_session_log,
-        sandbox_mgr=_sandbox_mgr,
-        config=_config,
-        client=_get_client(),
-    )
-    await harness.start(session_id)
-    response = await harness.run(user_input)
-    await harness.shutdown()
+    _ensure_primed()
+
+    if _harness_pool.max_size <= 0:
+        # Pool disabled — a fresh stateless harness per request, woken from the log.
+        harness = _new_harness()
+        await harness.start(session_id)
+        response = await harness.run(user_input)
+        await harness.shutdown()
+    else:
+        async with _harness_pool.lease(session_id) as harness:
+            response = await harness.run(user_input)
 
     return {
         "session_id":  session_id,
@@ -114,18 +216,75 @@ async def _handle_get_events(session_id: str, params: dict) -> dict:
     }
 
 
+_SSE_HEARTBEAT_SEC = 15.0
+
+
+def _sse_frame(index: int, event) -> str:
+    return f"id: {index}\nevent: {event.kind.value}\ndata: {json.dumps(event.to_dict(), default=str)}\n\n"
+
+
+async def _handle_stream_events(session_id: str, from_index: int = 0):
+    """
+    Yield server-sent-event frames for every event from `from_index` onward,
+    then for each new event as it is appended. The SSE `id` is the event's
+    position in the log, so a reconnecting client resumes via Last-Event-ID.
+    A comment heartbeat keeps idle connections open through proxies.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _pump() -> None:
+        async for event in _session_log.follow(session_id, from_index):
+            await queue.put(event)
+
+    pump  = asyncio.create_task(_pump())
+    index = from_index
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=_SSE_HEARTBEAT_SEC)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse_frame(index, event)
+            index += 1
+    finally:
+        pump.cancel()
+
+
+def _stream_start(params: dict, headers: dict) -> int:
+    last_id = headers.get("last-event-id") or headers.get("Last-Event-ID")
+    if last_id is not None and str(last_id).isdigit():
+        return int(last_id) + 1
+    return int(params.get("from", 0) or 0)
+
+
 async def _handle_wake(session_id: str) -> dict:
     session, events = await _session_log.wake(session_id)
     if session is None:
         return {"error": f"Session {session_id} not found."}
     return {
         "session_id":  session_id,
-        "event_count": len(events),
+        "event_count": await _session_log.event_count(session_id),
         "resumed":     True,
         "last_event":  events[-1].to_dict() if events else None,
     }
 
 
+def _handle_health() -> dict:
+    return {
+        "status":       "ok",
+        "backend":      "Microsoft Foundry",
+        "endpoint":     os.getenv("FOUNDRY_PROJECT_ENDPOINT", "(not set)"),
+        "model":        os.getenv("FOUNDRY_MODEL", "gpt-5.4"),
+        "sessions":     len(_session_log.list_sessions()),
+        "harness_pool": _harness_pool.stats(),
+        "clients":      foundry_client_stats(),
+        "rate_limit":   shared_rate_limiter(_config.rate_limit_rpm, _config.rate_limit_tpm).stats(),
+        "python_pool":  _sandbox_mgr.python_pool.stats(),
+        "sandbox_pool": _sandbox_mgr.warm_pool.stats() if _sandbox_mgr.warm_pool else None,
+    }
+
+
 # ── Azure Functions HTTP Triggers ─────────────────────────────────────────────
 
 if _AZURE:
@@ -161,6 +320,19 @@ if _AZURE:
             status_code=200, mimetype="application/json",
         )
 
+    @app.route(route="sessions/{session_id}/events/stream", methods=["GET"])
+    async def stream_events(req: func.HttpRequest) -> func.HttpResponse:
+        # Classic Functions HttpResponse cannot hold a connection open, so this
+        # returns the frames available now plus a `retry` hint; EventSource
+        # clients reconnect with Last-Event-ID and pick up where they left off.
+        sid   = req.route_params.get("session_id", "")
+        start = _stream_start(dict(req.params), dict(req.headers))
+        events = await _session_log.get_events(sid, start=start)
+        body   = "retry: 1000\n\n" + "".join(
+            _sse_frame(start + i, e) for i, e in enumerate(events)
+        )
+        return func.HttpResponse(body, status_code=200, mimetype="text/event-stream")
+
     @app.route(route="sessions/{session_id}/wake", methods=["POST"])
     async def wake_session(req: func.HttpRequest) -> func.HttpResponse:
         sid    = req.route_params.get("session_id", "")
@@ -170,6 +342,12 @@ if _AZURE:
             status_code=200, mimetype="application/json",
         )
 
+    @app.route(route="health", methods=["GET"])
+    async def health(req: func.HttpRequest) -> func.HttpResponse:
+        return func.HttpResponse(
+            json.dumps(_handle_health()), status_code=200, mimetype="application/json"
+        )
+
 
 # ── Local FastAPI Development Server ──────────────────────────────────────────────
 
@@ -186,7 +364,8 @@ def create_local_app():
         az login
     """
     try:
-        from fastapi import FastAPI
+        from fastapi import FastAPI, Request
+        from fastapi.responses import StreamingResponse
     except ImportError:
         raise RuntimeError("pip install fastapi uvicorn  for local dev server.")
 
@@ -196,6 +375,18 @@ def create_local_app():
         version="1.0.0",
     )
 
+    @app.on_event("startup")
+    async def startup() -> None:
+        _ensure_primed()
+        if _prime_task is not None:
+            await _prime_task
+
+    @app.on_event("shutdown")
+    async def shutdown() -> None:
+        await _harness_pool.aclose()
+        await _sandbox_mgr.aclose()
+        await close_foundry_clients()
+
     @app.post("/sessions")
     async def create_session(body: dict) -> dict:
         return await _handle_create_session(body)
@@ -208,6 +399,15 @@ def create_local_app():
     async def get_events(session_id: str, start: int = 0, end: int = None) -> dict:
         return await _handle_get_events(session_id, {"start": start, "end": end})
 
+    @app.get("/sessions/{session_id}/events/stream")
+    async def stream_events(session_id: str, request: Request) -> StreamingResponse:
+        start = _stream_start(dict(request.query_params), dict(request.headers))
+        return StreamingResponse(
+            _handle_stream_events(session_id, start),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     @app.post("/sessions/{session_id}/wake")
     async def wake(session_id: str) -> dict:
         return await _handle_wake(session_id)
@@ -218,13 +418,7 @@ def create_local_app():
 
     @app.get("/health")
     async def health() -> dict:
-        return {
-            "status":   "ok",
-            "backend":  "Microsoft Foundry",
-            "endpoint": os.getenv("FOUNDRY_PROJECT_ENDPOINT", "(not set)"),
-            "model":    os.getenv("FOUNDRY_MODEL", "gpt-5.4"),
-            "sessions": len(_session_log.list_sessions()),
-        }
+        return _handle_health()
 
     return app
 
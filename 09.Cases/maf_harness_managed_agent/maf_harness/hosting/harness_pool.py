@@ -0,0 +1,199 @@
+"""
+maf_harness.hosting.harness_pool
+=================================
+Warm pool of started AgentHarness instances, keyed by session_id.
+
+Building a harness is not free: a new Agent, freshly built skills, sandbox tool
+closures, the middleware stack and a wake() against the session log. Multi-turn
+traffic hits the same session again and again, so the host keeps recently used
+harnesses warm and only cold-starts on a miss.
+
+    pool = HarnessPool(factory=lambda: AgentHarness(...), max_size=64, idle_ttl_sec=300)
+    async with pool.lease(session_id) as harness:
+        await harness.run("...")
+
+Policy:
+  - LRU, bounded to `max_size` entries (harnesses in use are never evicted).
+  - Entries idle for longer than `idle_ttl_sec` are evicted lazily on access.
+  - A harness whose turn raised is discarded (cattle) — the next request cold-starts.
+  - Evicted and discarded harnesses are shut down in the background (SESSION_END
+    written, sandbox lease released); aclose() shuts down everything still warm.
+  - Turns on the same session are serialized; different sessions run in parallel.
+  - If the log grew behind the pool's back (another instance served a turn), the
+    warm harness is stale: it is shut down and rebuilt from the log instead of
+    reused. This needs a log shared between instances (SqliteBackend on one file).
+
+The pool is a cache, not state: the session log remains the source of truth, so
+any instance can still serve any session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+if TYPE_CHECKING:
+    from maf_harness.harness.harness import AgentHarness
+    from maf_harness.session.session_log import SessionLog
+
+
+@dataclass
+class _Entry:
+    harness:   AgentHarness | None = None
+    lock:      asyncio.Lock        = field(default_factory=asyncio.Lock)
+    last_used: float               = field(default_factory=time.monotonic)
+    leases:    int                 = 0
+    seen:      int                 = -1      # event_count when last released
+
+
+class HarnessPool:
+    """LRU + idle-TTL cache of started harnesses."""
+
+    def __init__(
+        self,
+        factory:      Callable[[], AgentHarness],
+        max_size:     int               = 64,
+        idle_ttl_sec: float             = 300.0,
+        session_log:  SessionLog | None = None,
+    ) -> None:
+        self._factory     = factory
+        self._log         = session_log
+        self.max_size     = max_size
+        self.idle_ttl_sec = idle_ttl_sec
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._shutdowns: set[asyncio.Task] = set()
+        self.hits              = 0
+        self.misses            = 0
+        self.evictions_ttl     = 0
+        self.evictions_lru     = 0
+        self.stale             = 0
+        self.discards          = 0
+
+    @asynccontextmanager
+    async def lease(self, session_id: str) -> AsyncIterator[AgentHarness]:
+        """Borrow the warm harness for `session_id`, cold-starting it on a miss."""
+        self._evict_idle()
+        entry = self._checkout(session_id)
+        try:
+            await entry.lock.acquire()
+            while self._entries.get(session_id) is not entry:
+                # Discarded while we waited on its lock: move to the live entry.
+                entry.lock.release()
+                entry.leases -= 1
+                entry = self._checkout(session_id)
+                await entry.lock.acquire()
+        except BaseException:
+            entry.leases -= 1
+            raise
+
+        try:
+            if entry.harness is not None and not await self._is_current(session_id, entry):
+                # Shut the stale harness down before its replacement wakes, so its
+                # SESSION_END lands ahead of the new harness's events.
+                self.stale += 1
+                harness, entry.harness = entry.harness, None
+                await self._shutdown(harness)
+            if entry.harness is not None:
+                self.hits   += 1
+            else:
+                self.misses += 1
+            try:
+                if entry.harness is None:
+                    harness = self._factory()
+                    await harness.start(session_id)
+                    entry.harness = harness
+                yield entry.harness
+            except BaseException:
+                if self._entries.get(session_id) is entry:
+                    self.discard(session_id)
+                else:
+                    self.discards += 1
+                    self._retire(entry)
+                raise
+            if self._log is not None:
+                entry.seen = await self._log.event_count(session_id)
+        finally:
+            entry.lock.release()
+            entry.leases   -= 1
+            entry.last_used = time.monotonic()
+
+    def _checkout(self, session_id: str) -> _Entry:
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._entries.move_to_end(session_id)
+        else:
+            entry = self._entries[session_id] = _Entry()
+            self._evict_lru()
+        entry.leases += 1
+        return entry
+
+    async def _is_current(self, session_id: str, entry: _Entry) -> bool:
+        if self._log is None:
+            return True
+        return await self._log.event_count(session_id) == entry.seen
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session's harness (e.g. after a failed turn) and shut it down."""
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self.discards += 1
+            self._retire(entry)
+
+    async def aclose(self) -> None:
+        """Shut down every warm harness and wait for pending shutdowns."""
+        for sid in list(self._entries):
+            self._retire(self._entries.pop(sid))
+        if self._shutdowns:
+            await asyncio.gather(*self._shutdowns, return_exceptions=True)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl_sec
+        for sid, entry in list(self._entries.items()):
+            if entry.leases == 0 and entry.last_used < cutoff:
+                del self._entries[sid]
+                self.evictions_ttl += 1
+                self._retire(entry)
+
+    def _evict_lru(self) -> None:
+        for sid, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_size:
+                break
+            if entry.leases == 0 and entry.harness is not None:
+                del self._entries[sid]
+                self.evictions_lru += 1
+                self._retire(entry)
+
+    def _retire(self, entry: _Entry) -> None:
+        # Shut down off the caller's path: eviction runs synchronously inside lease().
+        harness, entry.harness = entry.harness, None
+        if harness is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._shutdown(harness))
+        self._shutdowns.add(task)
+        task.add_done_callback(self._shutdowns.discard)
+
+    @staticmethod
+    async def _shutdown(harness: AgentHarness) -> None:
+        try:
+            await harness.shutdown()
+        except Exception:
+            pass                                      # best effort: the log stays the source of truth
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size":          len(self._entries),
+            "max_size":      self.max_size,
+            "idle_ttl_sec":  self.idle_ttl_sec,
+            "hits":          self.hits,
+            "misses":        self.misses,
+            "hit_rate":      round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions_ttl": self.evictions_ttl,
+            "evictions_lru": self.evictions_lru,
+            "stale":         self.stale,
+            "discards":      self.discards,
+        }
@@ -7,8 +7,8 @@ without modifying agent logic.
 Middleware stack (applied in order):
     1. SessionLoggingMiddleware  — write every turn to durable session log
     2. SecurityMiddleware        — scrub credential patterns from context
-    3. RateLimitMiddleware       — token bucket rate limiter (RPM)
-    4. ObservabilityMiddleware   — TTFT latency + run metrics
+    3. RateLimitMiddleware       — shared token bucket (RPM + TPM), waits instead of failing
+    4. ObservabilityMiddleware   — generation / model / tool time (+ TTFT on streams)
 
 AF API: @agent_middleware, AgentContext
 """
@@ -16,11 +16,18 @@ AF API: @agent_middleware, AgentContext
 from __future__ import annotations
 
 import time
+from contextvars import ContextVar, Token
 from typing import TYPE_CHECKING
 
 from agent_framework import AgentContext, agent_middleware
 
+from maf_harness.middleware.quantiles import LogHistogram, WindowedHistogram
+from maf_harness.middleware.ratelimit import RateLimiter, shared_rate_limiter
+from maf_harness.middleware.redact import DEFAULT_MARKERS, Redactor
+from maf_harness.middleware.telemetry import record_tokens
+
 if TYPE_CHECKING:
+    from maf_harness.sandbox.sandbox import VaultStore
     from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
 
 
@@ -65,24 +72,48 @@ def make_session_logging_middleware(session_log, session_id: str):
 
 # ── 2. Security ─────────────────────────────────────────────────────────────────
 
-def make_security_middleware(blocked_patterns: list[str] | None = None):
+def make_security_middleware(
+    blocked_patterns: list[str] | None  = None,
+    vault:            VaultStore | None = None,
+):
     """
     Enforce security boundary: scrub credential patterns before they reach model context.
     Credentials never appear in sandbox.
+
+    Matching values are masked in place (see redact.py) — the rest of the message
+    survives. With a vault, every stored token is masked too; the compiled matcher
+    is taken from the vault's cache, so it is rebuilt only when the vault changes.
     """
-    _blocked = blocked_patterns or [
-        "sk-", "Bearer ", "AZURE_", "password=", "secret=",
-        "token=", "api_key=", "FoundryKey",
-    ]
+    markers = tuple(blocked_patterns or DEFAULT_MARKERS)
+    static  = Redactor(markers=markers)
+
+    def _redact_message(msg, redactor: Redactor) -> bool | None:
+        """Mask text contents in place. True if changed, None if a match could not be edited."""
+        changed = False
+        for content in getattr(msg, "contents", None) or ():
+            text = getattr(content, "text", None)
+            if isinstance(text, str) and text:
+                masked = redactor.redact(text)
+                if masked is not text:
+                    content.text = masked
+                    changed = True
+        if not changed and redactor.contains(str(msg)):
+            return None
+        return changed
 
     @agent_middleware
     async def _mw(ctx: AgentContext, next):
-        safe = []
+        redactor = vault.redactor(markers) if vault is not None else static
+        safe, scrubbed = [], 0
         for msg in ctx.messages:
-            if any(p in str(msg) for p in _blocked):
-                print(f"[SECURITY] Scrubbed credential patterns from message context.")
+            changed = _redact_message(msg, redactor)
+            if changed is None:
+                scrubbed += 1                     # match outside any text content: drop it
                 continue
+            scrubbed += changed
             safe.append(msg)
+        if scrubbed:
+            print(f"[SECURITY] Scrubbed credential patterns from {scrubbed} message(s).")
         ctx.messages = safe
         return await next()
 
@@ -91,94 +122,309 @@ def make_security_middleware(blocked_patterns: list[str] | None = None):
 
 # ── 3. Rate Limiting ────────────────────────────────────────────────────────────
 
-def make_rate_limit_middleware(max_rpm: int = 60):
-    """Simple sliding window rate limiter."""
-    from collections import deque
+def make_rate_limit_middleware(
+    max_rpm:           int                = 60,
+    max_tpm:           int                = 0,
+    limiter:           RateLimiter | None = None,
+    est_output_tokens: int                = 512,
+):
+    """
+    Token-bucket limiter shared by every harness in the process (see ratelimit.py).
+
+    Waits for budget instead of raising; only a full wait queue raises
+    RateLimitExceeded. With a token limit, the prompt size plus `est_output_tokens`
+    is reserved up front and settled against the reported usage afterwards.
+    """
+    from maf_harness.session.compaction import estimate_tokens
 
-    window: deque[float] = deque()
+    lim = limiter or shared_rate_limiter(max_rpm, max_tpm)
 
     @agent_middleware
     async def _mw(ctx: AgentContext, next):
-        now = time.time()
-        while window and now - window[0] > 60:
-            window.popleft()
-        if len(window) >= max_rpm:
-            raise RuntimeError(
-                f"Rate limit: {max_rpm} requests/min exceeded. Please wait."
-            )
-        window.append(now)
-        return await next()
+        reserved = 0
+        if lim.tpm:
+            reserved = sum(estimate_tokens(str(m)) for m in ctx.messages) + est_output_tokens
+        waited = await lim.acquire(reserved)
+        if waited > 0.5:
+            print(f"[RATE LIMIT] Waited {waited:.1f}s for '{lim.key}' budget.")
+        result = await next()
+        usage = getattr(result, "usage", None) if result is not None else None
+        if usage and getattr(usage, "total_tokens", None):
+            await lim.settle(reserved, usage.total_tokens)
+        return result
 
     return _mw
 
 
-# ── 4. Observability (TTFT Metrics) ───────────────────────────────────────────
+# ── 4. Observability (Run Timing) ─────────────────────────────────────────────
 
 class Metrics:
-    """In-process metrics — replace with OpenTelemetry in production."""
+    """
+    In-process metrics. OpenTelemetry export lives in telemetry.py
+    (configure_telemetry()); these histograms stay available for /health and demos.
+
+    Latencies go into constant-memory log histograms (see quantiles.py): quantiles
+    are read over a sliding `window_sec` window and are accurate to within
+    `relative_error`. snapshot() is JSON-safe and merge_snapshots() combines the
+    snapshots of several workers.
+
+    Run timings (see RunTimer):
+        ttft         request → first streamed token (streaming runs only)
+        first_response  request → response of a non-streaming run: the first
+                     response is the whole completion, so this is TTFT's
+                     upper bound, reported only when no streamed samples exist
+        inter_token  gap between consecutive streamed tokens
+        generation   request → last token / response
+        tool_time    time spent inside sandbox tools during the run
+        model_time   generation - tool_time
+
+    Sandbox leases (see sandbox/lease.py) count provisions and the tool calls
+    that reused a leased sandbox instead (provisions avoided).
+    """
 
-    def __init__(self) -> None:
-        self.samples:      list[float] = []
-        self.total_runs:   int         = 0
-        self.total_errors: int         = 0
-        self.total_tokens: int         = 0
+    HISTOGRAMS = ("ttft", "first_response", "inter_token", "generation", "tool_time", "model_time", "queue_wait")
+
+    def __init__(self, window_sec: float = 60.0, relative_error: float = 0.01) -> None:
+        self.window_sec:   float = window_sec
+        self.ttft              = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.first_response    = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.inter_token       = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.generation        = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.tool_time         = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.model_time        = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.total_runs:   int   = 0
+        self.total_errors: int   = 0
+        self.total_tokens: int   = 0
+        # Scheduler (orchestration.scheduler.BrainScheduler)
+        self.queue_wait          = WindowedHistogram(window_sec, relative_error=relative_error)
+        self.queue_depth:     int = 0
+        self.max_queue_depth: int = 0
+        # Sandbox leases (sandbox.lease.SandboxLease)
+        self.sandbox_provisions: int = 0
+        self.sandbox_reuses:     int = 0
 
     def record_ttft(self, ms: float) -> None:
-        self.samples.append(ms)
+        self.ttft.record(ms)
+
+    def record_queue_wait(self, ms: float) -> None:
+        self.queue_wait.record(ms)
+
+    def record_sandbox_provision(self) -> None:
+        self.sandbox_provisions += 1
+
+    def record_sandbox_reuse(self) -> None:
+        self.sandbox_reuses += 1
+
+    def set_queue_depth(self, depth: int) -> None:
+        self.queue_depth     = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
 
     @property
     def p50(self) -> float:
-        if not self.samples:
-            return 0.0
-        s = sorted(self.samples)
-        return s[len(s) // 2]
+        return self.ttft.window().quantile(0.50)
 
     @property
     def p95(self) -> float:
-        if not self.samples:
-            return 0.0
-        s = sorted(self.samples)
-        return s[int(len(s) * 0.95)]
+        return self.ttft.window().quantile(0.95)
+
+    def quantiles(self, hist: WindowedHistogram | None = None) -> dict:
+        """p50/p90/p95/p99/max over the sliding window, from a single merge."""
+        return _quantiles((hist or self.ttft).window())
+
+    def ttft_fields(self) -> dict:
+        """
+        TTFT quantiles, labelled with their source: streamed first tokens when
+        the window has any, else non-streaming completions (first response =
+        completion). Empty when there are neither, rather than reporting 0.
+        """
+        for hist, source in ((self.ttft, "stream"), (self.first_response, "non_streaming_completion")):
+            q = self.quantiles(hist)
+            if q["count"]:
+                return {
+                    "ttft_source": source,
+                    "p50_ttft_ms": q["p50"],
+                    "p90_ttft_ms": q["p90"],
+                    "p95_ttft_ms": q["p95"],
+                    "p99_ttft_ms": q["p99"],
+                    "max_ttft_ms": q["max"],
+                }
+        return {}
 
     def summary(self) -> dict:
+        gen   = self.quantiles(self.generation)
+        queue = self.quantiles(self.queue_wait)
+        return {
+            "total_runs":         self.total_runs,
+            "total_errors":       self.total_errors,
+            "window_sec":         self.window_sec,
+            **self.ttft_fields(),
+            "p50_inter_token_ms": self.quantiles(self.inter_token)["p50"],
+            "p50_generation_ms":  gen["p50"],
+            "p95_generation_ms":  gen["p95"],
+            "p50_tool_ms":        self.quantiles(self.tool_time)["p50"],
+            "p50_model_ms":       self.quantiles(self.model_time)["p50"],
+            "total_tokens":       self.total_tokens,
+            "queue_depth":        self.queue_depth,
+            "max_queue_depth":    self.max_queue_depth,
+            "p95_queue_wait_ms":  queue["p95"],
+            "sandbox_provisions":         self.sandbox_provisions,
+            "sandbox_provisions_avoided": self.sandbox_reuses,
+        }
+
+    def snapshot(self) -> dict:
+        """Mergeable, JSON-safe snapshot of this worker's counters and windows."""
+        return {
+            "total_runs":      self.total_runs,
+            "total_errors":    self.total_errors,
+            "total_tokens":    self.total_tokens,
+            "max_queue_depth": self.max_queue_depth,
+            "sandbox_provisions": self.sandbox_provisions,
+            "sandbox_reuses":     self.sandbox_reuses,
+            **{name: getattr(self, name).window().to_dict() for name in self.HISTOGRAMS},
+        }
+
+    @staticmethod
+    def merge_snapshots(snapshots: list[dict]) -> dict:
+        """Aggregate snapshot() results from several workers into one summary."""
+        merged = {}
+        for name in Metrics.HISTOGRAMS:
+            parts = [LogHistogram.from_dict(snap[name]) for snap in snapshots if name in snap]
+            if not parts:
+                continue
+            h = parts[0]
+            for part in parts[1:]:
+                h.merge(part)
+            merged[f"{name}_ms"] = _quantiles(h)
         return {
-            "total_runs":   self.total_runs,
-            "total_errors": self.total_errors,
-            "p50_ttft_ms":  round(self.p50, 2),
-            "p95_ttft_ms":  round(self.p95, 2),
-            "total_tokens": self.total_tokens,
+            "workers":         len(snapshots),
+            "total_runs":      sum(s["total_runs"] for s in snapshots),
+            "total_errors":    sum(s["total_errors"] for s in snapshots),
+            "total_tokens":    sum(s["total_tokens"] for s in snapshots),
+            "max_queue_depth": max(s["max_queue_depth"] for s in snapshots),
+            "sandbox_provisions":         sum(s.get("sandbox_provisions", 0) for s in snapshots),
+            "sandbox_provisions_avoided": sum(s.get("sandbox_reuses", 0) for s in snapshots),
+            **merged,
         }
 
 
+def _quantiles(h: LogHistogram) -> dict:
+    return {
+        "count": h.count,
+        "p50":   round(h.quantile(0.50), 2),
+        "p90":   round(h.quantile(0.90), 2),
+        "p95":   round(h.quantile(0.95), 2),
+        "p99":   round(h.quantile(0.99), 2),
+        "max":   round(h.max, 2),
+    }
+
+
+class RunTimer:
+    """
+    Timings for one agent run, recorded into Metrics when it finishes.
+
+    Streaming callers call token() per chunk, which yields real TTFT and
+    inter-token gaps; runs that never stream record their completion time as
+    first_response instead. Sandbox tools report their time through
+    record_tool_time() so model time can be separated from tool time.
+    """
+
+    def __init__(self, metrics: Metrics) -> None:
+        self.metrics  = metrics
+        self.start    = time.perf_counter()
+        self.first:  float | None = None
+        self.last:   float | None = None
+        self.tool_ms: float       = 0.0
+
+    def token(self) -> None:
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+            self.metrics.record_ttft((now - self.start) * 1000)
+        else:
+            self.metrics.inter_token.record((now - self.last) * 1000)
+        self.last = now
+
+    def finish(self) -> float:
+        """Record generation / tool / model time; returns generation ms."""
+        total_ms = (time.perf_counter() - self.start) * 1000
+        if self.first is None:
+            self.metrics.first_response.record(total_ms)
+        self.metrics.generation.record(total_ms)
+        self.metrics.tool_time.record(self.tool_ms)
+        self.metrics.model_time.record(max(0.0, total_ms - self.tool_ms))
+        return total_ms
+
+
+# The run in progress in this task; set by the observability middleware or by
+# AgentHarness.run_streaming, read by sandbox tool wrappers.
+_CURRENT_RUN: ContextVar[RunTimer | None] = ContextVar("maf_current_run", default=None)
+
+
+def current_run() -> RunTimer | None:
+    return _CURRENT_RUN.get()
+
+
+def start_run(metrics: Metrics | None = None) -> tuple[RunTimer, Token]:
+    timer = RunTimer(metrics or GLOBAL_METRICS)
+    return timer, _CURRENT_RUN.set(timer)
+
+
+def end_run(token: Token) -> None:
+    try:
+        _CURRENT_RUN.reset(token)
+    except ValueError:
+        # Reset from a different context (e.g. a stream finished by another task).
+        _CURRENT_RUN.set(None)
+
+
+def record_tool_time(ms: float) -> None:
+    """Attribute `ms` of tool execution to the current run, if any."""
+    timer = _CURRENT_RUN.get()
+    if timer is not None:
+        timer.tool_ms += ms
+
+
 GLOBAL_METRICS = Metrics()
 
 
 def make_observability_middleware(metrics: Metrics | None = None):
     """
-    Measure time-to-first-token (TTFT) latency on every agent run.
+    Time every agent run: total generation time, split into model and tool time.
     Anthropic reduced p50 TTFT by ~60% and p95 by >90% by decoupling brain from sandbox.
-    This middleware tracks that metric for your deployment.
+
+    TTFT and inter-token latency need a stream to observe, so they are recorded by
+    AgentHarness.run_streaming(); when that outer timer is active this middleware
+    only counts the run and leaves timing to it. Non-streaming runs (e.g. the
+    Functions host) record their completion time as first_response, which
+    Metrics.summary() reports as TTFT labelled "non_streaming_completion".
     """
     m = metrics or GLOBAL_METRICS
 
     @agent_middleware
     async def _mw(ctx: AgentContext, next):
-        start = time.perf_counter()
         m.total_runs += 1
+        outer = current_run()
+        timer, token = (outer, None) if outer is not None else start_run(m)
         try:
             result = await next()
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            m.record_ttft(elapsed_ms)
             if hasattr(result, "usage") and result.usage:
-                m.total_tokens += getattr(result.usage, "total_tokens", 0)
-            print(
-                f"[METRICS] run={m.total_runs} "
-                f"latency={elapsed_ms:.0f}ms "
-                f"p50={m.p50:.0f}ms p95={m.p95:.0f}ms"
-            )
+                tokens = getattr(result.usage, "total_tokens", 0) or 0
+                m.total_tokens += tokens
+                record_tokens(tokens)
+            if token is not None:
+                elapsed_ms = timer.finish()
+                gen = m.quantiles(m.generation)
+                print(
+                    f"[METRICS] run={m.total_runs} "
+                    f"latency={elapsed_ms:.0f}ms (tools {timer.tool_ms:.0f}ms) "
+                    f"p50={gen['p50']:.0f}ms p95={gen['p95']:.0f}ms"
+                )
             return result
         except Exception:
             m.total_errors += 1
             raise
+        finally:
+            if token is not None:
+                end_run(token)
 
     return _mw
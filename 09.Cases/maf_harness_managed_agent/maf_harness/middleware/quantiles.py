@@ -0,0 +1,152 @@
+"""
+maf_harness.middleware.quantiles
+=================================
+Constant-memory streaming quantiles for latency metrics.
+
+LogHistogram buckets values on a logarithmic scale (the HDR-histogram / DDSketch
+idea): bucket i covers (γ^(i-1), γ^i] with γ = (1 + α) / (1 - α), so every
+reported quantile is within relative error α of the true value. Memory depends
+only on the dynamic range, not the sample count — 1 µs … 1 h at α = 1% is under
+1,200 buckets — and two histograms with the same α merge by adding counts.
+
+WindowedHistogram keeps a ring of per-slot histograms so quantiles can be read
+over a sliding time window (e.g. the last 60 s) as well as since start.
+
+    h = WindowedHistogram(window_sec=60, slots=6, relative_error=0.01)
+    h.record(123.4)
+    h.window().quantile(0.99)
+    LogHistogram.from_dict(worker_a).merge(LogHistogram.from_dict(worker_b))
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+
+
+class LogHistogram:
+    """Log-bucketed histogram with a relative-error guarantee on quantiles."""
+
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-3) -> None:
+        if not 0 < relative_error < 1:
+            raise ValueError("relative_error must be in (0, 1)")
+        self.relative_error = relative_error
+        self.min_value      = min_value                # values <= this share one bucket
+        self._gamma         = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma     = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._low   = 0
+        self.count  = 0
+        self.total  = 0.0
+        self.min    = math.inf
+        self.max    = 0.0
+
+    def record(self, value: float) -> None:
+        if value <= self.min_value:
+            self._low += 1
+        else:
+            i = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[i] = self._buckets.get(i, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min    = min(self.min, value)
+        self.max    = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0..1); 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._low
+        if rank < seen:
+            return self.min
+        for i in sorted(self._buckets):
+            seen += self._buckets[i]
+            if rank < seen:
+                # Bucket midpoint (in relative terms), clamped to what was observed.
+                value = 2 * self._gamma ** i / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: LogHistogram) -> LogHistogram:
+        """Add `other` into this histogram (same relative_error / min_value)."""
+        if (other.relative_error, other.min_value) != (self.relative_error, self.min_value):
+            raise ValueError("Cannot merge histograms with different precision.")
+        for i, n in other._buckets.items():
+            self._buckets[i] = self._buckets.get(i, 0) + n
+        self._low  += other._low
+        self.count += other.count
+        self.total += other.total
+        self.min    = min(self.min, other.min)
+        self.max    = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> dict:
+        """JSON-safe snapshot, e.g. to ship per-worker metrics to an aggregator."""
+        return {
+            "relative_error": self.relative_error,
+            "min_value":      self.min_value,
+            "buckets":        {str(i): n for i, n in self._buckets.items()},
+            "low":            self._low,
+            "count":          self.count,
+            "total":          self.total,
+            "min":            self.min if self.count else None,
+            "max":            self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> LogHistogram:
+        h = cls(d["relative_error"], d["min_value"])
+        h._buckets = {int(i): n for i, n in d["buckets"].items()}
+        h._low     = d["low"]
+        h.count    = d["count"]
+        h.total    = d["total"]
+        h.min      = d["min"] if d["min"] is not None else math.inf
+        h.max      = d["max"]
+        return h
+
+
+class WindowedHistogram:
+    """
+    Sliding-window view over LogHistograms.
+
+    The window is split into `slots` sub-histograms; a read merges the slots that
+    are still inside the window, so memory is bounded by `slots` histograms.
+    `lifetime` accumulates everything since start.
+    """
+
+    def __init__(
+        self,
+        window_sec:     float = 60.0,
+        slots:          int   = 6,
+        relative_error: float = 0.01,
+    ) -> None:
+        self.window_sec     = window_sec
+        self.relative_error = relative_error
+        self._slot_sec      = window_sec / slots
+        self._slots: deque[tuple[int, LogHistogram]] = deque(maxlen=slots)
+        self.lifetime       = LogHistogram(relative_error)
+
+    def _slot_id(self, now: float) -> int:
+        return int(now // self._slot_sec)
+
+    def record(self, value: float, now: float | None = None) -> None:
+        sid = self._slot_id(time.monotonic() if now is None else now)
+        if not self._slots or self._slots[-1][0] != sid:
+            self._slots.append((sid, LogHistogram(self.relative_error)))
+        self._slots[-1][1].record(value)
+        self.lifetime.record(value)
+
+    def window(self, now: float | None = None) -> LogHistogram:
+        """Merged histogram of the samples recorded within the last `window_sec`."""
+        oldest = self._slot_id(time.monotonic() if now is None else now) - self._slots.maxlen + 1
+        merged = LogHistogram(self.relative_error)
+        for sid, h in self._slots:
+            if sid >= oldest:
+                merged.merge(h)
+        return merged
@@ -0,0 +1,282 @@
+"""
+maf_harness.middleware.ratelimit
+=================================
+Token-bucket rate limiting for model calls, shared across harnesses.
+
+Two buckets per key, both refilled continuously:
+    requests  capacity = rpm, refill rpm / 60 per second   (rpm <= 0 → unlimited)
+    tokens    capacity = tpm, refill tpm / 60 per second   (tpm <= 0 → unlimited)
+
+A call reserves one request and its estimated tokens up front; once the real
+usage is known, RateLimiter.settle() charges (or refunds) the difference, so the
+token bucket tracks the provider's own accounting instead of the estimate.
+
+Callers wait instead of failing: RateLimiter.acquire() sleeps until both buckets
+can pay, serving waiters in FIFO order. Only when `max_waiters` callers are
+already queued, or the wait would exceed `max_wait_sec`, does it raise
+RateLimitExceeded.
+
+Backends hold the bucket state:
+    InProcessRateLimitBackend   one budget per process (default)
+    SqliteRateLimitBackend      one budget shared by every process using the file
+
+    limiter = shared_rate_limiter(rpm=60, tpm=90_000)    # same object for every harness
+    await limiter.acquire(tokens=1_200)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+class RateLimitExceeded(RuntimeError):
+    """The wait queue is full or the required wait exceeds the caller's budget."""
+
+
+# ── Bucket Arithmetic ───────────────────────────────────────────────────────────
+
+@dataclass
+class _Bucket:
+    requests: float
+    tokens:   float
+    updated:  float
+
+
+def _take(
+    bucket:   _Bucket | None,
+    now:      float,
+    rpm:      int,
+    tpm:      int,
+    requests: float,
+    tokens:   float,
+) -> tuple[_Bucket, float]:
+    """
+    Refill `bucket` to `now` and try to pay (requests, tokens).
+    Returns the new bucket and 0.0 on success, or the seconds until it could pay.
+    """
+    rpm, tpm = max(rpm, 0), max(tpm, 0)               # <= 0 disables that bucket
+    if bucket is None:
+        bucket = _Bucket(requests=rpm, tokens=tpm, updated=now)
+    elapsed = max(0.0, now - bucket.updated)
+    req = min(rpm, bucket.requests + elapsed * rpm / 60) if rpm else 0.0
+    tok = min(tpm, bucket.tokens + elapsed * tpm / 60) if tpm else 0.0
+    # A single call larger than the whole bucket is admitted once the bucket is full.
+    need_tok = min(tokens, tpm) if tpm else 0.0
+
+    wait = 0.0
+    if rpm and req < requests:
+        wait = (requests - req) * 60 / rpm
+    if tpm and tok < need_tok:
+        wait = max(wait, (need_tok - tok) * 60 / tpm)
+    if wait > 0:
+        return _Bucket(req, tok, now), wait
+    return _Bucket(req - requests if rpm else 0.0, tok - tokens if tpm else 0.0, now), 0.0
+
+
+# ── Backends ────────────────────────────────────────────────────────────────────
+
+class RateLimitBackend(ABC):
+    """Atomic take / adjust over named buckets."""
+
+    @abstractmethod
+    async def take(self, key: str, rpm: int, tpm: int, requests: float, tokens: float) -> float:
+        """Pay from the buckets if possible. Returns 0.0, or seconds to wait before retrying."""
+
+    @abstractmethod
+    async def adjust(self, key: str, rpm: int, tpm: int, tokens: float) -> None:
+        """Charge `tokens` more (negative refunds) without waiting; may go into debt."""
+
+    async def close(self) -> None:
+        return None
+
+
+class InProcessRateLimitBackend(RateLimitBackend):
+    def __init__(self) -> None:
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, key, rpm, tpm, requests, tokens):
+        with self._lock:
+            bucket, wait = _take(self._buckets.get(key), time.time(), rpm, tpm, requests, tokens)
+            self._buckets[key] = bucket
+        return wait
+
+    async def adjust(self, key, rpm, tpm, tokens):
+        if not tpm:
+            return
+        with self._lock:
+            bucket, _ = _take(self._buckets.get(key), time.time(), rpm, tpm, 0, 0)
+            bucket.tokens = min(tpm, bucket.tokens - tokens)
+            self._buckets[key] = bucket
+
+
+class SqliteRateLimitBackend(RateLimitBackend):
+    """
+    Bucket state in a SQLite file. Each take/adjust is one BEGIN IMMEDIATE
+    transaction, so every process pointing at the same file shares one budget.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            key       TEXT PRIMARY KEY,
+            requests  REAL NOT NULL,
+            tokens    REAL NOT NULL,
+            updated   REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path  = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self._SCHEMA)
+        self._lock = threading.Lock()
+
+    def _update(self, key, rpm, tpm, requests, tokens, debit: float = 0.0) -> float:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute(
+                    "SELECT requests, tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                bucket, wait = _take(_Bucket(*row) if row else None, time.time(), rpm, tpm, requests, tokens)
+                if debit and tpm:
+                    bucket.tokens = min(tpm, bucket.tokens - debit)
+                cur.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, requests, tokens, updated) VALUES (?, ?, ?, ?)",
+                    (key, bucket.requests, bucket.tokens, bucket.updated),
+                )
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def take(self, key, rpm, tpm, requests, tokens):
+        return await asyncio.to_thread(self._update, key, rpm, tpm, requests, tokens)
+
+    async def adjust(self, key, rpm, tpm, tokens):
+        if tpm:
+            await asyncio.to_thread(self._update, key, rpm, tpm, 0, 0, tokens)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ── Limiter ─────────────────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Async front-end over a backend bucket: FIFO waiting with a bounded queue.
+
+    rpm           requests per minute (0 = no request limit)
+    tpm           tokens per minute (0 = no token limit)
+    key           bucket name; limiters with the same key and backend share a budget
+    max_waiters   callers allowed to wait at once before RateLimitExceeded
+    max_wait_sec  longest a single caller will wait
+    """
+
+    def __init__(
+        self,
+        rpm:          int,
+        tpm:          int                     = 0,
+        backend:      RateLimitBackend | None = None,
+        key:          str                     = "foundry",
+        max_waiters:  int                     = 256,
+        max_wait_sec: float                   = 120.0,
+    ) -> None:
+        self.rpm          = rpm
+        self.tpm          = tpm
+        self.backend      = backend or get_default_backend()
+        self.key          = key
+        self.max_waiters  = max_waiters
+        self.max_wait_sec = max_wait_sec
+        self._turn        = asyncio.Lock()     # FIFO: one caller at a time polls the bucket
+        self._waiters     = 0
+        self.granted      = 0
+        self.delayed      = 0
+        self.rejected     = 0
+        self.waited_sec   = 0.0
+
+    async def acquire(self, tokens: float = 0) -> float:
+        """Wait until one request plus `tokens` can be paid. Returns seconds waited."""
+        if self._waiters >= self.max_waiters:
+            self.rejected += 1
+            raise RateLimitExceeded(
+                f"Rate limit queue full ({self.max_waiters} waiting) for '{self.key}'."
+            )
+        self._waiters += 1
+        start = time.monotonic()
+        try:
+            async with self._turn:
+                while True:
+                    wait = await self.backend.take(self.key, self.rpm, self.tpm, 1, tokens)
+                    if wait <= 0:
+                        break
+                    if time.monotonic() - start + wait > self.max_wait_sec:
+                        self.rejected += 1
+                        raise RateLimitExceeded(
+                            f"Rate limit for '{self.key}' needs {wait:.1f}s more; "
+                            f"max wait is {self.max_wait_sec:.0f}s."
+                        )
+                    await asyncio.sleep(wait)
+        finally:
+            self._waiters -= 1
+        waited = time.monotonic() - start
+        self.granted += 1
+        if waited > 0.001:
+            self.delayed    += 1
+            self.waited_sec += waited
+        return waited
+
+    async def settle(self, reserved: float, actual: float) -> None:
+        """Charge the difference between the reserved estimate and real usage."""
+        if self.tpm and actual != reserved:
+            await self.backend.adjust(self.key, self.rpm, self.tpm, actual - reserved)
+
+    def stats(self) -> dict:
+        return {
+            "key":        self.key,
+            "rpm":        self.rpm,
+            "tpm":        self.tpm,
+            "waiting":    self._waiters,
+            "granted":    self.granted,
+            "delayed":    self.delayed,
+            "rejected":   self.rejected,
+            "waited_sec": round(self.waited_sec, 3),
+        }
+
+
+# ── Process-wide Registry ───────────────────────────────────────────────────────
+
+_default_backend: RateLimitBackend | None = None
+_limiters: dict[tuple[str, int, int], RateLimiter] = {}
+
+
+def get_default_backend() -> RateLimitBackend:
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = InProcessRateLimitBackend()
+    return _default_backend
+
+
+def set_default_backend(backend: RateLimitBackend) -> None:
+    """Use `backend` for limiters created from now on (e.g. SqliteRateLimitBackend)."""
+    global _default_backend
+    _default_backend = backend
+    _limiters.clear()
+
+
+def shared_rate_limiter(rpm: int, tpm: int = 0, key: str = "foundry") -> RateLimiter:
+    """One limiter per (key, rpm, tpm) in this process, on the default backend."""
+    limiter = _limiters.get((key, rpm, tpm))
+    if limiter is None:
+        limiter = _limiters[(key, rpm, tpm)] = RateLimiter(rpm, tpm, key=key)
+    return limiter
@@ -0,0 +1,188 @@
+"""
+maf_harness.middleware.redact
+==============================
+Compiled, single-pass credential redaction.
+
+Redactor combines two kinds of pattern into one left-to-right pass:
+
+    secrets   literal values (vault tokens) — replaced entirely by the mask
+    markers   credential prefixes ("Bearer ", "sk-", "password=") — the value that
+              follows the marker is masked, the marker itself is kept; a bare
+              marker with no value (e.g. "FoundryKey" alone) is masked itself
+
+Secrets are compiled into a prefix-trie regex, so matching cost does not grow
+with one `str.replace` per secret; markers are located with one `str.find` scan
+each. Because a secret can only occur inside a run of characters that secrets
+are made of, and at least as long as the shortest secret, the trie only runs
+inside such runs — ordinary prose and JSON are skipped at C speed.
+
+Build a Redactor once per secret set (VaultStore.redactor() caches it until the
+vault changes). StreamRedactor applies it to streamed text chunk by chunk,
+holding back only the tail that could still be the start of a match.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+MASK = "***REDACTED***"
+
+DEFAULT_MARKERS = (
+    "sk-", "Bearer ", "AZURE_", "password=", "secret=",
+    "token=", "api_key=", "FoundryKey",
+)
+
+_VALUE = r"[^\s\"'<>,;]*"          # marker value: up to whitespace / quote / separator
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Regex equivalent to '|'.join(words), factored by shared prefixes (longest wins)."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _char_class(chars: set[str]) -> str:
+    """Regex character class for `chars`, collapsed into ranges (a-z scans faster than abc…z)."""
+    codes, parts, i = sorted(map(ord, chars)), [], 0
+    while i < len(codes):
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+            j += 1
+        lo, hi = re.escape(chr(codes[i])), re.escape(chr(codes[j]))
+        parts.append(lo if i == j else f"{lo}-{hi}" if j > i + 1 else lo + hi)
+        i = j + 1
+    return "[" + "".join(parts) + "]"
+
+
+class Redactor:
+    """Masks literal secrets and marker-prefixed values in one pass."""
+
+    def __init__(
+        self,
+        secrets: Iterable[str] = (),
+        markers: Iterable[str] = (),
+        mask:    str           = MASK,
+    ) -> None:
+        self.mask    = mask
+        secrets      = sorted({s for s in secrets if s})
+        markers      = sorted({m for m in markers if m}, key=len, reverse=True)
+        self.max_len = max((len(s) for s in secrets), default=0)
+        self.max_marker_len = max((len(m) for m in markers), default=0)
+
+        self._secret_re = self._run_re = None
+        if secrets:
+            charset = _char_class(set("".join(secrets)))
+            min_len = min(len(s) for s in secrets)
+            self._secret_re = re.compile(_trie_pattern(secrets))
+            self._run_re    = re.compile(f"{charset}{{{min_len},}}")
+        self._markers  = markers
+        self._value_re = re.compile(_VALUE)
+
+    def __bool__(self) -> bool:
+        return self._secret_re is not None or bool(self._markers)
+
+    def _spans(self, text: str) -> list[tuple[int, int, str]]:
+        """Non-overlapping (start, end, replacement) spans, in order."""
+        spans: list[tuple[int, int, str]] = []
+        if self._secret_re is not None:
+            for run in self._run_re.finditer(text):
+                for m in self._secret_re.finditer(text, run.start(), run.end()):
+                    spans.append((m.start(), m.end(), self.mask))
+        # One str.find scan per marker beats a regex alternation, which gets no literal fast path.
+        for marker in self._markers:
+            i = text.find(marker)
+            while i != -1:
+                start = i + len(marker)
+                end   = self._value_re.match(text, start).end()
+                if end > start:
+                    spans.append((i, end, marker + self.mask))
+                else:
+                    spans.append((i, start, self.mask))   # bare marker: mask the literal
+                i = text.find(marker, max(end, i + 1))
+        if self._markers:
+            spans.sort()
+        merged: list[tuple[int, int, str]] = []
+        for start, end, repl in spans:
+            if merged and start < merged[-1][1]:
+                s0, e0, r0 = merged[-1]
+                merged[-1] = (s0, max(e0, end), r0)
+            else:
+                merged.append((start, end, repl))
+        return merged
+
+    @staticmethod
+    def _apply(text: str, spans: list[tuple[int, int, str]], upto: int) -> str:
+        out, pos = [], 0
+        for start, end, repl in spans:
+            out.append(text[pos:start])
+            out.append(repl)
+            pos = end
+        out.append(text[pos:upto])
+        return "".join(out)
+
+    def redact(self, text: str) -> str:
+        spans = self._spans(text)
+        return self._apply(text, spans, len(text)) if spans else text
+
+    def contains(self, text: str) -> bool:
+        return bool(self._spans(text))
+
+    def stream(self) -> StreamRedactor:
+        return StreamRedactor(self)
+
+
+class StreamRedactor:
+    """
+    Incremental redaction over streamed chunks.
+
+        sr = redactor.stream()
+        for chunk in chunks:
+            yield sr.feed(chunk)
+        yield sr.flush()
+
+    Output lags input by at most the longest secret/marker (or, for a marker
+    value still open at the chunk edge, until it ends or `max_hold` is reached).
+    """
+
+    def __init__(self, redactor: Redactor, max_hold: int = 65_536) -> None:
+        self._r       = redactor
+        self._carry   = ""
+        self.max_hold = max_hold
+        # A secret needs len-1 chars of lookahead; a bare marker at the edge is held whole.
+        self._hold    = max(redactor.max_len - 1, redactor.max_marker_len)
+
+    def feed(self, chunk: str) -> str:
+        text  = self._carry + chunk
+        spans = self._r._spans(text)
+        cut   = max(0, len(text) - self._hold)
+        for start, end, _ in spans:
+            if end >= len(text) and start < cut:
+                cut = start                       # value may continue in the next chunk
+        if len(text) - cut > self.max_hold:
+            cut = len(text)
+        done = []
+        for span in spans:
+            if span[0] >= cut:
+                break
+            done.append(span)
+            cut = max(cut, span[1])               # a complete match straddling the cut
+        self._carry = text[cut:]
+        return self._r._apply(text, done, cut)
+
+    def flush(self) -> str:
+        text, self._carry = self._carry, ""
+        return self._r.redact(text)
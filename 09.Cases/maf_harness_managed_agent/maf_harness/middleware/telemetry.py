@@ -0,0 +1,166 @@
+"""
+maf_harness.middleware.telemetry
+=================================
+OpenTelemetry spans and histograms for the harness.
+
+Spans:
+    harness.wake        AgentHarness.start() rehydrating from the session log
+    agent.run           one agent turn (run / run_streaming)
+    sandbox.provision   SandboxManager.provision()
+    sandbox.execute     SandboxManager.execute(name, input)
+    session.emit        SessionLog.emit_event()
+
+Histograms:
+    maf_harness.operation.duration   ms, attribute `op` = span name
+    maf_harness.run.tokens           tokens per agent run
+
+Telemetry is off until configure_telemetry() is called. While off, span()
+returns a shared no-op object — no OpenTelemetry import, no allocation — so the
+instrumented hot paths cost one function call and one attribute check.
+
+    configure_telemetry(use_agent_framework=True)          # OTLP via AF env vars
+    configure_telemetry(tracer_provider=tp, meter_provider=mp)   # e.g. tests with
+                                                                 # InMemorySpanExporter
+
+Trace context crosses into sandbox subprocesses as TRACEPARENT / TRACESTATE
+environment variables (subprocess_env()); a child process resumes the trace with
+context_from_env().
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any
+
+
+class _NoopSpan:
+    """Stands in for a span when telemetry is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict | None = None) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+_tracer:   Any = None
+_duration: Any = None
+_tokens:   Any = None
+
+
+class _TimedSpan:
+    """Current span that also records its duration into the duration histogram."""
+
+    __slots__ = ("_cm", "_op", "_start")
+
+    def __init__(self, name: str, attributes: dict) -> None:
+        self._cm = _tracer.start_as_current_span(name, attributes=attributes)
+        self._op = name
+
+    def __enter__(self) -> Any:
+        self._start = time.perf_counter()
+        return self._cm.__enter__()
+
+    def __exit__(self, *exc: Any) -> Any:
+        try:
+            return self._cm.__exit__(*exc)
+        finally:
+            if _duration is not None:
+                _duration.record(
+                    (time.perf_counter() - self._start) * 1000,
+                    {"op": self._op, "error": exc[0] is not None},
+                )
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Context manager for a span named `name`; a no-op while telemetry is off."""
+    if _tracer is None:
+        return _NOOP
+    return _TimedSpan(name, {k: v for k, v in attributes.items() if v is not None})
+
+
+def record_tokens(count: int, **attributes: Any) -> None:
+    if _tokens is not None and count:
+        _tokens.record(count, attributes)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def configure_telemetry(
+    tracer_provider:     Any  = None,
+    meter_provider:      Any  = None,
+    use_agent_framework: bool = False,
+) -> None:
+    """
+    Turn telemetry on.
+
+    use_agent_framework : call agent_framework.observability.configure_otel_providers()
+                          first (reads OTEL_EXPORTER_OTLP_ENDPOINT etc.), as the
+                          tracer_aspire sample does
+    tracer_provider / meter_provider : explicit providers; default to the globals
+    """
+    global _tracer, _duration, _tokens
+    from opentelemetry import metrics, trace
+
+    if use_agent_framework:
+        from agent_framework.observability import configure_otel_providers
+        configure_otel_providers()
+
+    _tracer = (tracer_provider or trace.get_tracer_provider()).get_tracer("maf_harness")
+    meter   = (meter_provider or metrics.get_meter_provider()).get_meter("maf_harness")
+    _duration = meter.create_histogram(
+        "maf_harness.operation.duration", unit="ms",
+        description="Duration of harness operations (wake, run, sandbox, session log).",
+    )
+    _tokens = meter.create_histogram(
+        "maf_harness.run.tokens", unit="{token}",
+        description="Tokens used per agent run.",
+    )
+
+
+def disable_telemetry() -> None:
+    global _tracer, _duration, _tokens
+    _tracer = _duration = _tokens = None
+
+
+# ── Subprocess Propagation ──────────────────────────────────────────────────────
+
+def subprocess_env(base: dict[str, str] | None = None) -> dict[str, str] | None:
+    """
+    Environment for a sandbox subprocess carrying the current trace context.
+
+    While telemetry is off `base` is returned unchanged (None: the child simply
+    inherits the parent's environment) so the disabled path does no work.
+    """
+    if _tracer is None:
+        return base
+    from opentelemetry.propagate import inject
+
+    carrier: dict[str, str] = {}
+    inject(carrier)
+    env = dict(os.environ if base is None else base)
+    for key, value in carrier.items():
+        env[key.upper()] = value            # traceparent → TRACEPARENT
+    return env
+
+
+def context_from_env(environ: dict[str, str] | None = None) -> Any:
+    """OTel Context extracted from TRACEPARENT / TRACESTATE, for use in a child process."""
+    from opentelemetry.propagate import extract
+
+    environ = os.environ if environ is None else environ
+    carrier = {k.lower(): v for k, v in environ.items() if k in ("TRACEPARENT", "TRACESTATE")}
+    return extract(carrier)
@@ -4,18 +4,20 @@ maf_harness.orchestration.multi_agent
 Implements Anthropic's "many brains, many hands" pattern.
 
   - Specialist agents: ResearchAgent, CodeAgent, SummariseAgent
+  - Specialists of one session share a SandboxLease: one sandbox across their
+    tool calls instead of provision → execute → reclaim per call
   - OrchestratorAgent delegates tasks to specialists and aggregates results
   - Graph-based routing via AF WorkflowBuilder
-  - run_many_brains(): N stateless Foundry harnesses run in parallel
+  - run_many_brains(): N stateless Foundry harnesses, at most max_in_flight at once
 
 All LLM calls use FoundryChatClient — zero OpenAI dependency.
 """
 
 from __future__ import annotations
 
-import asyncio
 import warnings
-from typing import Annotated
+from dataclasses import dataclass
+from typing import Annotated, AsyncIterator
 
 from pydantic import Field
 
@@ -27,7 +29,10 @@ from agent_framework import (
 )
 from agent_framework.foundry import FoundryChatClient
 
-from maf_harness.harness.harness import make_foundry_client
+from maf_harness.harness.clients import get_foundry_client
+from maf_harness.middleware.middleware import Metrics
+from maf_harness.orchestration.scheduler import BrainScheduler
+from maf_harness.sandbox.lease import SandboxLease
 from maf_harness.sandbox.sandbox import SandboxManager, SandboxResources
 from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
 
@@ -35,7 +40,9 @@ from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
 # ── Shared Client Factory ───────────────────────────────────────────────────
 
 def _client() -> FoundryChatClient:
-    return make_foundry_client()
+    # Shared per (endpoint, model, credential kind) — one connection pool and one
+    # token cache for every specialist agent and brain in the process.
+    return get_foundry_client()
 
 
 def _agent(name: str, instructions: str, tools: list | None = None) -> Agent:
@@ -51,17 +58,34 @@ def _agent(name: str, instructions: str, tools: list | None = None) -> Agent:
 
 # ── Specialist Agents ──────────────────────────────────────────────────────
 
-def make_research_agent(sandbox_mgr: SandboxManager) -> Agent:
+SPECIALIST_TOOLS = ["web_search", "run_python"]
+
+
+def make_specialist_lease(
+    sandbox_mgr:      SandboxManager,
+    session_id:       str               = "",
+    session_log:      SessionLog | None = None,
+    idle_timeout_sec: float             = 300.0,
+) -> SandboxLease:
+    """One sandbox lease for every specialist of a session (see sandbox/lease.py)."""
+    return SandboxLease(
+        sandbox_mgr,
+        SandboxResources(allowed_tools=list(SPECIALIST_TOOLS)),
+        session_id=session_id,
+        session_log=session_log,
+        idle_timeout_sec=idle_timeout_sec,
+    )
+
+
+def make_research_agent(sandbox_mgr: SandboxManager, lease: SandboxLease | None = None) -> Agent:
     """Research brain — uses only web_search sandbox tool."""
+    lease = lease or make_specialist_lease(sandbox_mgr)
 
     async def web_search(
         query: Annotated[str, Field(description="Search query")],
     ) -> str:
         """Search the web for information."""
-        sid = await sandbox_mgr.provision(SandboxResources(allowed_tools=["web_search"]))
-        result = await sandbox_mgr.execute(sid, "web_search", query)
-        sandbox_mgr.reclaim(sid)
-        return result
+        return await lease.execute("web_search", query)
 
     return _agent(
         name="ResearchAgent",
@@ -74,17 +98,15 @@ def make_research_agent(sandbox_mgr: SandboxManager) -> Agent:
     )
 
 
-def make_code_agent(sandbox_mgr: SandboxManager) -> Agent:
+def make_code_agent(sandbox_mgr: SandboxManager, lease: SandboxLease | None = None) -> Agent:
     """Code brain — uses only run_python sandbox tool."""
+    lease = lease or make_specialist_lease(sandbox_mgr)
 
     async def run_python(
         code: Annotated[str, Field(description="Python code to execute")],
     ) -> str:
-        """Execute Python code and return output."""
-        sid = await sandbox_mgr.provision(SandboxResources(allowed_tools=["run_python"]))
-        result = await sandbox_mgr.execute(sid, "run_python", code)
-        sandbox_mgr.reclaim(sid)
-        return result
+        """Execute Python code and return output. Files written persist for the session."""
+        return await lease.execute("run_python", code)
 
     return _agent(
         name="CodeAgent",
@@ -159,16 +181,20 @@ def build_multi_agent_workflow(
     sandbox_mgr: SandboxManager,
 ):
     """
-    Build AF workflow graph:
+    Build AF workflow graph; returns (workflow, lease):
 
         [classify] → research   ─┐
                    → code        ├→ summarise → END
                    → orchestrate ─┘
 
     InMemoryCheckpointStorage preserves workflow state across harness restarts.
+    The research and code specialists share one session-affine sandbox lease;
+    the caller owns it and should `await lease.release()` once the workflow is
+    done (as AgentHarness.shutdown does) rather than wait for its idle timer.
     """
-    research_agent  = make_research_agent(sandbox_mgr)
-    code_agent      = make_code_agent(sandbox_mgr)
+    lease           = make_specialist_lease(sandbox_mgr, session_id, session_log)
+    research_agent  = make_research_agent(sandbox_mgr, lease)
+    code_agent      = make_code_agent(sandbox_mgr, lease)
     summarise_agent = make_summarise_agent()
     orchestrator    = make_orchestrator_agent(research_agent, code_agent, summarise_agent)
 
@@ -215,25 +241,39 @@ def build_multi_agent_workflow(
     builder.add_edge("code",        "summarise")
     builder.add_edge("orchestrate", "summarise")
 
-    return builder.build()
+    return builder.build(), lease
 
 
 # ── Many Brains Parallel Launcher ─────────────────────────────────────────
 
-async def run_many_brains(
-    tasks:       list[str],
-    session_log: SessionLog,
-    sandbox_mgr: SandboxManager,
-) -> list[dict]:
+@dataclass
+class BrainTask:
+    """A task for run_many_brains with its scheduling attributes."""
+    task:         str
+    priority:     int          = 0             # lower runs first
+    tenant:       str          = "default"     # round-robin fair share between tenants
+    deadline_sec: float | None = None          # queue wait + run budget
+
+
+async def iter_many_brains(
+    tasks:         list[str | BrainTask],
+    session_log:   SessionLog,
+    sandbox_mgr:   SandboxManager,
+    max_in_flight: int            = 8,
+    metrics:       Metrics | None = None,
+) -> AsyncIterator[dict]:
     """
-    Spawn a stateless Foundry harness for each task and run them concurrently.
+    Run a stateless Foundry harness per task through a BrainScheduler and yield
+    each result as soon as it completes.
 
     Each harness:
-      - Has its own session_id and event log entries
+      - Has its own session_id and event log entries (created when it starts, not
+        when it is queued)
       - Creates sandbox only when actually executing tools
       - Is discarded after task completion (stateless / cattle)
 
-    This reproduces Anthropic's p50 TTFT improvement on parallel workloads.
+    At most `max_in_flight` harnesses run at once; the rest queue by priority with
+    per-tenant fair share. Closing the iterator early (aclose()) cancels what is left.
     """
     from maf_harness.harness.harness import AgentHarness, HarnessConfig
 
@@ -243,6 +283,7 @@ async def run_many_brains(
             session_log=session_log,
             sandbox_mgr=sandbox_mgr,
             config=HarnessConfig(agent_name=f"Brain-{sid[:6]}"),
+            client=_client(),
         )
         await harness.start(sid)
         try:
@@ -253,4 +294,42 @@ async def run_many_brains(
         finally:
             await harness.shutdown()
 
-    return list(await asyncio.gather(*[run_one(t) for t in tasks]))
+    scheduler = BrainScheduler(max_in_flight=max_in_flight, metrics=metrics)
+    for t in tasks:
+        bt = t if isinstance(t, BrainTask) else BrainTask(task=t)
+        await scheduler.submit(
+            lambda task=bt.task: run_one(task),
+            name=bt.task,
+            tenant=bt.tenant,
+            priority=bt.priority,
+            deadline_sec=bt.deadline_sec,
+        )
+
+    try:
+        async for result in scheduler.results():
+            if result.ok:
+                yield result.value
+            else:
+                # Never started, timed out or cancelled by the scheduler.
+                yield {"session_id": "", "task": result.name, "error": result.error, "ok": False}
+    finally:
+        await scheduler.aclose()
+
+
+async def run_many_brains(
+    tasks:         list[str | BrainTask],
+    session_log:   SessionLog,
+    sandbox_mgr:   SandboxManager,
+    max_in_flight: int = 8,
+) -> list[dict]:
+    """
+    Spawn a stateless Foundry harness for each task, at most `max_in_flight` at a
+    time, and return the results in completion order.
+
+    This reproduces Anthropic's p50 TTFT improvement on parallel workloads without
+    stampeding the model endpoint. Use iter_many_brains() to consume results as
+    they arrive.
+    """
+    return [
+        r async for r in iter_many_brains(tasks, session_log, sandbox_mgr, max_in_flight)
+    ]
@@ -0,0 +1,251 @@
+"""
+maf_harness.orchestration.scheduler
+====================================
+Bounded-concurrency scheduler for many brains.
+
+An unbounded asyncio.gather over N tasks starts N harnesses, N sessions and N
+model calls at once — provider rate limits trip immediately and memory grows with
+N. BrainScheduler admits at most `max_in_flight` jobs; the rest wait in a queue:
+
+  - Priority   : lower `priority` runs first (0 before 1).
+  - Fair share : within a priority level, tenants are served round-robin, so one
+                 tenant submitting 500 jobs cannot starve another submitting 5.
+  - Backpressure: with `max_queued` set, submit() waits for room in the queue.
+  - Deadlines  : `deadline_sec` bounds queue wait + run time; jobs that expire in
+                 the queue are never started.
+  - Cancel     : cancel(job_id) drops a queued job or cancels a running one.
+
+Results stream back in completion order:
+
+    sched = BrainScheduler(max_in_flight=8)
+    for t in tasks:
+        await sched.submit(lambda t=t: run(t), tenant=t.owner, priority=t.priority)
+    async for result in sched.results():
+        ...
+
+Queue depth and queue-wait time are recorded into Metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from maf_harness.middleware.middleware import GLOBAL_METRICS, Metrics
+
+
+@dataclass
+class JobResult:
+    """Outcome of one scheduled job."""
+    job_id:   int
+    name:     str
+    tenant:   str
+    priority: int
+    ok:       bool
+    value:    Any        = None
+    error:    str | None = None
+    wait_ms:  float      = 0.0
+    run_ms:   float      = 0.0
+
+
+@dataclass
+class _Job:
+    job_id:      int
+    fn:          Callable[[], Awaitable[Any]]
+    name:        str
+    tenant:      str
+    priority:    int
+    deadline:    float | None                      # absolute, time.monotonic()
+    queued_at:   float = field(default_factory=time.monotonic)
+    task:        asyncio.Task | None = None
+
+
+class BrainScheduler:
+    """Priority + per-tenant round-robin queue in front of a concurrency limit."""
+
+    def __init__(
+        self,
+        max_in_flight: int            = 8,
+        max_queued:    int | None     = None,
+        metrics:       Metrics | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.max_in_flight = max_in_flight
+        self.max_queued    = max_queued
+        self.metrics       = metrics or GLOBAL_METRICS
+        # priority → tenant → FIFO of jobs; tenant order is the round-robin order
+        self._levels: dict[int, OrderedDict[str, deque[_Job]]] = {}
+        self._queued   = 0
+        self._running: dict[int, _Job] = {}
+        self._done:    asyncio.Queue[JobResult] = asyncio.Queue()
+        self._outstanding = 0                              # submitted, result not yet consumed
+        self._ids      = itertools.count(1)
+        self._room     = asyncio.Condition()
+
+    # ── Submission ──────────────────────────────────────────────────────────────
+
+    async def submit(
+        self,
+        fn:           Callable[[], Awaitable[Any]],
+        *,
+        name:         str          = "",
+        tenant:       str          = "default",
+        priority:     int          = 0,
+        deadline_sec: float | None = None,
+    ) -> int:
+        """Queue a job; waits while the queue is full. Returns the job id."""
+        if self.max_queued is not None:
+            async with self._room:
+                await self._room.wait_for(lambda: self._queued < self.max_queued)
+
+        job = _Job(
+            job_id=next(self._ids),
+            fn=fn,
+            name=name,
+            tenant=tenant,
+            priority=priority,
+            deadline=time.monotonic() + deadline_sec if deadline_sec is not None else None,
+        )
+        self._levels.setdefault(priority, OrderedDict()).setdefault(tenant, deque()).append(job)
+        self._queued      += 1
+        self._outstanding += 1
+        self.metrics.set_queue_depth(self._queued)
+        self._dispatch()
+        return job.job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job. Returns False if it is unknown or finished."""
+        running = self._running.get(job_id)
+        if running is not None and running.task is not None:
+            running.task.cancel()
+            return True
+        for tenants in self._levels.values():
+            for queue in tenants.values():
+                for job in queue:
+                    if job.job_id == job_id:
+                        queue.remove(job)
+                        self._dequeued()
+                        self._finish(job, ok=False, error="cancelled")
+                        return True
+        return False
+
+    # ── Results ─────────────────────────────────────────────────────────────────
+
+    async def results(self) -> AsyncIterator[JobResult]:
+        """Yield results in completion order until every submitted job has reported."""
+        try:
+            while self._outstanding:
+                result = await self._done.get()
+                self._outstanding -= 1
+                yield result
+        finally:
+            if self._outstanding:
+                await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cancel everything still queued or running."""
+        for tenants in self._levels.values():
+            for queue in tenants.values():
+                while queue:
+                    job = queue.popleft()
+                    self._dequeued()
+                    self._finish(job, ok=False, error="cancelled")
+        running = [j.task for j in self._running.values() if j.task is not None]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    # ── Internals ───────────────────────────────────────────────────────────────
+
+    def _next_job(self) -> _Job | None:
+        for priority in sorted(self._levels):
+            tenants = self._levels[priority]
+            while tenants:
+                tenant, queue = tenants.popitem(last=False)
+                if not queue:                            # emptied by cancel()/aclose()
+                    continue
+                job = queue.popleft()
+                if queue:
+                    tenants[tenant] = queue              # back of the round-robin
+                if not tenants:
+                    del self._levels[priority]
+                return job
+            del self._levels[priority]
+        return None
+
+    def _dequeued(self) -> None:
+        self._queued -= 1
+        self.metrics.set_queue_depth(self._queued)
+        if self.max_queued is not None:
+            asyncio.get_running_loop().create_task(self._notify_room())
+
+    async def _notify_room(self) -> None:
+        async with self._room:
+            self._room.notify_all()
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self.max_in_flight:
+            job = self._next_job()
+            if job is None:
+                return
+            self._dequeued()
+            now  = time.monotonic()
+            wait = (now - job.queued_at) * 1000
+            self.metrics.record_queue_wait(wait)
+            if job.deadline is not None and now >= job.deadline:
+                self._finish(job, ok=False, error="deadline exceeded in queue", wait_ms=wait)
+                continue
+            self._running[job.job_id] = job
+            job.task = asyncio.get_running_loop().create_task(self._run(job, wait))
+
+    async def _run(self, job: _Job, wait_ms: float) -> None:
+        start = time.perf_counter()
+        try:
+            if job.deadline is not None:
+                value = await asyncio.wait_for(job.fn(), job.deadline - time.monotonic())
+            else:
+                value = await job.fn()
+            self._finish(job, ok=True, value=value, wait_ms=wait_ms, start=start)
+        except asyncio.TimeoutError:
+            self._finish(job, ok=False, error="deadline exceeded", wait_ms=wait_ms, start=start)
+        except asyncio.CancelledError:
+            self._finish(job, ok=False, error="cancelled", wait_ms=wait_ms, start=start)
+        except Exception as exc:
+            self._finish(job, ok=False, error=str(exc), wait_ms=wait_ms, start=start)
+        finally:
+            self._running.pop(job.job_id, None)
+            self._dispatch()
+
+    def _finish(
+        self,
+        job:     _Job,
+        ok:      bool,
+        value:   Any          = None,
+        error:   str | None   = None,
+        wait_ms: float        = 0.0,
+        start:   float | None = None,
+    ) -> None:
+        self._done.put_nowait(JobResult(
+            job_id=job.job_id,
+            name=job.name,
+            tenant=job.tenant,
+            priority=job.priority,
+            ok=ok,
+            value=value,
+            error=error,
+            wait_ms=wait_ms,
+            run_ms=(time.perf_counter() - start) * 1000 if start is not None else 0.0,
+        ))
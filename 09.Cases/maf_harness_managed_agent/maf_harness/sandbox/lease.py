@@ -0,0 +1,167 @@
+"""
+maf_harness.sandbox.lease
+==========================
+Session-affine sandbox lease: one sandbox shared by every tool call of a session.
+
+Provisioning per tool call (provision → execute → reclaim) throws away whatever
+the previous call left behind — installed packages, written files — and pays
+provisioning again each time. A SandboxLease keeps the session's sandbox across
+calls instead:
+
+  - Lazy: nothing is provisioned until the first tool call (reasoning-only
+    sessions stay free), then every later call reuses the same sandbox.
+  - Renewal: each call pushes the idle deadline out again; a sandbox that died
+    or timed out is reclaimed and replaced transparently, and the call retried once.
+  - Idle timeout: a sandbox unused for `idle_timeout_sec` is reclaimed in the
+    background; the next call provisions a fresh one.
+  - Shared: several agents of one session (e.g. the research and code
+    specialists) can hold the same lease, as long as its resources allow their tools.
+
+    lease = SandboxLease(sandbox_mgr, SandboxResources(allowed_tools=["run_python"]),
+                         session_id=sid, session_log=log)
+    await lease.execute("run_python", "open('x.txt', 'w').write('hi')")
+    await lease.execute("run_python", "print(open('x.txt').read())")   # same sandbox
+    await lease.release()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from maf_harness.middleware.middleware import GLOBAL_METRICS, Metrics
+from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
+
+if TYPE_CHECKING:
+    from maf_harness.sandbox.sandbox import SandboxManager, SandboxResources
+
+
+class SandboxLease:
+    """Lazily provisioned, auto-renewed sandbox bound to one session."""
+
+    def __init__(
+        self,
+        sandbox_mgr:      SandboxManager,
+        resources:        SandboxResources,
+        session_id:       str               = "",
+        session_log:      SessionLog | None = None,
+        idle_timeout_sec: float             = 300.0,
+        metrics:          Metrics | None    = None,
+    ) -> None:
+        self.sandbox_mgr      = sandbox_mgr
+        self.resources        = resources
+        self.session_id       = session_id
+        self.idle_timeout_sec = idle_timeout_sec
+        self._session_log     = session_log
+        self._metrics         = metrics or GLOBAL_METRICS
+        self._sandbox_id: str | None = None
+        self._lock       = asyncio.Lock()
+        self._in_flight  = 0
+        self._last_used  = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+        self.calls       = 0
+        self.reuses      = 0
+        self.provisions  = 0
+        self.expired     = 0
+        self.failures    = 0
+
+    @property
+    def sandbox_id(self) -> str | None:
+        return self._sandbox_id
+
+    @property
+    def provisions_avoided(self) -> int:
+        """Tool calls served by an existing sandbox instead of a new provision."""
+        return self.reuses
+
+    # ── Execute ─────────────────────────────────────────────────────────────────
+
+    async def execute(self, name: str, input_data: str) -> str:
+        """execute(name, input) → string on the session's sandbox (provisioned on first use)."""
+        self.calls      += 1
+        self._in_flight += 1
+        try:
+            for attempt in range(2):
+                sid = await self._acquire()
+                try:
+                    return await self.sandbox_mgr.execute(sid, name, input_data)
+                except RuntimeError as exc:
+                    # Dead or timed-out sandbox: cattle — drop it, retry on a fresh one.
+                    self.failures += 1
+                    self._drop(sid)
+                    if attempt == 1:
+                        return f"[SANDBOX FAILED after retry] {exc}"
+            return "[SANDBOX FAILED]"
+        finally:
+            self._in_flight -= 1
+            self._renew()
+
+    async def release(self) -> None:
+        """Reclaim the sandbox now (session ended)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._sandbox_id is not None:
+            self._drop(self._sandbox_id)
+
+    def stats(self) -> dict:
+        return {
+            "session_id":         self.session_id,
+            "sandbox_id":         self._sandbox_id,
+            "calls":              self.calls,
+            "provisions":         self.provisions,
+            "provisions_avoided": self.provisions_avoided,
+            "expired":            self.expired,
+            "failures":           self.failures,
+        }
+
+    # ── Internals ───────────────────────────────────────────────────────────────
+
+    async def _acquire(self) -> str:
+        async with self._lock:
+            sandbox = self.sandbox_mgr.get(self._sandbox_id) if self._sandbox_id else None
+            if sandbox is not None and sandbox.alive:
+                self.reuses += 1
+                self._metrics.record_sandbox_reuse()
+                return sandbox.sandbox_id
+            if self._sandbox_id is not None:
+                self._drop(self._sandbox_id)
+            sid = await self.sandbox_mgr.provision(self.resources)
+            self._sandbox_id = sid
+            self.provisions += 1
+            self._metrics.record_sandbox_provision()
+            if self._session_log is not None and self.session_id:
+                await self._session_log.emit_event(
+                    self.session_id,
+                    SessionEvent(
+                        kind=EventKind.SANDBOX_SPAWN,
+                        session_id=self.session_id,
+                        payload={"sandbox_id": sid, "lease_provision": self.provisions},
+                    ),
+                )
+            return sid
+
+    def _drop(self, sandbox_id: str) -> None:
+        self.sandbox_mgr.reclaim(sandbox_id)
+        if self._sandbox_id == sandbox_id:
+            self._sandbox_id = None
+
+    def _renew(self) -> None:
+        self._last_used = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(self.idle_timeout_sec, self._expire)
+
+    def _expire(self) -> None:
+        self._timer = None
+        idle = time.monotonic() - self._last_used
+        if self._in_flight or self._sandbox_id is None:
+            return
+        if idle < self.idle_timeout_sec:                      # renewed meanwhile
+            self._timer = asyncio.get_running_loop().call_later(
+                self.idle_timeout_sec - idle, self._expire,
+            )
+            return
+        self.expired += 1
+        self._drop(self._sandbox_id)
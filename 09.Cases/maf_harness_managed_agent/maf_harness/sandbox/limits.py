@@ -0,0 +1,167 @@
+"""
+maf_harness.sandbox.limits
+===========================
+Per-job resource limits for sandbox subprocesses.
+
+ResourceLimits is what a SandboxResources spec means for one process:
+
+    limit        rlimit (always, Linux/macOS)        cgroup v2 (when delegated)
+    ───────────  ──────────────────────────────────  ──────────────────────────
+    cpu          RLIMIT_CPU  timeout × cores + 1 s   cpu.max   cores × period
+    memory       RLIMIT_AS   memory_mb + preloads    memory.max (+ swap.max 0)
+    open_files   RLIMIT_NOFILE                       —
+    processes    RLIMIT_NPROC (only without pids)    pids.max  (exact, per job)
+    timeout      wall clock, enforced by the parent  —
+
+rlimits are applied by the worker itself, after its preloads and before the
+job's code runs (see python_pool.py). RLIMIT_AS is set to what the worker has
+already mapped plus memory_mb, so preloaded libraries (numpy's BLAS reserves a
+lot of address space) do not eat the job's budget. RLIMIT_AS is skipped when a
+job cgroup enforces memory exactly.
+
+`processes` is meant for pids.max. RLIMIT_NPROC counts every task (thread) of
+the user, not of the job, so a fixed value would fail a job as soon as the
+service user runs that many threads elsewhere. It is applied only when no job
+cgroup has the pids controller, and then set to the tasks the user already runs
+(counted from /proc once, when the warm worker starts) plus `processes`; where
+/proc is unavailable it is not set at all. Either way it is coarse: the user's other
+processes share the headroom, and root ignores it.
+
+cgroup v2 is used when SANDBOX_CGROUP_ROOT names a delegated cgroup directory
+this process may write (e.g. a systemd `Delegate=yes` slice). Each job gets its
+own child group, so `memory.max` counts the job's RSS rather than its address
+space, and an OOM kill is reported as a memory limit instead of a bare SIGKILL.
+
+Which limit stopped a job is reported as `limit`: one of LIMIT_KINDS.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Iterable
+
+LIMIT_KINDS = ("timeout", "cpu", "memory", "open_files", "processes")
+
+
+@dataclass
+class ResourceLimits:
+    timeout_sec: float      = 10.0
+    cpu_cores:   float      = 1.0
+    memory_mb:   int | None = None
+    open_files:  int | None = None
+    processes:   int | None = None
+
+    @property
+    def cpu_sec(self) -> int:
+        """CPU-time budget: the wall timeout at `cpu_cores`, plus a second of slack."""
+        return math.ceil(self.timeout_sec * self.cpu_cores) + 1
+
+    def to_job(self, cgroup_controllers: Iterable[str] = ()) -> dict:
+        """
+        rlimits for the worker, minus those a job cgroup already enforces exactly.
+
+        `processes` is passed as a per-job allowance; the worker adds the user's
+        current task count before setting RLIMIT_NPROC.
+        """
+        exact = set(cgroup_controllers)
+        return {
+            "cpu_sec":    self.cpu_sec,
+            "memory_mb":  None if "memory" in exact else self.memory_mb,
+            "open_files": self.open_files,
+            "processes":  None if "pids" in exact else self.processes,
+        }
+
+    def describe(self, kind: str) -> dict:
+        """The configured value behind a limit kind, for over-limit reports."""
+        return {
+            "timeout":    {"timeout_sec": self.timeout_sec},
+            "cpu":        {"cpu_sec": self.cpu_sec, "cpu_cores": self.cpu_cores},
+            "memory":     {"memory_mb": self.memory_mb},
+            "open_files": {"open_files": self.open_files},
+            "processes":  {"processes": self.processes},
+        }.get(kind, {})
+
+
+class CgroupV2:
+    """
+    Per-job child cgroups under a delegated cgroup v2 directory.
+
+    attach() creates `<root>/job-<pid>`, writes the limits and moves the worker
+    into it before the job is sent; release() reports whether the kernel
+    OOM-killed it and removes the group.
+    """
+
+    PERIOD_US = 100_000
+
+    def __init__(self, root: str) -> None:
+        self.root        = root
+        self.controllers = self._enable_controllers()
+
+    @classmethod
+    def from_path(cls, root: str | None) -> CgroupV2 | None:
+        """A CgroupV2 for `root`, or None when it is unset or not a usable v2 group."""
+        if not root or not os.path.isfile(os.path.join(root, "cgroup.procs")):
+            return None
+        cgroup = cls(root)
+        return cgroup if cgroup.controllers else None
+
+    def _enable_controllers(self) -> set[str]:
+        path = os.path.join(self.root, "cgroup.subtree_control")
+        try:
+            with open(os.path.join(self.root, "cgroup.controllers")) as f:
+                available = set(f.read().split()) & {"cpu", "memory", "pids"}
+            for name in available:
+                try:
+                    with open(path, "w") as f:
+                        f.write(f"+{name}")
+                except OSError:
+                    pass
+            with open(path) as f:
+                return set(f.read().split()) & available
+        except OSError:
+            return set()
+
+    def attach(self, pid: int, limits: ResourceLimits) -> str | None:
+        """Move `pid` into a fresh limited group. Returns its path, or None on failure."""
+        path = os.path.join(self.root, f"job-{pid}")
+        settings: dict[str, str] = {}
+        if "memory" in self.controllers and limits.memory_mb:
+            settings["memory.max"]      = str(limits.memory_mb * 1024 * 1024)
+            settings["memory.swap.max"] = "0"
+        if "cpu" in self.controllers and limits.cpu_cores:
+            settings["cpu.max"] = f"{max(1_000, int(limits.cpu_cores * self.PERIOD_US))} {self.PERIOD_US}"
+        if "pids" in self.controllers and limits.processes:
+            settings["pids.max"] = str(limits.processes)
+        try:
+            os.mkdir(path)
+            for name, value in settings.items():
+                try:
+                    with open(os.path.join(path, name), "w") as f:
+                        f.write(value)
+                except FileNotFoundError:
+                    pass                                  # e.g. no swap accounting
+            with open(os.path.join(path, "cgroup.procs"), "w") as f:
+                f.write(str(pid))
+            return path
+        except OSError:
+            self.release(path)
+            return None
+
+    def release(self, path: str) -> bool:
+        """Remove the job group. Returns True if the kernel OOM-killed inside it."""
+        oom = False
+        try:
+            with open(os.path.join(path, "memory.events")) as f:
+                for line in f:
+                    key, _, value = line.partition(" ")
+                    if key == "oom_kill" and int(value) > 0:
+                        oom = True
+        except (OSError, ValueError):
+            pass
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+        return oom
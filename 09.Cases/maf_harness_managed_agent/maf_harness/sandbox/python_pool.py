@@ -0,0 +1,357 @@
+"""
+maf_harness.sandbox.python_pool
+================================
+Warm interpreter pool for the run_python tool.
+
+`python3 -c code` per call pays interpreter startup plus every heavy import
+(numpy, pandas, …) on the critical path of the turn. WarmPythonPool keeps `size`
+interpreters already started, with the `preload` modules imported, blocked on
+their stdin waiting for a job:
+
+    job    parent → worker   one JSON line on stdin, then stdin is closed:
+                             {"code": ..., "limits": {...}, "env": {...}, "cwd": ...}
+    result worker → parent   the job's own stdout / stderr, and its exit code
+
+Isolation is unchanged: every worker runs exactly one job and exits, so no
+state leaks from one snippet to the next. Each finished job triggers a
+background refill, so the next job again finds a warm worker. The job's
+ResourceLimits (limits.py) are applied in the worker after the preloads and
+before the user's code runs, plus a per-job cgroup when one is configured; a job
+stopped by a limit comes back with `PythonResult.limit` set.
+
+When the pool is empty (burst larger than `size`) the job runs on a cold worker
+started on demand — the same process, just without the head start.
+
+    pool = WarmPythonPool(size=4, preload=("json", "numpy"))
+    result = await pool.run("import numpy; print(numpy.arange(3))",
+                            limits=ResourceLimits(timeout_sec=10, memory_mb=512))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable
+
+from maf_harness.sandbox.limits import CgroupV2, ResourceLimits
+
+# Runs as `python -c _WORKER <preload...>`. Kept free of user-visible globals:
+# the job executes in a fresh namespace with sys.argv reset as for `python -c`.
+# An uncaught error caused by a limit is reported as a last stderr line
+# `_LIMIT_TAG<kind>`, which the parent strips.
+_LIMIT_TAG = "\x00sandbox-limit:"
+_WORKER = r"""
+import sys
+for _name in sys.argv[1:]:
+    try:
+        __import__(_name)
+    except Exception:
+        pass
+import json, os
+_LIMIT_TAG = "\x00sandbox-limit:"
+# RLIMIT_NPROC counts every task of the user, so a job may start `processes` on
+# top of the tasks the user runs now. Counted while the worker is still idle,
+# off the job's path; None (no /proc) skips the limit.
+_tasks = None
+try:
+    _uid, _count = os.getuid(), 0
+    for _pid in os.listdir("/proc"):
+        if not _pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{_pid}/status") as _f:
+                _status = dict(_l.split(":", 1) for _l in _f if ":" in _l)
+            if int(_status["Uid"].split()[0]) == _uid:
+                _count += int(_status["Threads"])
+        except (OSError, KeyError, ValueError):
+            pass
+    _tasks = _count
+except OSError:
+    pass
+_line = sys.stdin.readline()
+if not _line:
+    os._exit(0)
+_job = json.loads(_line)
+_limits = _job.get("limits") or {}
+_mapped = 0
+try:
+    with open("/proc/self/status") as _f:
+        for _l in _f:
+            if _l.startswith("VmSize:"):
+                _mapped = int(_l.split()[1]) * 1024
+except (OSError, ValueError, IndexError):
+    pass
+_nproc = _limits.get("processes")
+_nproc = _nproc and _tasks is not None and _tasks + _nproc
+try:
+    import resource
+    for _name, _key, _value in (
+        ("RLIMIT_CPU", "cpu_sec", _limits.get("cpu_sec")),
+        ("RLIMIT_AS", "memory_mb", _limits.get("memory_mb") and _mapped + _limits["memory_mb"] * 1024 * 1024),
+        ("RLIMIT_NOFILE", "open_files", _limits.get("open_files")),
+        ("RLIMIT_NPROC", "processes", _nproc),
+    ):
+        if _value:
+            try:
+                resource.setrlimit(getattr(resource, _name), (_value, _value + (_key == "cpu_sec")))
+            except (AttributeError, ValueError, OSError):
+                pass
+except ImportError:
+    pass
+os.environ.update(_job.get("env") or {})
+if _job.get("cwd"):
+    os.chdir(_job["cwd"])
+sys.argv = ["-c"]
+_code, _limit = 0, None
+try:
+    exec(compile(_job["code"], "<string>", "exec"), {"__name__": "__main__"})
+except SystemExit as _exc:
+    if _exc.code is None or isinstance(_exc.code, int):
+        _code = _exc.code or 0
+    else:
+        print(_exc.code, file=sys.stderr)
+        _code = 1
+except BaseException as _exc:
+    import errno, traceback
+    traceback.print_exception(type(_exc), _exc, _exc.__traceback__.tb_next)
+    _code = 1
+    if isinstance(_exc, MemoryError):
+        _limit = "memory"
+    elif isinstance(_exc, OSError) and _exc.errno in (errno.EMFILE, errno.ENFILE):
+        _limit = "open_files"
+    elif isinstance(_exc, OSError) and _exc.errno == errno.EAGAIN:
+        _limit = "processes"
+# What interpreter shutdown would do that the job can observe — join threads, run
+# atexit, flush — without tearing down every preloaded module (~10 ms with numpy).
+import atexit, threading
+for _t in threading.enumerate():
+    if _t is not threading.main_thread() and not _t.daemon:
+        _t.join()
+atexit._run_exitfuncs()
+sys.stdout.flush()
+if _limit:
+    sys.stderr.write(_LIMIT_TAG + _limit + "\n")
+sys.stderr.flush()
+os._exit(_code)
+"""
+
+
+@dataclass
+class PythonResult:
+    stdout:     str
+    stderr:     str
+    returncode: int | None
+    limit:      str | None            = None     # LIMIT_KINDS entry that stopped the job
+    limits:     ResourceLimits | None = None
+    warm:       bool                  = True
+    wait_ms:    float                 = 0.0      # time to obtain a worker
+
+    @property
+    def timed_out(self) -> bool:
+        return self.limit == "timeout"
+
+    def limit_report(self, tail: int = 2_000) -> dict:
+        """Structured over-limit result: which limit, its configured value, output tails."""
+        return {
+            "limit":     self.limit,
+            **(self.limits.describe(self.limit) if self.limits and self.limit else {}),
+            "exit_code": self.returncode,
+            "stdout":    self.stdout[-tail:],
+            "stderr":    self.stderr[-tail:],
+        }
+
+
+class WarmPythonPool:
+    """
+    Pool of pre-started single-use Python workers.
+
+    size       warm workers kept ready (0 = every job starts a cold worker)
+    preload    modules imported by each worker before it is marked ready
+    python     interpreter to run (default: this one)
+    limits     default ResourceLimits per job
+    env        environment for the workers (None = inherit); per-job `env` is added on top
+    cgroups    CgroupV2 root for exact per-job memory / cpu / pids limits (see limits.py)
+    """
+
+    def __init__(
+        self,
+        size:    int                   = 2,
+        preload: Iterable[str]         = (),
+        python:  str                   = sys.executable,
+        limits:  ResourceLimits | None = None,
+        env:     dict[str, str] | None = None,
+        cgroups: CgroupV2 | None       = None,
+    ) -> None:
+        self.size      = size
+        self.preload   = tuple(preload)
+        self.python    = python
+        self.limits    = limits or ResourceLimits()
+        self.cgroups   = cgroups
+        self._env      = env                               # None = inherit
+        self._idle: deque[asyncio.subprocess.Process] = deque()
+        self._spawning = 0
+        self._refill: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.warm_hits   = 0
+        self.cold_starts = 0
+        self.spawned     = 0
+        self.limit_kills: dict[str, int] = {}
+
+    # ── Jobs ────────────────────────────────────────────────────────────────────
+
+    async def run(
+        self,
+        code:   str,
+        limits: ResourceLimits | None = None,
+        env:    dict[str, str] | None = None,
+        cwd:    str | None            = None,
+    ) -> PythonResult:
+        """Run `code` on a warm worker (cold if none is ready) in `cwd` and return its output."""
+        self._bind_loop()
+        limits = limits or self.limits
+        start  = time.perf_counter()
+        proc   = self._take_idle()
+        warm   = proc is not None
+        if proc is None:
+            self.cold_starts += 1
+            proc = await self._spawn()
+        else:
+            self.warm_hits += 1
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        group = self.cgroups.attach(proc.pid, limits) if self.cgroups is not None else None
+        job = json.dumps({
+            "code":   code,
+            "limits": limits.to_job(self.cgroups.controllers if group is not None else ()),
+            "env":    env or {},
+            "cwd":    cwd,
+        }) + "\n"
+        limit = None
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(job.encode()), timeout=limits.timeout_sec)
+        except asyncio.TimeoutError:
+            self._kill(proc)
+            await proc.wait()
+            out, err, limit = b"", f"Timed out after {limits.timeout_sec:g}s".encode(), "timeout"
+        except BaseException:
+            self._kill(proc)
+            raise
+        finally:
+            oom = self.cgroups.release(group) if group is not None else False
+            # Refill after the job, not alongside it: a spawn competing with the job
+            # for CPU would eat most of the warm start's head start.
+            self._schedule_refill()
+
+        stderr = err.decode(errors="replace")
+        tag    = stderr.rfind(_LIMIT_TAG)
+        if tag != -1:
+            limit  = limit or stderr[tag + len(_LIMIT_TAG):].strip()
+            stderr = stderr[:tag]
+        if limit is None:
+            if oom:
+                limit = "memory"
+            elif proc.returncode == -signal.SIGXCPU:
+                limit = "cpu"                         # RLIMIT_CPU soft limit
+        if limit is not None:
+            self.limit_kills[limit] = self.limit_kills.get(limit, 0) + 1
+        return PythonResult(
+            stdout=out.decode(errors="replace"),
+            stderr=stderr,
+            returncode=proc.returncode,
+            limit=limit,
+            limits=limits,
+            warm=warm,
+            wait_ms=wait_ms,
+        )
+
+    # ── Lifecycle ───────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Fill the pool now instead of on first use."""
+        self._bind_loop()
+        self._schedule_refill()
+        if self._refill is not None:
+            await asyncio.shield(self._refill)
+
+    async def aclose(self) -> None:
+        if self._refill is not None:
+            self._refill.cancel()
+            await asyncio.gather(self._refill, return_exceptions=True)
+            self._refill = None
+        while self._idle:
+            proc = self._idle.popleft()
+            self._kill(proc)
+            await proc.wait()
+
+    def stats(self) -> dict:
+        jobs = self.warm_hits + self.cold_starts
+        return {
+            "size":        self.size,
+            "idle":        len(self._idle),
+            "preload":     list(self.preload),
+            "warm_hits":   self.warm_hits,
+            "cold_starts": self.cold_starts,
+            "hit_rate":    round(self.warm_hits / jobs, 3) if jobs else 0.0,
+            "spawned":     self.spawned,
+            "limit_kills": dict(self.limit_kills),
+            "cgroups":     self.cgroups.root if self.cgroups is not None else None,
+        }
+
+    # ── Internals ───────────────────────────────────────────────────────────────
+
+    def _bind_loop(self) -> None:
+        # Subprocess transports belong to one event loop; a pool reused under a new
+        # loop (e.g. a second asyncio.run) drops the workers started on the old one.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            for proc in self._idle:
+                self._kill(proc)
+            self._idle.clear()
+            self._spawning = 0
+            self._refill   = None
+            self._loop     = loop
+
+    def _take_idle(self) -> asyncio.subprocess.Process | None:
+        while self._idle:
+            proc = self._idle.popleft()
+            if proc.returncode is None:
+                return proc
+        return None
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        self.spawned += 1
+        return await asyncio.create_subprocess_exec(
+            self.python, "-c", _WORKER, *self.preload,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._env,
+        )
+
+    def _schedule_refill(self) -> None:
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.get_running_loop().create_task(self._fill())
+
+    async def _fill(self) -> None:
+        while len(self._idle) + self._spawning < self.size:
+            self._spawning += 1
+            try:
+                proc = await self._spawn()
+            except OSError:
+                return                                # keep serving cold; retry on next use
+            finally:
+                self._spawning -= 1
+            self._idle.append(proc)
+
+    @staticmethod
+    def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except (ProcessLookupError, RuntimeError):       # already gone / loop closed
+                pass
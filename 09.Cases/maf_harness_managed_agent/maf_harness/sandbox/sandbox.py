@@ -10,17 +10,43 @@ Key design decisions from the Anthropic article:
   - Sandboxes are "cattle": if one dies, the harness creates a new one.
   - Credentials never enter the sandbox; they are kept in VaultStore.
   - Sandboxes are created on-demand (not pre-provisioned) — this reduced Anthropic's
-    p50 TTFT by ~60% and p95 by >90%.
+    p50 TTFT by ~60% and p95 by >90%. Once sandboxes are expensive to create, an
+    optional demand-predicted warm pool (warm_pool.py) serves provision() from
+    ready sandboxes and falls back to on-demand creation when it runs dry.
+  - run_python executes on pre-started single-use interpreters (python_pool.py):
+    provisioning stays lazy, only interpreter startup moves off the critical path.
+  - SandboxResources are enforced, not advisory: run_python workers get CPU-time,
+    address-space, open-file and process limits (limits.py), and sync tools run
+    off the event loop under the same wall-clock timeout as async ones.
+  - Blocking work (sync tools, file IO) runs on one bounded thread pool per
+    SandboxManager, so a burst of slow tools queues instead of spawning threads.
 """
 
 from __future__ import annotations
 
 import asyncio
+import inspect
+import json
+import os
+import shutil
+import tempfile
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, Callable
 
+from maf_harness.middleware.redact import Redactor
+from maf_harness.middleware.telemetry import span, subprocess_env
+from maf_harness.sandbox.limits import ResourceLimits
+from maf_harness.sandbox.python_pool import WarmPythonPool
+from maf_harness.sandbox.warm_pool import WarmPoolConfig, WarmSandboxPool
+
+# Extra wall-clock time the sandbox grants a tool over timeout_sec, so a tool
+# that enforces timeout_sec itself (run_python) can still report it as a result.
+TIMEOUT_GRACE_SEC = 2.0
+
 
 # ── Credential Vault ────────────────────────────────────────────────────────
 
@@ -32,26 +58,59 @@ class VaultStore:
 
     def __init__(self) -> None:
         self._vault: dict[str, str] = {}
+        self._redactors: dict[tuple[str, ...], Redactor] = {}
 
     def store(self, key: str, token: str) -> None:
         self._vault[key] = token
+        self._redactors.clear()
 
     def fetch(self, key: str) -> str | None:
         return self._vault.get(key)
 
     def revoke(self, key: str) -> None:
-        self._vault.pop(key, None)
+        if self._vault.pop(key, None) is not None:
+            self._redactors.clear()
+
+    def redactor(self, markers: tuple[str, ...] = ()) -> Redactor:
+        """Compiled matcher for every stored token plus `markers`; rebuilt only after store/revoke."""
+        redactor = self._redactors.get(markers)
+        if redactor is None:
+            redactor = self._redactors[markers] = Redactor(self._vault.values(), markers)
+        return redactor
+
+    def redact(self, text: str) -> str:
+        return self.redactor().redact(text)
 
 
 # ── Sandbox Resource Spec ─────────────────────────────────────────────────────────
 
 @dataclass
 class SandboxResources:
-    cpu_cores:     float      = 1.0
-    memory_mb:     int        = 512
-    timeout_sec:   int        = 30
-    env_vars:      dict[str, str] = field(default_factory=dict)
-    allowed_tools: list[str]  = field(default_factory=list)
+    cpu_cores:      float      = 1.0
+    memory_mb:      int        = 512
+    timeout_sec:    int        = 30
+    max_open_files: int        = 256
+    max_processes:  int        = 64
+    env_vars:       dict[str, str] = field(default_factory=dict)
+    allowed_tools:  list[str]  = field(default_factory=list)
+
+    def profile(self) -> tuple:
+        """Hashable identity of everything a sandbox is built with (the warm-pool key)."""
+        return (
+            self.cpu_cores, self.memory_mb, self.timeout_sec,
+            self.max_open_files, self.max_processes,
+            tuple(sorted(self.env_vars.items())), tuple(self.allowed_tools),
+        )
+
+    def limits(self) -> ResourceLimits:
+        """Per-process limits for subprocesses started on behalf of this sandbox."""
+        return ResourceLimits(
+            timeout_sec=self.timeout_sec,
+            cpu_cores=self.cpu_cores,
+            memory_mb=self.memory_mb,
+            open_files=self.max_open_files,
+            processes=self.max_processes,
+        )
 
 
 # ── Tool Registry ───────────────────────────────────────────────────────────
@@ -59,11 +118,24 @@ class SandboxResources:
 class ToolRegistry:
     """Registry of named callable tools available within the sandbox."""
 
+    # Keyword arguments beyond `vault=` that a tool receives if its signature accepts them.
+    EXTRAS = ("resources", "workdir")
+
     def __init__(self) -> None:
         self._tools: dict[str, Callable] = {}
+        self._extras: dict[str, frozenset[str]] = {}
 
     def register(self, name: str, fn: Callable) -> None:
         self._tools[name] = fn
+        params = inspect.signature(fn).parameters.values()
+        if any(p.kind is p.VAR_KEYWORD for p in params):
+            self._extras[name] = frozenset(self.EXTRAS)
+        else:
+            self._extras[name] = frozenset(p.name for p in params if p.name in self.EXTRAS)
+
+    def extras(self, name: str) -> frozenset[str]:
+        """Which of EXTRAS the tool accepts (older custom tools take only `vault=`)."""
+        return self._extras.get(name, frozenset())
 
     def get(self, name: str) -> Callable | None:
         return self._tools.get(name)
@@ -76,7 +148,10 @@ class ToolRegistry:
 
 class Sandbox:
     """
-    A single sandbox instance. Stateless except for alive flag.
+    A single sandbox instance. Its only state is the alive flag and a private
+    working directory (created on first use, removed by kill()) that run_python
+    runs in and relative file paths resolve against — what a leased sandbox
+    carries from one call to the next.
     Standard interface: await sandbox.execute(name, input) → str
     """
 
@@ -86,18 +161,27 @@ class Sandbox:
         resources:  SandboxResources,
         registry:   ToolRegistry,
         vault:      VaultStore,
+        executor:   ThreadPoolExecutor | None = None,
     ) -> None:
         self.sandbox_id = sandbox_id
         self.resources  = resources
         self.registry   = registry
         self._vault     = vault
+        self._executor  = executor                   # None = the loop's default executor
         self._alive     = True
         self._created   = time.time()
+        self._workdir: str | None = None
 
     @property
     def alive(self) -> bool:
         return self._alive
 
+    @property
+    def workdir(self) -> str:
+        if self._workdir is None:
+            self._workdir = tempfile.mkdtemp(prefix=f"sandbox-{self.sandbox_id[:8]}-")
+        return self._workdir
+
     async def execute(self, name: str, input_data: str) -> str:
         """
         execute(name, input) → string — the sole interface between brain ↔ hands.
@@ -113,15 +197,27 @@ class Sandbox:
         if fn is None:
             return f"[SANDBOX ERROR] Unknown tool: '{name}'"
 
+        kwargs: dict[str, Any] = {"vault": self._vault}
+        extras = self.registry.extras(name)
+        if "resources" in extras:
+            kwargs["resources"] = self.resources
+        if "workdir" in extras:
+            kwargs["workdir"] = self.workdir
+        timeout = self.resources.timeout_sec + TIMEOUT_GRACE_SEC
         try:
             if asyncio.iscoroutinefunction(fn):
+                result = await asyncio.wait_for(fn(input_data, **kwargs), timeout=timeout)
+            else:
+                # Off the event loop: a slow sync tool must not stall every other session.
+                # A call still queued when the wait is cancelled never starts; a running
+                # one cannot be interrupted and holds its worker until it returns.
                 result = await asyncio.wait_for(
-                    fn(input_data, vault=self._vault),
-                    timeout=self.resources.timeout_sec,
+                    asyncio.get_running_loop().run_in_executor(
+                        self._executor, partial(fn, input_data, **kwargs),
+                    ),
+                    timeout=timeout,
                 )
-            else:
-                result = fn(input_data, vault=self._vault)
-            return str(result)
+            return self._vault.redact(str(result))      # tool output never echoes a vault token
         except asyncio.TimeoutError:
             self._alive = False
             raise RuntimeError(
@@ -129,11 +225,14 @@ class Sandbox:
                 "Harness should provision a fresh sandbox."
             )
         except Exception as exc:
-            return f"[TOOL ERROR] {name}: {exc}"
+            return self._vault.redact(f"[TOOL ERROR] {name}: {exc}")
 
     def kill(self) -> None:
         """Mark the sandbox as terminated — the orchestrator will create a replacement."""
         self._alive = False
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
 
 
 # ── Sandbox Manager ───────────────────────────────────────────────────────────────
@@ -147,27 +246,67 @@ class SandboxManager:
     purely inferential sessions never incur creation overhead.
     """
 
-    def __init__(self, vault: VaultStore) -> None:
-        self._vault     = vault
-        self._registry  = ToolRegistry()
+    def __init__(
+        self,
+        vault:        VaultStore,
+        python_pool:  WarmPythonPool | None = None,
+        tool_workers: int                   = 16,
+        warm_pool:    WarmPoolConfig | None = None,
+    ) -> None:
+        self._vault       = vault
+        self._registry    = ToolRegistry()
         self._sandboxes: dict[str, Sandbox] = {}
+        self._python_pool = python_pool or WarmPythonPool()
+        self._executor    = ThreadPoolExecutor(max_workers=tool_workers, thread_name_prefix="sandbox-tool")
+        self._warm_pool   = WarmSandboxPool(self._create_sandbox, warm_pool) if warm_pool else None
         self._register_builtin_tools()
 
+    @property
+    def vault(self) -> VaultStore:
+        return self._vault
+
+    @property
+    def python_pool(self) -> WarmPythonPool:
+        return self._python_pool
+
+    @property
+    def warm_pool(self) -> WarmSandboxPool | None:
+        return self._warm_pool
+
+    async def aclose(self) -> None:
+        """Stop the warm pools and the tool threads (call before the event loop closes)."""
+        if self._warm_pool is not None:
+            await self._warm_pool.aclose()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        await self._python_pool.aclose()
+
+    async def run_blocking(self, fn: Callable, *args: Any) -> Any:
+        """Run a blocking call on the sandbox tool threads."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
     # ── Built-in Tool Registration ────────────────────────────────────────────
 
     def _register_builtin_tools(self) -> None:
 
-        async def run_python(code: str, **_) -> str:
-            """Execute Python code snippet in an isolated subprocess."""
+        async def run_python(
+            code:      str,
+            resources: SandboxResources | None = None,
+            workdir:   str | None              = None,
+            **_,
+        ) -> str:
+            """Execute Python code snippet in an isolated, single-use worker process."""
+            resources = resources or SandboxResources()
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    "python3", "-c", code,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                result = await self._python_pool.run(
+                    code,
+                    limits=resources.limits(),
+                    env=subprocess_env(dict(resources.env_vars)),   # + TRACEPARENT when telemetry is on
+                    cwd=workdir,
                 )
-                out, err = await asyncio.wait_for(proc.communicate(), timeout=10)
-                stdout = out.decode().strip()
-                stderr = err.decode().strip()
+                if result.limit is not None:
+                    return f"[LIMIT EXCEEDED] {json.dumps(result.limit_report())}"
+                stdout = result.stdout.strip()
+                stderr = result.stderr.strip()
                 return stdout if not stderr else f"{stdout}\nSTDERR: {stderr}"
             except Exception as e:
                 return f"[EXEC ERROR] {e}"
@@ -181,21 +320,27 @@ class SandboxManager:
                 f"3. Result C — recent developments on '{query}'"
             )
 
-        async def read_file(path: str, **_) -> str:
+        def _read(path: str) -> str:
+            with open(path) as f:
+                return f.read()
+
+        def _write(path: str, content: str) -> None:
+            with open(path, "w") as f:
+                f.write(content)
+
+        async def read_file(path: str, workdir: str | None = None, **_) -> str:
             try:
-                with open(path) as f:
-                    return f.read()
+                return await self.run_blocking(_read, os.path.join(workdir or "", path))
             except Exception as e:
                 return f"[FILE ERROR] {e}"
 
-        async def write_file(payload: str, **_) -> str:
+        async def write_file(payload: str, workdir: str | None = None, **_) -> str:
             """Payload format: 'path::content'"""
             if "::" not in payload:
                 return "[FILE ERROR] payload must be 'path::content'"
             path, content = payload.split("::", 1)
             try:
-                with open(path.strip(), "w") as f:
-                    f.write(content)
+                await self.run_blocking(_write, os.path.join(workdir or "", path.strip()), content)
                 return f"Written {len(content)} chars to {path.strip()}"
             except Exception as e:
                 return f"[FILE ERROR] {e}"
@@ -206,7 +351,10 @@ class SandboxManager:
         self._registry.register("write_file", write_file)
 
     def register_tool(self, name: str, fn: Callable) -> None:
-        """Register custom tools at runtime."""
+        """
+        Register custom tools at runtime. Tools are called as
+        fn(input, vault=..., [resources=..., workdir=...]); sync tools run in a worker thread.
+        """
         self._registry.register(name, fn)
 
     # ── Create / Execute / Reclaim ─────────────────────────────────────────────
@@ -215,16 +363,27 @@ class SandboxManager:
         """
         Create a new sandbox. Equivalent to provision({resources}).
         Called lazily by the orchestrator — only when tools are actually needed.
+        With a warm pool, a ready sandbox of the same profile is handed out instead.
         """
-        resources  = resources or SandboxResources()
-        sandbox_id = str(uuid.uuid4())
-        self._sandboxes[sandbox_id] = Sandbox(
-            sandbox_id=sandbox_id,
+        resources = resources or SandboxResources()
+        with span("sandbox.provision", warm_pool=self._warm_pool is not None) as s:
+            if self._warm_pool is not None:
+                sandbox = await self._warm_pool.acquire(resources)
+            else:
+                sandbox = await self._create_sandbox(resources)
+            s.set_attribute("sandbox_id", sandbox.sandbox_id)
+        self._sandboxes[sandbox.sandbox_id] = sandbox
+        return sandbox.sandbox_id
+
+    async def _create_sandbox(self, resources: SandboxResources) -> Sandbox:
+        """The actual creation step (container / VM start in a real deployment)."""
+        return Sandbox(
+            sandbox_id=str(uuid.uuid4()),
             resources=resources,
             registry=self._registry,
             vault=self._vault,
+            executor=self._executor,
         )
-        return sandbox_id
 
     def get(self, sandbox_id: str) -> Sandbox | None:
         return self._sandboxes.get(sandbox_id)
@@ -236,7 +395,8 @@ class SandboxManager:
             raise RuntimeError(
                 f"Sandbox {sandbox_id} not found or dead. Call provision() first."
             )
-        return await sandbox.execute(name, input_data)
+        with span("sandbox.execute", sandbox_id=sandbox_id, tool=name):
+            return await sandbox.execute(name, input_data)
 
     def reclaim(self, sandbox_id: str) -> None:
         """Terminate and discard sandbox (replaceable pattern)."""
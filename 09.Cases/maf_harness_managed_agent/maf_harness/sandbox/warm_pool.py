@@ -0,0 +1,218 @@
+"""
+maf_harness.sandbox.warm_pool
+==============================
+Pre-provisioned sandboxes per SandboxResources profile.
+
+Lazy provisioning keeps reasoning-only sessions free of sandbox cost, but once a
+sandbox is a real isolated process or container, creating it on the tool call's
+critical path costs far more than the in-process stub. WarmSandboxPool keeps a
+few sandboxes ready per profile, sized by predicted demand:
+
+    demand   EWMA of provisions/sec per profile, updated every `tick_sec` from the
+             spawns seen in that tick; prime() seeds it from SANDBOX_SPAWN events
+             replayed from a session log (azure_function_host does so at startup)
+    target   clamp(ceil(rate × horizon_sec), min_idle, max_idle)
+    fill     idle sandboxes are created in the background up to target
+    evict    idle sandboxes above target and idle for over idle_ttl_sec are killed
+    miss     an empty pool never blocks: acquire() falls back to lazy creation
+
+A profile is SandboxResources.profile() — limits, env and allowed tools — so a
+warm sandbox is only handed to a request for exactly what it was built with.
+
+    pool = WarmSandboxPool(create=mgr._create_sandbox, config=WarmPoolConfig(max_idle=4))
+    sandbox = await pool.acquire(SandboxResources(allowed_tools=["run_python"]))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable
+
+from maf_harness.middleware.quantiles import LogHistogram
+from maf_harness.session.session_log import EventKind
+
+if TYPE_CHECKING:
+    from maf_harness.sandbox.sandbox import Sandbox, SandboxResources
+    from maf_harness.session.session_log import SessionEvent
+
+
+@dataclass
+class WarmPoolConfig:
+    min_idle:     int   = 0         # kept ready per profile regardless of demand
+    max_idle:     int   = 4         # never more idle than this per profile
+    idle_ttl_sec: float = 120.0     # idle time before a surplus sandbox is evicted
+    horizon_sec:  float = 10.0      # predicted demand covered by the idle sandboxes
+    alpha:        float = 0.3       # EWMA weight of the latest tick
+    tick_sec:     float = 1.0       # predictor / fill / evict period
+
+
+@dataclass
+class _Idle:
+    sandbox: Sandbox
+    since:   float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Profile:
+    resources: SandboxResources
+    idle:      deque[_Idle] = field(default_factory=deque)
+    rate:      float        = 0.0   # EWMA provisions/sec
+    spawns:    int          = 0     # provisions since the last tick
+    creating:  int          = 0
+    last_used: float        = field(default_factory=time.monotonic)
+
+
+class WarmSandboxPool:
+    """Demand-sized pools of ready sandboxes, one per resources profile."""
+
+    def __init__(
+        self,
+        create: Callable[[SandboxResources], Awaitable[Sandbox]],
+        config: WarmPoolConfig | None = None,
+    ) -> None:
+        self._create   = create
+        self.config    = config or WarmPoolConfig()
+        self._profiles: dict[tuple, _Profile] = {}
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._last_tick = time.monotonic()
+        self.hits      = 0
+        self.misses    = 0
+        self.created   = 0
+        self.evicted   = 0
+        self._warm_ms  = LogHistogram()
+        self._lazy_ms  = LogHistogram()
+
+    # ── Provisioning ────────────────────────────────────────────────────────────
+
+    async def acquire(self, resources: SandboxResources) -> Sandbox:
+        """A ready sandbox for `resources`, or a freshly created one when none is idle."""
+        self._bind_loop()
+        start   = time.perf_counter()
+        profile = self._profile(resources)
+        profile.spawns   += 1
+        profile.last_used = time.monotonic()
+        while profile.idle:
+            sandbox = profile.idle.popleft().sandbox
+            if sandbox.alive:
+                self.hits += 1
+                self._warm_ms.record((time.perf_counter() - start) * 1000)
+                return sandbox
+        self.misses += 1
+        sandbox = await self._create(resources)
+        self._lazy_ms.record((time.perf_counter() - start) * 1000)
+        return sandbox
+
+    def prime(
+        self,
+        resources:  SandboxResources,
+        events:     Iterable[SessionEvent],
+        window_sec: float = 300.0,
+    ) -> float:
+        """Seed the demand estimate for `resources` from recent SANDBOX_SPAWN events."""
+        cutoff = time.time() - window_sec
+        count  = sum(1 for e in events if e.kind == EventKind.SANDBOX_SPAWN and e.timestamp >= cutoff)
+        profile = self._profile(resources)
+        profile.rate = max(profile.rate, count / window_sec)
+        return profile.rate
+
+    # ── Lifecycle ───────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Start the predictor / fill / evict loop now instead of on first use."""
+        self._bind_loop()
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for profile in self._profiles.values():
+            while profile.idle:
+                profile.idle.popleft().sandbox.kill()
+
+    def stats(self) -> dict:
+        takes = self.hits + self.misses
+        return {
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": round(self.hits / takes, 3) if takes else 0.0,
+            "created":  self.created,
+            "evicted":  self.evicted,
+            "provision_ms": {
+                "warm_p50": round(self._warm_ms.quantile(0.50), 3),
+                "warm_p95": round(self._warm_ms.quantile(0.95), 3),
+                "lazy_p50": round(self._lazy_ms.quantile(0.50), 3),
+                "lazy_p95": round(self._lazy_ms.quantile(0.95), 3),
+            },
+            "profiles": [
+                {
+                    "allowed_tools": list(p.resources.allowed_tools),
+                    "idle":          len(p.idle),
+                    "target":        self._target(p),
+                    "rate_per_sec":  round(p.rate, 3),
+                }
+                for p in self._profiles.values()
+            ],
+        }
+
+    # ── Internals ───────────────────────────────────────────────────────────────
+
+    def _profile(self, resources: SandboxResources) -> _Profile:
+        key = resources.profile()
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = _Profile(resources)
+        return profile
+
+    def _target(self, profile: _Profile) -> int:
+        predicted = math.ceil(profile.rate * self.config.horizon_sec - 1e-9)
+        return max(self.config.min_idle, min(self.config.max_idle, predicted))
+
+    def _bind_loop(self) -> None:
+        # Like WarmPythonPool: the maintenance task belongs to the running loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.tick_sec)
+            await self._tick()
+
+    async def _tick(self) -> None:
+        now, cfg = time.monotonic(), self.config
+        elapsed, self._last_tick = max(now - self._last_tick, 1e-3), now
+        fills: list[Awaitable[None]] = []
+        for key, profile in list(self._profiles.items()):
+            profile.rate   = cfg.alpha * (profile.spawns / elapsed) + (1 - cfg.alpha) * profile.rate
+            profile.spawns = 0
+            target = self._target(profile)
+            while profile.idle and not profile.idle[0].sandbox.alive:
+                profile.idle.popleft()
+            while len(profile.idle) > target and now - profile.idle[0].since > cfg.idle_ttl_sec:
+                profile.idle.popleft().sandbox.kill()
+                self.evicted += 1
+            missing = target - len(profile.idle) - profile.creating
+            fills.extend(self._fill(profile) for _ in range(missing))
+            if (not profile.idle and not profile.creating and target == 0
+                    and now - profile.last_used > cfg.idle_ttl_sec):
+                del self._profiles[key]               # forgotten profile
+        if fills:
+            await asyncio.gather(*fills)
+
+    async def _fill(self, profile: _Profile) -> None:
+        profile.creating += 1
+        try:
+            sandbox = await self._create(profile.resources)
+        except Exception:
+            return                                    # stay lazy; retry next tick
+        finally:
+            profile.creating -= 1
+        self.created += 1
+        profile.idle.append(_Idle(sandbox))
@@ -0,0 +1,422 @@
+"""
+maf_harness.session.backends
+=============================
+Pluggable storage backends underneath SessionLog.
+
+SessionLog owns the Managed Agent semantics (event kinds, wake, context window);
+a backend only has to persist ordered events per session and answer positional
+and kind-filtered range queries over them.
+
+Backends:
+    InMemoryBackend   dict of lists — default, used by the demos and tests
+    SqliteBackend     SQLite in WAL mode — survives process restarts, so
+                      wake(session_id) works across harness *and* host crashes
+
+Each event gets a per-session sequence number (seq = position in the log), so
+get_events(start, end) maps to an indexed `seq` range scan rather than a Python
+list slice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator
+
+if TYPE_CHECKING:
+    from maf_harness.session.session_log import EventKind, SessionEvent
+
+
+# ── Backend Interface ───────────────────────────────────────────────────────────
+
+class SessionBackend(ABC):
+    """Durable storage contract used by SessionLog."""
+
+    def __init__(self) -> None:
+        # One-shot "something was appended" signals for follow(); replaced on
+        # every notification so waiters never miss a wake-up.
+        self._signals: dict[str, asyncio.Event] = {}
+
+    @abstractmethod
+    async def create_session(self, session_id: str) -> None:
+        """Register an (empty) session."""
+
+    @abstractmethod
+    async def append(self, session_id: str, event: SessionEvent) -> None:
+        """Append one event; must be durable once the call returns."""
+
+    @abstractmethod
+    async def read(
+        self,
+        session_id:  str,
+        start:       int                    = 0,
+        end:         int | None             = None,
+        kind_filter: list[EventKind] | None = None,
+    ) -> list[SessionEvent]:
+        """Positional slice [start:end] (list semantics), then optional kind filter."""
+
+    @abstractmethod
+    async def count(self, session_id: str) -> int:
+        """Number of events in the session."""
+
+    @abstractmethod
+    async def has_session(self, session_id: str) -> bool:
+        """Whether the session exists in storage."""
+
+    @abstractmethod
+    def list_sessions(self) -> list[str]:
+        """All known session ids."""
+
+    @abstractmethod
+    async def save_snapshot(self, session_id: str, snapshot: dict) -> None:
+        """Store the latest snapshot for a session (replaces any previous one)."""
+
+    @abstractmethod
+    async def load_snapshot(self, session_id: str) -> dict | None:
+        """Latest snapshot for a session, or None."""
+
+    async def close(self) -> None:
+        """Release resources. Default: nothing to release."""
+
+    # ── Tail Streaming ───────────────────────────────────────────────────────────
+
+    async def follow(
+        self,
+        session_id:    str,
+        from_index:    int   = 0,
+        poll_interval: float = 1.0,
+    ) -> AsyncIterator[SessionEvent]:
+        """
+        Yield events from `from_index` onward, then each new event as it is
+        appended. Runs until the consumer stops iterating.
+
+        Appends made through this backend instance wake followers immediately;
+        `poll_interval` bounds the delay for writes from other processes.
+        """
+        next_index = from_index
+        while True:
+            # Grab the signal *before* reading so an append that lands between
+            # the read and the wait still wakes us.
+            signal = self._signals.setdefault(session_id, asyncio.Event())
+            events = await self.read(session_id, start=next_index)
+            if events:
+                next_index += len(events)
+                for event in events:
+                    yield event
+                continue
+            try:
+                await asyncio.wait_for(signal.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, session_id: str) -> None:
+        signal = self._signals.pop(session_id, None)
+        if signal is not None:
+            signal.set()
+
+
+# ── In-Memory Backend ───────────────────────────────────────────────────────────
+
+class InMemoryBackend(SessionBackend):
+    """
+    Process-local backend. Fast, zero setup, lost on restart.
+
+    Writers take a per-session lock, so concurrent sessions never contend with
+    each other. Readers take no lock at all: the per-session list is append-only
+    and existing entries are never mutated, so the prefix observed at read time
+    is an immutable snapshot; only the requested range is copied out.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._store: dict[str, list[SessionEvent]] = {}
+        self._locks: dict[str, asyncio.Lock]       = {}
+        self._snapshots: dict[str, dict]           = {}
+
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks.setdefault(session_id, asyncio.Lock())
+        return lock
+
+    async def create_session(self, session_id: str) -> None:
+        self._store.setdefault(session_id, [])
+
+    async def append(self, session_id: str, event: SessionEvent) -> None:
+        async with self._lock_for(session_id):
+            self._store.setdefault(session_id, []).append(event)
+        self._notify(session_id)
+
+    async def read(
+        self,
+        session_id:  str,
+        start:       int                    = 0,
+        end:         int | None             = None,
+        kind_filter: list[EventKind] | None = None,
+    ) -> list[SessionEvent]:
+        sliced = self._store.get(session_id, [])[start:end]
+        if kind_filter:
+            sliced = [e for e in sliced if e.kind in kind_filter]
+        return sliced
+
+    async def count(self, session_id: str) -> int:
+        return len(self._store.get(session_id, ()))
+
+    async def has_session(self, session_id: str) -> bool:
+        return session_id in self._store
+
+    def list_sessions(self) -> list[str]:
+        return list(self._store.keys())
+
+    async def save_snapshot(self, session_id: str, snapshot: dict) -> None:
+        self._snapshots[session_id] = snapshot
+
+    async def load_snapshot(self, session_id: str) -> dict | None:
+        return self._snapshots.get(session_id)
+
+
+# ── SQLite (WAL) Backend ────────────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id  TEXT PRIMARY KEY,
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id  TEXT    NOT NULL,
+    seq         INTEGER NOT NULL,
+    event_id    TEXT    NOT NULL,
+    kind        TEXT    NOT NULL,
+    payload     TEXT    NOT NULL,
+    timestamp   REAL    NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events (session_id, kind, seq);
+CREATE TABLE IF NOT EXISTS snapshots (
+    session_id  TEXT PRIMARY KEY,
+    upto        INTEGER NOT NULL,
+    data        TEXT    NOT NULL,
+    created_at  REAL    NOT NULL
+);
+"""
+
+
+class SqliteBackend(SessionBackend):
+    """
+    SQLite backend in WAL mode.
+
+    - (session_id, seq) is the primary key, so positional slices are range scans;
+      (session_id, kind, seq) serves kind_filter queries.
+    - Inserts are group-committed: concurrent append() calls that arrive while a
+      transaction is in flight are written together in the next transaction, and
+      each caller returns only after its batch has committed.
+    - All blocking SQLite work runs in a worker thread; a dedicated reader
+      connection lets WAL serve reads while a write is committing.
+    - seq numbers are assigned inside the write transaction (BEGIN IMMEDIATE),
+      so a rolled-back batch leaves no gap and positions stay contiguous.
+
+    Any number of processes may read and append: count() and read() always go to
+    the database, so every instance sees events written by the others.
+    """
+
+    def __init__(self, path: str, max_batch: int = 256) -> None:
+        super().__init__()
+        self.path       = path
+        self.max_batch  = max_batch
+        self._writer    = self._connect()
+        self._reader    = self._connect()
+        self._wlock     = threading.Lock()
+        self._rlock     = threading.Lock()
+        self._pending:  list[tuple[tuple, asyncio.Future]] = []
+        self._flusher:  asyncio.Task | None = None
+
+        with self._wlock:
+            self._writer.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # ── Writes ───────────────────────────────────────────────────────────────────
+
+    async def create_session(self, session_id: str) -> None:
+        def _insert() -> None:
+            with self._wlock:
+                self._writer.execute(
+                    "INSERT OR IGNORE INTO sessions (session_id, created_at) VALUES (?, ?)",
+                    (session_id, time.time()),
+                )
+        await asyncio.to_thread(_insert)
+
+    async def append(self, session_id: str, event: SessionEvent) -> None:
+        # seq is filled in by _insert_many, inside the batch's transaction.
+        row = (
+            session_id,
+            event.event_id,
+            event.kind.value,
+            json.dumps(event.payload, default=str),
+            event.timestamp,
+        )
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((row, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        await fut
+
+    async def _flush(self) -> None:
+        # Yield once so appends issued in the same loop tick join this batch.
+        await asyncio.sleep(0)
+        while self._pending:
+            batch, self._pending = (
+                self._pending[: self.max_batch],
+                self._pending[self.max_batch:],
+            )
+            try:
+                await asyncio.to_thread(self._insert_many, [row for row, _ in batch])
+            except Exception as exc:
+                # Nothing was numbered outside the rolled-back transaction: no gap.
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_result(None)
+            for sid in {row[0] for row, _ in batch}:
+                self._notify(sid)
+
+    def _insert_many(self, rows: list[tuple]) -> list[int]:
+        """Insert rows (session_id, event_id, kind, payload, ts); return their seqs."""
+        with self._wlock:
+            # IMMEDIATE takes the write lock before MAX(seq) is read, so no other
+            # writer can number rows between our read and our insert.
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                next_seq: dict[str, int] = {}
+                for sid in dict.fromkeys(r[0] for r in rows):
+                    next_seq[sid] = self._writer.execute(
+                        "SELECT COALESCE(MAX(seq), -1) + 1 FROM events WHERE session_id = ?",
+                        (sid,),
+                    ).fetchone()[0]
+                seqs: list[int] = []
+                for r in rows:
+                    seqs.append(next_seq[r[0]])
+                    next_seq[r[0]] += 1
+                self._writer.executemany(
+                    "INSERT OR IGNORE INTO sessions (session_id, created_at) VALUES (?, ?)",
+                    {(r[0], r[4]) for r in rows},
+                )
+                self._writer.executemany(
+                    "INSERT INTO events (session_id, seq, event_id, kind, payload, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(r[0], seq, *r[1:]) for r, seq in zip(rows, seqs)],
+                )
+                self._writer.execute("COMMIT")
+            except Exception:
+                self._writer.execute("ROLLBACK")
+                raise
+        return seqs
+
+    # ── Reads ────────────────────────────────────────────────────────────────────
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._rlock:
+            return self._reader.execute(sql, params).fetchall()
+
+    async def _max_seq(self, session_id: str) -> int:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT COALESCE(MAX(seq), -1) FROM events WHERE session_id = ?",
+            (session_id,),
+        )
+        return rows[0][0]
+
+    async def count(self, session_id: str) -> int:
+        # Always from the database: other instances may append to the session.
+        return await self._max_seq(session_id) + 1
+
+    async def read(
+        self,
+        session_id:  str,
+        start:       int                    = 0,
+        end:         int | None             = None,
+        kind_filter: list[EventKind] | None = None,
+    ) -> list[SessionEvent]:
+        from maf_harness.session.session_log import EventKind, SessionEvent
+
+        # Resolve negative bounds exactly like list slicing; non-negative ones
+        # need no count, and an open end reads whatever has been committed.
+        if start < 0 or (end is not None and end < 0):
+            start, end, _ = slice(start, end).indices(await self.count(session_id))
+        if end is not None and start >= end:
+            return []
+
+        sql    = ("SELECT event_id, kind, payload, timestamp FROM events "
+                  "WHERE session_id = ? AND seq >= ?")
+        params: tuple = (session_id, start)
+        if end is not None:
+            sql    += " AND seq < ?"
+            params += (end,)
+        if kind_filter:
+            sql    += f" AND kind IN ({','.join('?' * len(kind_filter))})"
+            params += tuple(k.value for k in kind_filter)
+        sql += " ORDER BY seq"
+
+        rows = await asyncio.to_thread(self._query, sql, params)
+        return [
+            SessionEvent(
+                kind=EventKind(kind),
+                payload=json.loads(payload),
+                timestamp=ts,
+                event_id=event_id,
+                session_id=session_id,
+            )
+            for event_id, kind, payload, ts in rows
+        ]
+
+    async def has_session(self, session_id: str) -> bool:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT 1 FROM sessions WHERE session_id = ?",
+            (session_id,),
+        )
+        return bool(rows)
+
+    def list_sessions(self) -> list[str]:
+        return [r[0] for r in self._query(
+            "SELECT session_id FROM sessions ORDER BY created_at", ()
+        )]
+
+    async def save_snapshot(self, session_id: str, snapshot: dict) -> None:
+        def _upsert() -> None:
+            with self._wlock:
+                self._writer.execute(
+                    "INSERT OR REPLACE INTO snapshots (session_id, upto, data, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (session_id, snapshot.get("upto", 0),
+                     json.dumps(snapshot, default=str), time.time()),
+                )
+        await asyncio.to_thread(_upsert)
+
+    async def load_snapshot(self, session_id: str) -> dict | None:
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT data FROM snapshots WHERE session_id = ?",
+            (session_id,),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            await self._flusher
+        with self._wlock:
+            self._writer.close()
+        with self._rlock:
+            self._reader.close()
@@ -0,0 +1,236 @@
+"""
+maf_harness.session.compaction
+===============================
+Context compaction — implements the protocol described by the `summarise` skill.
+
+When the events since the last checkpoint exceed a token budget, everything except
+the most recent `keep_recent` events is folded (together with the previous summary)
+into a new summary and persisted as an EventKind.COMPACTION event:
+
+    payload = {
+        "summary":       str,   # Goal / Steps taken / Current state
+        "upto":          int,   # events [0, upto) are covered by the summary
+        "tokens_before": int,   # estimated tokens the summary replaces
+        "tokens_after":  int,   # estimated tokens of the summary itself
+    }
+
+SessionLog.wake() then returns "latest compaction + events since" instead of the full
+log, so wake latency and prompt size stay roughly flat as a session grows. The log
+itself is never rewritten — compaction is a checkpoint, not a deletion.
+
+Summarizers:
+    ExtractiveSummarizer   deterministic, no model call (tests, fallback)
+    LLMSummarizer          FoundryChatClient-backed; falls back to extractive on error
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import warnings
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from maf_harness.session.session_log import EventKind, SessionEvent
+
+if TYPE_CHECKING:
+    from maf_harness.session.session_log import SessionLog
+
+
+# ── Token Estimation ────────────────────────────────────────────────────────────
+
+_CHARS_PER_TOKEN = 4     # conservative average for English + JSON on GPT tokenizers
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, tokenizer-free token estimate."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def event_tokens(event: SessionEvent) -> int:
+    """Estimated prompt cost of one event as the harness renders it."""
+    return estimate_tokens(event.kind.value) + estimate_tokens(
+        json.dumps(event.payload, default=str)
+    )
+
+
+# ── Summarizers ─────────────────────────────────────────────────────────────────
+
+class Summarizer(ABC):
+    """Folds a previous summary plus a run of events into a new summary."""
+
+    @abstractmethod
+    async def summarize(self, previous: str | None, events: list[SessionEvent]) -> str:
+        ...
+
+
+def _clip(value: object, n: int) -> str:
+    s = str(value).replace("\n", " ")
+    return s[:n] + ("…" if len(s) > n else "")
+
+
+class ExtractiveSummarizer(Summarizer):
+    """
+    Deterministic summary built from event payloads — no model call.
+
+    Follows the summarise-skill layout (Goal / Steps taken / Current state) and
+    merges the previous summary structurally, capping steps at `max_steps`, so
+    repeated compactions stay bounded in size.
+    """
+
+    _OMITTED = re.compile(r"^\((\d+) earlier steps omitted\)$")
+
+    def __init__(self, max_steps: int = 20, max_chars: int = 160) -> None:
+        self.max_steps = max_steps
+        self.max_chars = max_chars
+
+    def _parse(self, previous: str) -> tuple[str | None, int, list[str], str | None]:
+        """Split one of our own summaries back into (goal, omitted, steps, opaque)."""
+        goal, omitted, steps, section = None, 0, [], None
+        for line in previous.splitlines():
+            if line.startswith("Goal: "):
+                goal = line[len("Goal: "):]
+            elif line in ("Steps taken:", "Current state:"):
+                section = line
+            elif line.startswith("- ") and section == "Steps taken:":
+                m = self._OMITTED.match(line[2:])
+                if m:
+                    omitted += int(m.group(1))
+                else:
+                    steps.append(line[2:])
+        if goal is None and not steps:
+            # Not produced by this class (e.g. an LLM summary) — keep it opaque.
+            return None, 0, [], _clip(previous, self.max_chars * 4)
+        return goal, omitted, steps, None
+
+    async def summarize(self, previous: str | None, events: list[SessionEvent]) -> str:
+        goal, omitted, steps, opaque = self._parse(previous) if previous else (None, 0, [], None)
+        state: list[str] = []
+
+        for e in events:
+            p = e.payload
+            if e.kind == EventKind.SESSION_START:
+                goal = _clip(p.get("task") or "", self.max_chars) or goal
+            elif e.kind == EventKind.USER_INPUT:
+                steps.append(f"user: {_clip(p.get('content', ''), self.max_chars)}")
+            elif e.kind in (EventKind.TOOL_CALL, EventKind.SANDBOX_EXEC):
+                name   = p.get("tool") or p.get("router") or "tool"
+                result = p.get("result") or p.get("routed_to") or ""
+                steps.append(f"{name}: {_clip(result, self.max_chars)}")
+            elif e.kind == EventKind.AGENT_RESPONSE:
+                text = p.get("content") or p.get("response") or ""
+                if text:
+                    state = [f"last answer: {_clip(text, self.max_chars)}"]
+            elif e.kind == EventKind.HARNESS_CRASH:
+                steps.append(f"crash: {_clip(p.get('error', ''), self.max_chars)}")
+
+        if len(steps) > self.max_steps:
+            omitted += len(steps) - self.max_steps
+            steps    = steps[-self.max_steps:]
+        if omitted:
+            steps = [f"({omitted} earlier steps omitted)"] + steps
+
+        parts = []
+        if opaque:
+            parts.append(f"Earlier summary: {opaque}")
+        if goal:
+            parts.append(f"Goal: {goal}")
+        if steps:
+            parts.append("Steps taken:\n" + "\n".join(f"- {s}" for s in steps))
+        if state:
+            parts.append("Current state:\n" + "\n".join(f"- {s}" for s in state))
+        return "\n".join(parts) or "(no significant activity)"
+
+
+class LLMSummarizer(Summarizer):
+    """Summarise with a Foundry model; degrade to ExtractiveSummarizer on any failure."""
+
+    _INSTRUCTIONS = (
+        "You compact agent session logs. Given an earlier summary and new events, write a "
+        "single structured summary with sections 'Goal', 'Steps taken' (one line per tool "
+        "call and outcome) and 'Current state' (files written, decisions made, open "
+        "questions). A reader of the summary alone must be able to continue the task. "
+        "Be terse; never invent facts."
+    )
+
+    def __init__(self, client, max_input_chars: int = 24_000) -> None:
+        self._client          = client
+        self._fallback        = ExtractiveSummarizer()
+        self.max_input_chars  = max_input_chars
+        self._agent           = None
+
+    async def summarize(self, previous: str | None, events: list[SessionEvent]) -> str:
+        lines = [f"[{e.kind.value}] {json.dumps(e.payload, default=str)}" for e in events]
+        body  = "\n".join(lines)[-self.max_input_chars:]
+        prompt = (
+            f"Earlier summary:\n{previous or '(none)'}\n\n"
+            f"New events:\n{body}\n\nWrite the updated summary."
+        )
+        try:
+            if self._agent is None:
+                from agent_framework import Agent
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    self._agent = Agent(
+                        client=self._client,
+                        name="CompactionSummariser",
+                        instructions=self._INSTRUCTIONS,
+                    )
+            text = str(await self._agent.run(prompt)).strip()
+            if text:
+                return text
+        except Exception as exc:
+            print(f"[COMPACTION] LLM summariser failed ({exc}); using extractive fallback.")
+        return await self._fallback.summarize(previous, events)
+
+
+# ── Compactor ───────────────────────────────────────────────────────────────────
+
+class Compactor:
+    """
+    Token-budget driven compaction over a SessionLog.
+
+    budget_tokens : compact once events since the last checkpoint exceed this
+    keep_recent   : newest events always left verbatim (skill: "LAST 5 events")
+    """
+
+    def __init__(
+        self,
+        session_log:   SessionLog,
+        summarizer:    Summarizer | None = None,
+        budget_tokens: int               = 8_000,
+        keep_recent:   int               = 5,
+    ) -> None:
+        self.session_log   = session_log
+        self.summarizer    = summarizer or ExtractiveSummarizer()
+        self.budget_tokens = budget_tokens
+        self.keep_recent   = keep_recent
+
+    async def maybe_compact(self, session_id: str) -> SessionEvent | None:
+        """Write a COMPACTION checkpoint if the live tail is over budget."""
+        latest = await self.session_log.get_latest_compaction(session_id)
+        start  = latest.payload["upto"] if latest else 0
+        since  = await self.session_log.get_events(session_id, start=start)
+
+        live   = [e for e in since if e.kind != EventKind.COMPACTION]
+        tokens = sum(event_tokens(e) for e in live)
+        if tokens <= self.budget_tokens or len(since) <= self.keep_recent:
+            return None
+
+        cut     = len(since) - self.keep_recent
+        folded  = [e for e in since[:cut] if e.kind != EventKind.COMPACTION]
+        summary = await self.summarizer.summarize(
+            latest.payload["summary"] if latest else None, folded,
+        )
+        event = SessionEvent(
+            kind=EventKind.COMPACTION,
+            session_id=session_id,
+            payload={
+                "summary":       summary,
+                "upto":          start + cut,
+                "tokens_before": sum(event_tokens(e) for e in folded),
+                "tokens_after":  estimate_tokens(summary),
+            },
+        )
+        await self.session_log.emit_event(session_id, event)
+        return event
@@ -8,10 +8,14 @@ Key interfaces (mapping to Anthropic article):
     emit_event(session_id, event)   → append to log
     get_events(session_id, ...)     → positional/filtered slicing
     get_session(session_id)         → AF AgentSession metadata
-    wake(session_id)                → (session, all_events) for harness recovery
+    wake(session_id)                → (session, latest compaction + events since) for recovery
+    wake_snapshot(session_id)       → (session, snapshot, snapshot events + delta) for per-turn rehydration
     get_context_window(session_id)  → recent N events for context engineering
+    follow(session_id, from_index)  → async iterator over new events (tail -f)
 
-Underlying uses AF InMemoryHistoryProvider (replace with CosmosDB / Redis in production).
+Events are persisted through a pluggable SessionBackend (see backends.py):
+InMemoryBackend by default, SqliteBackend (WAL) for durability across process
+restarts. Conversation history uses AF InMemoryHistoryProvider.
 """
 
 from __future__ import annotations
@@ -21,10 +25,13 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, AsyncIterator
 
 from agent_framework import AgentSession, InMemoryHistoryProvider, Message, Role
 
+from maf_harness.middleware.telemetry import span
+from maf_harness.session.backends import InMemoryBackend, SessionBackend
+
 
 # ── Event Model ───────────────────────────────────────────────────────────────
 
@@ -59,6 +66,72 @@ class SessionEvent:
             "timestamp":  self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionEvent":
+        return cls(
+            kind=EventKind(data["kind"]),
+            payload=data["payload"],
+            timestamp=data["timestamp"],
+            event_id=data["event_id"],
+            session_id=data.get("session_id", ""),
+        )
+
+
+@dataclass
+class SessionSnapshot:
+    """
+    Materialized harness state as of event index `upto` (exclusive).
+
+    Lets a harness rehydrate from "snapshot + events since" instead of the full
+    log. Snapshots are derived data: losing one only costs a slower wake().
+    """
+    upto:       int
+    compaction: dict | None             = None   # latest COMPACTION event (to_dict) at snapshot time
+    recent:     list[dict]              = field(default_factory=list)   # newest events, to_dict form
+    history:    dict | None             = None   # history provider state (AF to_dict), if supported
+    session:    dict | None             = None   # AgentSession state (AF to_dict), if supported
+    created_at: float                   = field(default_factory=time.time)
+
+    def events(self) -> list[SessionEvent]:
+        """Prompt-relevant events captured by the snapshot: compaction first, then recent."""
+        head = [SessionEvent.from_dict(self.compaction)] if self.compaction else []
+        return head + [SessionEvent.from_dict(d) for d in self.recent]
+
+    def to_dict(self) -> dict:
+        return {
+            "upto":       self.upto,
+            "compaction": self.compaction,
+            "recent":     self.recent,
+            "history":    self.history,
+            "session":    self.session,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionSnapshot":
+        return cls(**data)
+
+
+def _export_state(obj: Any) -> dict | None:
+    """Best-effort AF serialization (SerializationMixin.to_dict) — None if unsupported."""
+    to_dict = getattr(obj, "to_dict", None)
+    if not callable(to_dict):
+        return None
+    try:
+        return to_dict()
+    except Exception:
+        return None
+
+
+def _import_state(cls: type, state: dict | None) -> Any | None:
+    from_dict = getattr(cls, "from_dict", None)
+    if state is None or not callable(from_dict):
+        return None
+    try:
+        return from_dict(state)
+    except Exception:
+        return None
+
 
 # ── Session Log ───────────────────────────────────────────────────────────────
 
@@ -69,12 +142,20 @@ class SessionLog:
     Sessions exist outside the harness and sandbox.
     If the harness crashes, the session is unaffected; a new harness
     calls wake(session_id) to recover from the last event.
+
+    Storage is delegated to `backend` (InMemoryBackend if omitted). With a
+    durable backend such as SqliteBackend, sessions created by a previous
+    process are rehydrated on first access.
     """
 
-    def __init__(self) -> None:
-        self._store:    dict[str, list[SessionEvent]]         = {}
+    def __init__(self, backend: SessionBackend | None = None) -> None:
+        self._backend:  SessionBackend                        = backend or InMemoryBackend()
         self._sessions: dict[str, AgentSession]               = {}
         self._history:  dict[str, InMemoryHistoryProvider]    = {}
+        # Latest COMPACTION checkpoint per session (None = known to have none).
+        self._compactions: dict[str, SessionEvent | None]     = {}
+        # Sessions rebuilt from storage whose AF state a snapshot may restore.
+        self._rehydrated: set[str]                            = set()
         self._lock = asyncio.Lock()
 
     # ── Lifecycle ─────────────────────────────────────────────────────────────
@@ -88,8 +169,8 @@ class SessionLog:
         session_id = str(uuid.uuid4())
         af_session = AgentSession(session_id=session_id)
 
+        await self._backend.create_session(session_id)
         async with self._lock:
-            self._store[session_id]    = []
             self._sessions[session_id] = af_session
             self._history[session_id]  = InMemoryHistoryProvider()
 
@@ -106,8 +187,10 @@ class SessionLog:
     async def emit_event(self, session_id: str, event: SessionEvent) -> None:
         """Append an event to the log. Equivalent to emitEvent(id, event)."""
         event.session_id = session_id
-        async with self._lock:
-            self._store.setdefault(session_id, []).append(event)
+        with span("session.emit", session_id=session_id, kind=event.kind.value):
+            await self._backend.append(session_id, event)
+        if event.kind == EventKind.COMPACTION:
+            self._compactions[session_id] = event
 
     async def get_events(
         self,
@@ -120,15 +203,16 @@ class SessionLog:
         Return positional slice of event stream.
         Equivalent to getEvents() — "resume from where you left off".
         """
-        async with self._lock:
-            events = self._store.get(session_id, [])
-            sliced = events[start:end]
-            if kind_filter:
-                sliced = [e for e in sliced if e.kind in kind_filter]
-            return list(sliced)
+        return await self._backend.read(session_id, start, end, kind_filter)
 
     async def get_session(self, session_id: str) -> AgentSession | None:
         """Retrieve session metadata. Equivalent to getSession(id)."""
+        if session_id not in self._sessions and await self._backend.has_session(session_id):
+            # Session persisted by an earlier process — rebuild the AF handles.
+            async with self._lock:
+                self._sessions.setdefault(session_id, AgentSession(session_id=session_id))
+                self._history.setdefault(session_id, InMemoryHistoryProvider())
+                self._rehydrated.add(session_id)
         return self._sessions.get(session_id)
 
     async def wake(
@@ -138,19 +222,119 @@ class SessionLog:
         """
         Rehydrate harness from durable session.
         Equivalent to wake(sessionId) → (session, event_log).
+
+        If the session has been compacted, event_log is the latest COMPACTION
+        event followed by the events after its checkpoint, so the cost of wake
+        tracks the live tail rather than the full history.
         """
         session = await self.get_session(session_id)
-        events  = await self.get_events(session_id)
+        events  = await self.get_compacted_events(session_id)
         await self.emit_event(
             session_id,
             SessionEvent(
                 kind=EventKind.HARNESS_WAKE,
                 session_id=session_id,
-                payload={"resumed_at_event": len(events)},
+                payload={"resumed_at_event": await self.event_count(session_id)},
             ),
         )
         return session, events
 
+    async def wake_snapshot(
+        self,
+        session_id: str,
+    ) -> tuple[AgentSession | None, SessionSnapshot | None, list[SessionEvent]]:
+        """
+        Per-turn rehydration: latest snapshot + only the events written after it.
+
+        Returns (session, snapshot, events) where events is the snapshot's own
+        prompt events followed by the delta — the same shape wake() returns, so
+        callers can render it identically. Falls back to wake()-style loading
+        when there is no snapshot or a compaction happened after it.
+        """
+        session  = await self.get_session(session_id)
+        raw      = await self._backend.load_snapshot(session_id)
+        snapshot = SessionSnapshot.from_dict(raw) if raw else None
+
+        delta: list[SessionEvent] = []
+        if snapshot is not None:
+            delta = await self.get_events(session_id, start=snapshot.upto)
+        if snapshot is None or any(e.kind == EventKind.COMPACTION for e in delta):
+            events = await self.get_compacted_events(session_id)
+        else:
+            events = snapshot.events() + delta
+            self._restore_state(session_id, snapshot)
+            session = self._sessions.get(session_id, session)
+
+        await self.emit_event(
+            session_id,
+            SessionEvent(
+                kind=EventKind.HARNESS_WAKE,
+                session_id=session_id,
+                payload={
+                    "resumed_at_event": await self.event_count(session_id),
+                    "snapshot_upto":    snapshot.upto if snapshot else None,
+                },
+            ),
+        )
+        return session, snapshot, events
+
+    async def save_snapshot(self, session_id: str, recent_n: int = 30) -> SessionSnapshot:
+        """Capture the current prompt-relevant state of a session as a snapshot."""
+        upto       = await self.event_count(session_id)
+        compaction = await self.get_latest_compaction(session_id)
+        start      = max(compaction.payload["upto"] if compaction else 0, upto - recent_n)
+        recent     = await self.get_events(session_id, start=start, end=upto)
+        snapshot   = SessionSnapshot(
+            upto=upto,
+            compaction=compaction.to_dict() if compaction else None,
+            recent=[e.to_dict() for e in recent if e.kind != EventKind.COMPACTION],
+            history=_export_state(self._history.get(session_id)),
+            session=_export_state(self._sessions.get(session_id)),
+        )
+        await self._backend.save_snapshot(session_id, snapshot.to_dict())
+        return snapshot
+
+    def _restore_state(self, session_id: str, snapshot: SessionSnapshot) -> None:
+        """After a process restart, reload AF session/history state from a snapshot."""
+        if session_id not in self._rehydrated:
+            return   # live in this process — in-memory state is newer than any snapshot
+        self._rehydrated.discard(session_id)
+        history = _import_state(InMemoryHistoryProvider, snapshot.history)
+        if history is not None:
+            self._history[session_id] = history
+        af_session = _import_state(AgentSession, snapshot.session)
+        if af_session is not None:
+            self._sessions[session_id] = af_session
+
+    # ── Compaction Checkpoints ───────────────────────────────────────────────────
+
+    async def get_latest_compaction(self, session_id: str) -> SessionEvent | None:
+        """Most recent COMPACTION event (see maf_harness.session.compaction)."""
+        if session_id not in self._compactions:
+            found = await self.get_events(session_id, kind_filter=[EventKind.COMPACTION])
+            self._compactions[session_id] = found[-1] if found else None
+        return self._compactions[session_id]
+
+    async def get_compacted_events(self, session_id: str) -> list[SessionEvent]:
+        """Latest compaction (if any) + every non-compaction event after its checkpoint."""
+        latest = await self.get_latest_compaction(session_id)
+        if latest is None:
+            return await self.get_events(session_id)
+        since = await self.get_events(session_id, start=latest.payload["upto"])
+        return [latest] + [e for e in since if e.kind != EventKind.COMPACTION]
+
+    def follow(
+        self,
+        session_id: str,
+        from_index: int = 0,
+    ) -> AsyncIterator[SessionEvent]:
+        """
+        Tail the session: yield events from `from_index`, then new events as
+        they are appended. Lets dashboards and sibling brains watch a live
+        session without re-fetching the whole log.
+        """
+        return self._backend.follow(session_id, from_index)
+
     # ── AF History Integration ────────────────────────────────────────────────────
 
     def get_history_provider(self, session_id: str) -> InMemoryHistoryProvider | None:
@@ -164,12 +348,14 @@ class SessionLog:
         last_n:     int = 20,
     ) -> list[SessionEvent]:
         """Recent N events — lightweight context window based on session log."""
-        events = await self.get_events(session_id)
-        return events[-last_n:]
+        return await self.get_events(session_id, start=-last_n)
 
     async def event_count(self, session_id: str) -> int:
-        async with self._lock:
-            return len(self._store.get(session_id, []))
+        return await self._backend.count(session_id)
 
     def list_sessions(self) -> list[str]:
-        return list(self._sessions.keys())
+        return list(dict.fromkeys([*self._sessions, *self._backend.list_sessions()]))
+
+    async def close(self) -> None:
+        """Flush and release the storage backend."""
+        await self._backend.close()
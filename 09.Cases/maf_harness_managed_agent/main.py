@@ -29,9 +29,10 @@ load_dotenv()
 
 warnings.filterwarnings("ignore")
 
-from maf_harness.harness.harness    import AgentHarness, HarnessConfig, make_foundry_client
+from maf_harness.harness.clients    import close_foundry_clients, get_foundry_client
+from maf_harness.harness.harness    import AgentHarness, HarnessConfig
 from maf_harness.middleware.middleware import GLOBAL_METRICS
-from maf_harness.orchestration.multi_agent import run_many_brains
+from maf_harness.orchestration.multi_agent import iter_many_brains
 from maf_harness.sandbox.sandbox    import SandboxManager, VaultStore
 from maf_harness.session.session_log import EventKind, SessionLog
 
@@ -51,7 +52,7 @@ def _harness(name: str = "ManagedAgent") -> AgentHarness:
             agent_name=name,
             skill_names=["research", "code_execution", "summarise", "orchestration"],
         ),
-        client=make_foundry_client(),
+        client=get_foundry_client(),
     )
 
 
@@ -178,6 +179,8 @@ async def demo_streaming() -> None:
         resp = await h.run("Write a haiku about distributed systems.")
         print(resp, end="")
     print()
+    ttft, gap = GLOBAL_METRICS.quantiles(), GLOBAL_METRICS.quantiles(GLOBAL_METRICS.inter_token)
+    print(f"[METRICS] TTFT p50={ttft['p50']:.0f}ms  inter-token p50={gap['p50']:.1f}ms")
     await h.shutdown()
 
 
@@ -194,10 +197,8 @@ async def demo_many_brains() -> None:
         "Give one fun fact about Microsoft Foundry.",
     ]
 
-    print(f"\n[ORCHESTRATOR] Launching {len(tasks)} parallel Foundry brains…")
-    results = await run_many_brains(tasks, session_log, sandbox_mgr)
-
-    for r in results:
+    print(f"\n[ORCHESTRATOR] Launching {len(tasks)} Foundry brains (max 2 in flight)…")
+    async for r in iter_many_brains(tasks, session_log, sandbox_mgr, max_in_flight=2):
         icon = "✓" if r.get("ok") else "✗"
         print(f"\n  {icon} [{r['session_id'][:8]}] {r['task'][:55]}")
         if r.get("ok"):
@@ -322,7 +323,15 @@ def main() -> None:
         )
 
     target = run_all if args.mode == "all" else DEMOS[args.mode]
-    asyncio.run(target())
+
+    async def _run() -> None:
+        try:
+            await target()
+        finally:
+            await sandbox_mgr.aclose()
+            await close_foundry_clients()
+
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""HarnessPool instances sharing one SQLite session log (one pool per host)."""
+
+from __future__ import annotations
+
+import asyncio
+
+from maf_harness.hosting.harness_pool import HarnessPool
+from maf_harness.session.backends import SqliteBackend
+from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
+
+
+class FakeHarness:
+    """Stands in for AgentHarness: one event per turn, SESSION_END on shutdown."""
+
+    def __init__(self, log: SessionLog) -> None:
+        self.log        = log
+        self.session_id = ""
+        self.shut_down  = False
+
+    async def start(self, session_id: str) -> None:
+        self.session_id = session_id
+
+    async def run(self, text: str) -> None:
+        await self.log.emit_event(
+            self.session_id,
+            SessionEvent(kind=EventKind.AGENT_RESPONSE, payload={"text": text}),
+        )
+
+    async def shutdown(self) -> None:
+        self.shut_down = True
+        await self.log.emit_event(
+            self.session_id,
+            SessionEvent(kind=EventKind.SESSION_END, payload={"graceful": True}),
+        )
+
+
+def test_turn_on_another_instance_rebuilds_and_retires_stale_harness(tmp_path):
+    async def run() -> None:
+        path         = str(tmp_path / "sessions.db")
+        log_a, log_b = SessionLog(SqliteBackend(path)), SessionLog(SqliteBackend(path))
+        built: list[FakeHarness] = []
+
+        def factory(log: SessionLog):
+            def make() -> FakeHarness:
+                built.append(FakeHarness(log))
+                return built[-1]
+            return make
+
+        pool_a = HarnessPool(factory(log_a), session_log=log_a)
+        pool_b = HarnessPool(factory(log_b), session_log=log_b)
+        try:
+            sid = await log_a.create_session("task")
+
+            async with pool_a.lease(sid) as harness:
+                await harness.run("turn 1")
+            first = built[0]
+            async with pool_b.lease(sid) as harness:
+                await harness.run("turn 2")
+
+            # pool_a's warm harness missed turn 2: shut down, then rebuilt.
+            async with pool_a.lease(sid) as harness:
+                assert harness is not first
+                assert first.shut_down
+                await harness.run("turn 3")
+            assert pool_a.stats()["stale"] == 1
+
+            # Nothing happened elsewhere since, so the rebuilt harness stays warm.
+            async with pool_a.lease(sid) as again:
+                assert again is harness
+            assert pool_a.stats()["hits"] == 1
+
+            kinds = [e.kind for e in await log_b.get_events(sid)]
+            assert kinds == [
+                EventKind.SESSION_START,
+                EventKind.AGENT_RESPONSE,
+                EventKind.AGENT_RESPONSE,
+                EventKind.SESSION_END,
+                EventKind.AGENT_RESPONSE,
+            ]
+        finally:
+            await pool_a.aclose()
+            await pool_b.aclose()
+            await log_a.close()
+            await log_b.close()
+
+    asyncio.run(run())
@@ -0,0 +1,61 @@
+"""SqliteBackend shared by several SessionLog instances (one per host process)."""
+
+from __future__ import annotations
+
+import asyncio
+
+from maf_harness.session.backends import SqliteBackend
+from maf_harness.session.session_log import EventKind, SessionEvent, SessionLog
+
+
+def _event(n: int) -> SessionEvent:
+    return SessionEvent(kind=EventKind.USER_INPUT, payload={"n": n})
+
+
+def test_instances_see_each_others_appends(tmp_path):
+    async def run() -> None:
+        path = str(tmp_path / "sessions.db")
+        a, b = SessionLog(SqliteBackend(path)), SessionLog(SqliteBackend(path))
+        try:
+            sid = await a.create_session("task")
+            for n in range(3):
+                await a.emit_event(sid, _event(n))
+            assert await a.event_count(sid) == 4
+
+            for n in range(3, 7):
+                await b.emit_event(sid, _event(n))
+
+            assert await a.event_count(sid) == 8
+            assert await b.event_count(sid) == 8
+            events = await a.get_events(sid)
+            assert [e.payload.get("n") for e in events] == [None, 0, 1, 2, 3, 4, 5, 6]
+            assert [e.payload["n"] for e in await a.get_events(sid, -2)] == [5, 6]
+            assert [e.payload["n"] for e in await a.get_events(sid, 4, 6)] == [3, 4]
+
+            _, replay = await a.wake(sid)
+            assert len(replay) == 8
+        finally:
+            await a.close()
+            await b.close()
+
+    asyncio.run(run())
+
+
+def test_concurrent_appends_from_two_instances_stay_contiguous(tmp_path):
+    async def run() -> None:
+        path = str(tmp_path / "sessions.db")
+        a, b = SqliteBackend(path), SqliteBackend(path)
+        try:
+            await a.create_session("s")
+            await asyncio.gather(
+                *(a.append("s", _event(n)) for n in range(20)),
+                *(b.append("s", _event(n)) for n in range(20, 40)),
+            )
+            assert await a.count("s") == await b.count("s") == 40
+            events = await b.read("s")
+            assert sorted(e.payload["n"] for e in events) == list(range(40))
+        finally:
+            await a.close()
+            await b.close()
+
+    asyncio.run(run())
@@ -0,0 +1,111 @@
+"""Harness spans and subprocess trace propagation, exported in memory."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from maf_harness.harness import harness as harness_module
+from maf_harness.harness.harness import AgentHarness
+from maf_harness.middleware import telemetry
+from maf_harness.sandbox.python_pool import WarmPythonPool
+from maf_harness.sandbox.sandbox import SandboxManager, SandboxResources, VaultStore
+from maf_harness.session.session_log import SessionLog
+
+
+class FakeAgent:
+    """Replaces the Foundry-backed Agent: answers every turn locally."""
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+
+    async def run(self, text: str) -> str:
+        return f"echo: {text}"
+
+
+@pytest.fixture
+def otel():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    reader   = InMemoryMetricReader()
+    telemetry.configure_telemetry(
+        tracer_provider=provider,
+        meter_provider=MeterProvider(metric_readers=[reader]),
+    )
+    yield exporter, reader
+    telemetry.disable_telemetry()
+
+
+def test_disabled_telemetry_is_a_noop():
+    assert not telemetry.enabled()
+    with telemetry.span("agent.run", session_id="s") as s:
+        s.set_attribute("events", 1)
+    assert telemetry.subprocess_env(None) is None
+    assert telemetry.subprocess_env({"A": "1"}) == {"A": "1"}
+
+
+def test_harness_operations_emit_spans(otel, monkeypatch):
+    exporter, reader = otel
+    monkeypatch.setattr(harness_module, "Agent", FakeAgent)
+
+    async def run() -> None:
+        log = SessionLog()
+        mgr = SandboxManager(VaultStore(), python_pool=WarmPythonPool(size=0))
+        try:
+            harness = AgentHarness(log, mgr, client=object())
+            sid     = await log.create_session("task")
+            await harness.start(sid)
+            assert await harness.run("hello") == "echo: hello"
+            sandbox_id = await mgr.provision(SandboxResources(allowed_tools=["web_search"]))
+            await mgr.execute(sandbox_id, "web_search", "otel")
+        finally:
+            await mgr.aclose()
+
+    asyncio.run(run())
+
+    names = {s.name for s in exporter.get_finished_spans()}
+    assert {"harness.wake", "agent.run", "sandbox.provision", "sandbox.execute", "session.emit"} <= names
+    wake = next(s for s in exporter.get_finished_spans() if s.name == "harness.wake")
+    assert wake.attributes["events"] >= 1
+
+    metrics = reader.get_metrics_data()
+    recorded = {
+        point.attributes["op"]
+        for rm in metrics.resource_metrics
+        for sm in rm.scope_metrics
+        for metric in sm.metrics if metric.name == "maf_harness.operation.duration"
+        for point in metric.data.data_points
+    }
+    assert {"harness.wake", "agent.run", "sandbox.execute", "session.emit"} <= recorded
+
+
+def test_run_python_subprocess_resumes_the_trace(otel):
+    exporter, _ = otel
+    code = "import os; print(os.environ.get('TRACEPARENT', ''))"
+
+    async def run() -> str:
+        mgr = SandboxManager(VaultStore(), python_pool=WarmPythonPool(size=0))
+        try:
+            sandbox_id = await mgr.provision(SandboxResources(allowed_tools=["run_python"]))
+            return await mgr.execute(sandbox_id, "run_python", code)
+        finally:
+            await mgr.aclose()
+
+    traceparent = asyncio.run(run()).strip()
+
+    execute = next(s for s in exporter.get_finished_spans() if s.name == "sandbox.execute")
+    version, trace_id, parent_id, _flags = traceparent.split("-")
+    assert version == "00"
+    assert int(trace_id, 16) == execute.context.trace_id
+    assert int(parent_id, 16) == execute.context.span_id
+
+    child = trace.get_current_span(telemetry.context_from_env({"TRACEPARENT": traceparent}))
+    assert child.get_span_context().trace_id == execute.context.trace_id
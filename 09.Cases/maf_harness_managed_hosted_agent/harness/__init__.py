@@ -1,5 +1,6 @@
 """Managed-agent style harness: session + sandbox + vault interfaces."""
 from .session import SessionStore, SessionEvent
+from .python_pool import WarmPythonPool
 from .sandbox import SandboxPool, SandboxError
 from .vault import CredentialVault
 
@@ -9,4 +10,5 @@ __all__ = [
     "SandboxPool",
     "SandboxError",
     "CredentialVault",
+    "WarmPythonPool",
 ]
@@ -0,0 +1,197 @@
+"""Warm interpreter pool for the python_exec hand.
+
+`subprocess.run([python, "-c", code])` pays interpreter startup plus every heavy
+import (numpy, pandas, ...) on each call. `WarmPythonPool` keeps `size`
+interpreters already started, with the `preload` modules imported, blocked on
+stdin until a job arrives:
+
+- job: one JSON line on the worker's stdin, then stdin is closed
+  (`{"code": ..., "cpu_sec": ..., "memory_mb": ...}`)
+- result: the job's own stdout / stderr and exit code
+
+Sandbox isolation is kept: a worker runs exactly one job and exits. A
+background thread refills the pool after each job; when it is empty the job
+runs on a cold worker started on demand. The worker applies RLIMIT_CPU (a
+backstop for the wall-clock timeout) and RLIMIT_AS (`memory_mb`) after its
+preloads and before the job's code runs.
+"""
+from __future__ import annotations
+
+import json
+import math
+import subprocess
+import sys
+import threading
+from collections import deque
+from typing import Iterable
+
+# Workers (and other sandbox processes) get no secrets from the host environment.
+SANDBOX_ENV = {"PATH": "/usr/local/bin:/usr/bin:/bin"}
+
+# Runs as `python -c _WORKER <preload...>`; the job gets a fresh namespace and
+# `sys.argv == ["-c"]`, exactly as under `python -c`.
+_WORKER = r"""
+import sys
+for _name in sys.argv[1:]:
+    try:
+        __import__(_name)
+    except Exception:
+        pass
+import json, os
+_line = sys.stdin.readline()
+if not _line:
+    os._exit(0)
+_job = json.loads(_line)
+try:
+    import resource
+    if _job.get("cpu_sec"):
+        resource.setrlimit(resource.RLIMIT_CPU, (_job["cpu_sec"], _job["cpu_sec"] + 1))
+    if _job.get("memory_mb"):
+        _bytes = _job["memory_mb"] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (_bytes, _bytes))
+except (ImportError, ValueError, OSError):
+    pass
+sys.argv = ["-c"]
+_code = 0
+try:
+    exec(compile(_job["code"], "<string>", "exec"), {"__name__": "__main__"})
+except SystemExit as _exc:
+    if _exc.code is None or isinstance(_exc.code, int):
+        _code = _exc.code or 0
+    else:
+        print(_exc.code, file=sys.stderr)
+        _code = 1
+except BaseException as _exc:
+    import traceback
+    traceback.print_exception(type(_exc), _exc, _exc.__traceback__.tb_next)
+    _code = 1
+# Do what interpreter shutdown does that the job can observe (join threads, run
+# atexit, flush) without tearing down every preloaded module.
+import atexit, threading
+for _t in threading.enumerate():
+    if _t is not threading.main_thread() and not _t.daemon:
+        _t.join()
+atexit._run_exitfuncs()
+sys.stdout.flush()
+sys.stderr.flush()
+os._exit(_code)
+"""
+
+
+class WarmPythonPool:
+    def __init__(
+        self,
+        size: int = 2,
+        preload: Iterable[str] = (),
+        python: str = sys.executable,
+        env: dict[str, str] | None = SANDBOX_ENV,
+        memory_mb: int | None = None,
+    ) -> None:
+        self.size = size
+        self.preload = tuple(preload)
+        self.python = python
+        self.memory_mb = memory_mb
+        self._env = env
+        self._idle: deque[subprocess.Popen] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._stats = {"warm_hits": 0, "cold_starts": 0, "spawned": 0, "timeouts": 0}
+        self._refiller = threading.Thread(target=self._refill_loop, name="python-pool", daemon=True)
+        self._refiller.start()
+        self._wake.set()  # initial fill
+
+    def run(
+        self, code: str, timeout: float = 15.0, memory_mb: int | None = None
+    ) -> subprocess.CompletedProcess:
+        """Run `code` on a warm worker. Raises subprocess.TimeoutExpired on timeout."""
+        proc = self._take_idle()
+        if proc is None:
+            self._count("cold_starts")
+            proc = self._spawn()
+        else:
+            self._count("warm_hits")
+        job = json.dumps({
+            "code": code,
+            "cpu_sec": math.ceil(timeout) + 1,
+            "memory_mb": memory_mb if memory_mb is not None else self.memory_mb,
+        }) + "\n"
+        try:
+            out, err = proc.communicate(job.encode(), timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._count("timeouts")
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            self._wake.set()  # refill after the job, not while it competes for CPU
+        return subprocess.CompletedProcess(
+            proc.args,
+            proc.returncode,
+            out.decode(errors="replace"),
+            err.decode(errors="replace"),
+        )
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for proc in idle:
+            proc.kill()
+            proc.wait()
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = self._stats["warm_hits"] + self._stats["cold_starts"]
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "preload": list(self.preload),
+                **self._stats,
+                "hit_rate": round(self._stats["warm_hits"] / jobs, 3) if jobs else 0.0,
+            }
+
+    # ---------- internals ----------
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _take_idle(self) -> subprocess.Popen | None:
+        with self._lock:
+            while self._idle:
+                proc = self._idle.popleft()
+                if proc.poll() is None:
+                    return proc
+        return None
+
+    def _spawn(self) -> subprocess.Popen:
+        self._count("spawned")
+        return subprocess.Popen(
+            [self.python, "-c", _WORKER, *self.preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._env,
+        )
+
+    def _refill_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while not self._closed:
+                with self._lock:
+                    if len(self._idle) >= self.size:
+                        break
+                try:
+                    proc = self._spawn()
+                except OSError:
+                    break  # keep serving cold; retry after the next job
+                with self._lock:
+                    if not self._closed:
+                        self._idle.append(proc)
+                        continue
+                proc.kill()
+                proc.wait()
+            if self._closed:
+                return
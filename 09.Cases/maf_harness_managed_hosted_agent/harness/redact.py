@@ -0,0 +1,116 @@
+"""Single-pass secret redaction.
+
+`CredentialVault.redact` used to run one `str.replace` per stored secret over
+every tool output. `Redactor` compiles all secrets into one prefix-trie regex
+instead, so a 1 MB output is scanned once regardless of how many secrets the
+vault holds:
+
+- The trie regex is equivalent to `secret_1|secret_2|...` (longest match wins)
+  but shares common prefixes, so each position is tried against the trie, not
+  against every secret.
+- A secret can only occur inside a run of characters that secrets are made of,
+  at least as long as the shortest secret. The trie runs only inside such runs;
+  everything else is skipped by one character-class scan.
+
+`StreamRedactor` applies the same matcher to streamed chunks, holding back only
+the tail that could still be the start of a secret.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+MASK = "***REDACTED***"
+
+
+def _trie_pattern(words: list[str]) -> str:
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _char_class(chars: set[str]) -> str:
+    """Regex character class for `chars`, collapsed into ranges (a-z scans faster than abc…z)."""
+    codes, parts, i = sorted(map(ord, chars)), [], 0
+    while i < len(codes):
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+            j += 1
+        lo, hi = re.escape(chr(codes[i])), re.escape(chr(codes[j]))
+        parts.append(lo if i == j else f"{lo}-{hi}" if j > i + 1 else lo + hi)
+        i = j + 1
+    return "[" + "".join(parts) + "]"
+
+
+class Redactor:
+    def __init__(self, secrets: Iterable[str] = (), mask: str = MASK) -> None:
+        secrets = sorted({s for s in secrets if s})
+        self.mask = mask
+        self.max_len = max((len(s) for s in secrets), default=0)
+        self._secret_re: re.Pattern[str] | None = None
+        self._run_re: re.Pattern[str] | None = None
+        if secrets:
+            charset = _char_class(set("".join(secrets)))
+            self._secret_re = re.compile(_trie_pattern(secrets))
+            self._run_re = re.compile(f"{charset}{{{min(len(s) for s in secrets)},}}")
+
+    def _spans(self, text: str) -> list[tuple[int, int]]:
+        if self._secret_re is None:
+            return []
+        return [
+            m.span()
+            for run in self._run_re.finditer(text)
+            for m in self._secret_re.finditer(text, run.start(), run.end())
+        ]
+
+    def _apply(self, text: str, spans: list[tuple[int, int]], upto: int) -> str:
+        out, pos = [], 0
+        for start, end in spans:
+            out.append(text[pos:start])
+            out.append(self.mask)
+            pos = end
+        out.append(text[pos:upto])
+        return "".join(out)
+
+    def redact(self, text: str) -> str:
+        spans = self._spans(text)
+        return self._apply(text, spans, len(text)) if spans else text
+
+    def stream(self) -> StreamRedactor:
+        return StreamRedactor(self)
+
+
+class StreamRedactor:
+    """Incremental redaction: `feed()` each chunk, then `flush()` once at the end."""
+
+    def __init__(self, redactor: Redactor) -> None:
+        self._r = redactor
+        self._carry = ""
+
+    def feed(self, chunk: str) -> str:
+        text = self._carry + chunk
+        cut = max(0, len(text) - (self._r.max_len - 1))
+        done = []
+        for start, end in self._r._spans(text):
+            if start >= cut:
+                break
+            done.append((start, end))
+            cut = max(cut, end)  # a complete match straddling the cut
+        self._carry = text[cut:]
+        return self._r._apply(text, done, cut)
+
+    def flush(self) -> str:
+        text, self._carry = self._carry, ""
+        return self._r.redact(text)
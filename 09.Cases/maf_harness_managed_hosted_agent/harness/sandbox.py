@@ -8,19 +8,29 @@ Managed-agent principles:
   remote container.
 - Security boundary: the sandbox never sees raw credentials. The vault
   (held by the harness) injects auth at call time via a proxy.
+- Off the event loop: the built-in hands block (subprocess, urlopen), so the
+  async `execute` runs them on a bounded thread pool with a timeout. One slow
+  call then holds one worker thread instead of freezing every session on the
+  Responses host.
 """
 from __future__ import annotations
 
+import asyncio
 import io
 import json
 import contextlib
 import subprocess
 import sys
+import threading
 import time
 import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Callable
 
+from .python_pool import SANDBOX_ENV, WarmPythonPool
 from .vault import CredentialVault
 
 
@@ -42,11 +52,23 @@ ToolFn = Callable[[dict[str, Any], CredentialVault], str]
 class SandboxPool:
     """Lazy, cattle-style sandbox pool with a generic execute() interface."""
 
-    def __init__(self, vault: CredentialVault, max_output_chars: int = 8000) -> None:
+    def __init__(
+        self,
+        vault: CredentialVault,
+        max_output_chars: int = 8000,
+        python_pool: WarmPythonPool | None = None,
+        max_workers: int = 8,
+        timeout_sec: float = 30.0,
+    ) -> None:
         self._vault = vault
         self._max_output = max_output_chars
+        self._python_pool = python_pool or WarmPythonPool()
         self._tools: dict[str, ToolFn] = {}
         self._active: dict[str, _Sandbox] = {}
+        self._active_lock = threading.Lock()  # provision/retire run on worker threads
+        self.timeout_sec = timeout_sec
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sandbox")
+        self._stats = {"calls": 0, "timeouts": 0, "cancelled": 0}
         self._register_builtins()
 
     # ---------- registration ----------
@@ -58,18 +80,45 @@ class SandboxPool:
 
     # ---------- provisioning (cattle) ----------
     def provision(self, kind: str) -> str:
-        sid = f"{kind}-{int(time.time() * 1000)}"
-        self._active[sid] = _Sandbox(kind=kind, sandbox_id=sid, created_at=time.time())
+        sid = f"{kind}-{uuid.uuid4().hex}"
+        sandbox = _Sandbox(kind=kind, sandbox_id=sid, created_at=time.time())
+        with self._active_lock:
+            self._active[sid] = sandbox
         return sid
 
     def retire(self, sandbox_id: str) -> None:
-        self._active.pop(sandbox_id, None)
+        with self._active_lock:
+            self._active.pop(sandbox_id, None)
 
     # ---------- the ONE interface the brain calls ----------
-    def execute(self, name: str, input: dict[str, Any]) -> str:
-        """execute(name, input) -> string.
+    async def execute(
+        self, name: str, input: dict[str, Any], timeout: float | None = None
+    ) -> str:
+        """execute(name, input) -> string, without blocking the event loop.
+
+        This is the only contract between the brain and the hands. The call
+        runs on the pool's worker threads; `timeout` (default `timeout_sec`)
+        covers queueing plus execution. On timeout the brain gets an error
+        right away; the abandoned thread finishes on its tool's own timeout
+        (15s for the built-ins). A call cancelled before a worker picks it up
+        never runs.
+        """
+        timeout = self.timeout_sec if timeout is None else timeout
+        self._stats["calls"] += 1
+        future = self._executor.submit(self.execute_sync, name, input)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            return f"ERROR: '{name}' timed out after {timeout:g}s"
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            future.cancel()
+            raise
+
+    def execute_sync(self, name: str, input: dict[str, Any]) -> str:
+        """Blocking execute(name, input) -> string, run on the caller's thread.
 
-        This is the only contract between the brain and the hands.
         Failures are returned as errors (not raised up the harness) so the
         brain can decide whether to retry on a fresh sandbox.
         """
@@ -84,22 +133,37 @@ class SandboxPool:
                 out = out[: self._max_output] + f"\n...[truncated {len(out) - self._max_output} chars]"
             return out
         except Exception as e:  # sandbox failed -> becomes a tool error
-            return f"ERROR: sandbox '{sandbox_id}' failed: {type(e).__name__}: {e}"
+            return self._vault.redact(f"ERROR: sandbox '{sandbox_id}' failed: {type(e).__name__}: {e}")
         finally:
             # Cattle: always retire the sandbox after a single call.
             self.retire(sandbox_id)
 
+    def stats(self) -> dict[str, Any]:
+        with self._active_lock:
+            active = len(self._active)
+        return {
+            **self._stats,
+            "active": active,
+            "queued": self._executor._work_queue.qsize(),
+        }
+
+    def close(self) -> None:
+        """Stop accepting calls and drop queued ones; running calls finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._python_pool.close()
+
     # ---------- built-in hands ----------
     def _register_builtins(self) -> None:
-        self.register("python_exec", _python_exec)
+        self.register("python_exec", partial(_python_exec, pool=self._python_pool))
         self.register("shell_exec", _shell_exec)
         self.register("http_fetch", _http_fetch)
 
 
 # --- Built-in tool implementations ------------------------------------------
 
-def _python_exec(input: dict[str, Any], vault: CredentialVault) -> str:
-    """Run a short snippet of Python in an isolated sandbox process.
+
+def _python_exec(input: dict[str, Any], vault: CredentialVault, pool: WarmPythonPool) -> str:
+    """Run a short snippet of Python in an isolated, single-use sandbox process.
 
     Input: {"code": "print(1+1)"}
     """
@@ -107,16 +171,10 @@ def _python_exec(input: dict[str, Any], vault: CredentialVault) -> str:
     if not code:
         return "ERROR: 'code' is required."
 
-    # Use sys.executable so this works in conda/venv envs where `python`
-    # may not be on PATH (only `python3` is).
+    # The pool's workers run sys.executable (works in conda/venv envs where
+    # `python` may not be on PATH) with SANDBOX_ENV, so no secrets leak.
     try:
-        proc = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            timeout=15,
-            env={"PATH": "/usr/local/bin:/usr/bin:/bin"},  # no secrets leaked
-        )
+        proc = pool.run(code, timeout=15)
     except subprocess.TimeoutExpired:
         raise SandboxError("python_exec timed out after 15s")
 
@@ -138,7 +196,7 @@ def _shell_exec(input: dict[str, Any], vault: CredentialVault) -> str:
             capture_output=True,
             text=True,
             timeout=15,
-            env={"PATH": "/usr/local/bin:/usr/bin:/bin"},
+            env=SANDBOX_ENV,
         )
     except FileNotFoundError:
         raise SandboxError(f"command not found: {argv[0]}")
@@ -4,22 +4,81 @@ Implements the Managed Agents "session" interface:
 - emit_event(session_id, event): append a durable record
 - get_events(session_id, start, end): positional slice of the log
 - get_session(session_id): metadata + event count
+- follow(session_id, from_index): async iterator that tails the log
 
 The session is NOT the model's context window. The harness is free to
 transform, filter, or summarize events before passing them to the model.
 If the harness crashes, a new one can `wake(session_id)` and resume from
 the last event.
+
+On disk every session is two files:
+- `<id>.jsonl`: the log itself, one JSON event per line (source of truth)
+- `<id>.idx`:   sidecar offset index, one fixed-width little-endian u64 per
+                event holding the byte offset of that event's line
+
+The index makes appends O(1) (no rescan to find the next event index) and
+lets `get_events(start, end)` seek straight to the byte range it needs. It
+is derived data: if it is missing, truncated, or behind the log after a
+crash, the writing process rebuilds it (and drops a torn final line) the
+first time it writes to the session. Readers never modify either file: they
+ignore an incomplete last line and index any unindexed lines in memory.
+
+Writes are group-committed: `emit_event` assigns the event its index and
+queues it; a single writer thread keeps the files open and turns everything
+queued within a short window into one `write` (+ optional `fsync`) per
+session. The `durability` knob decides when callers get their event back:
+
+- "none":  immediately after queueing (a crash can lose the open window)
+- "flush": once the batch is written to the OS (survives a process crash)
+- "fsync": once the batch is fsynced (survives power loss)
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import ctypes
 import json
 import os
+import queue
+import struct
+import threading
 import time
 import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from threading import Lock
-from typing import Any
+from typing import Any, AsyncIterator, BinaryIO, Literal
+
+Durability = Literal["none", "flush", "fsync"]
+
+# One index record per event: byte offset of the event's line in the log.
+_OFFSET = struct.Struct("<Q")
+
+# Stores still open at interpreter exit get their queued events drained by one
+# atexit hook, registered while any store is open. The set holds them weakly.
+_open_stores: "weakref.WeakSet[SessionStore]" = weakref.WeakSet()
+_open_stores_lock = Lock()
+
+
+def _close_open_stores() -> None:
+    for store in list(_open_stores):
+        store.close()
+
+
+def _track_store(store: "SessionStore", open_: bool) -> None:
+    with _open_stores_lock:
+        was_empty = not _open_stores
+        if open_:
+            _open_stores.add(store)
+        else:
+            _open_stores.discard(store)
+        if was_empty and _open_stores:
+            atexit.register(_close_open_stores)
+        elif not was_empty and not _open_stores:
+            atexit.unregister(_close_open_stores)
 
 
 @dataclass
@@ -34,19 +93,205 @@ class SessionEvent:
         return json.dumps(asdict(self))
 
 
+@dataclass
+class _IndexState:
+    """In-memory view of a session's sidecar index."""
+    count: int          # events assigned an index (written or still queued)
+    end: int            # log size once every queued event is written
+    written: int = -1   # events on disk and visible to readers
+    written_end: int = -1
+    writable: bool = False  # loaded (and repaired) by the writing process
+    indexed: int = -1   # events covered by the on-disk index ...
+    extra: list[int] = field(default_factory=list)  # ... offsets of the rest (readers only)
+
+    def __post_init__(self) -> None:
+        if self.written < 0:
+            self.written, self.written_end = self.count, self.end
+        if self.indexed < 0:
+            self.indexed = self.count - len(self.extra)
+
+
+@dataclass
+class _Pending:
+    session_id: str
+    event: SessionEvent
+    line: bytes
+    offset: int
+    state: _IndexState
+    future: Future
+
+
+class _GroupCommitWriter:
+    """Single background thread that batches appends across all sessions.
+
+    Keeps a bounded LRU of open (log, index) handles so steady-state appends
+    never reopen files.
+    """
+
+    def __init__(
+        self,
+        store: "SessionStore",
+        durability: Durability,
+        window_sec: float,
+        max_batch: int,
+        max_open_files: int = 128,
+    ) -> None:
+        self._store = store
+        self._durability = durability
+        self._window = window_sec
+        self._max_batch = max_batch
+        self._max_open = max_open_files
+        self._queue: queue.Queue[_Pending | Future | None] = queue.Queue()
+        self._handles: OrderedDict[str, tuple[BinaryIO, BinaryIO]] = OrderedDict()
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: _Pending) -> None:
+        self._queue.put(item)
+
+    def barrier(self) -> None:
+        """Block until everything queued before this call is on disk."""
+        fut: Future = Future()
+        self._queue.put(fut)
+        fut.result()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # ---- writer thread ----
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._commit(batch)
+                    self._close_handles()
+                    return
+                batch.append(nxt)
+            self._commit(batch)
+        self._close_handles()
+
+    def _commit(self, batch: list[_Pending | Future]) -> None:
+        by_session: dict[str, list[_Pending]] = {}
+        barriers: list[Future] = []
+        for item in batch:
+            if isinstance(item, _Pending):
+                by_session.setdefault(item.session_id, []).append(item)
+            else:
+                barriers.append(item)
+
+        for sid, items in by_session.items():
+            try:
+                log_f, idx_f = self._open(sid)
+                # Log first, index second: a crash in between leaves the index
+                # behind the log, which _load_index() repairs on the next load.
+                log_f.write(b"".join(p.line for p in items))
+                log_f.flush()
+                idx_f.write(b"".join(_OFFSET.pack(p.offset) for p in items))
+                idx_f.flush()
+                if self._durability == "fsync":
+                    os.fsync(log_f.fileno())
+                    os.fsync(idx_f.fileno())
+            except Exception as exc:
+                # Queued offsets for this session can no longer be trusted;
+                # force a reload from disk on next use.
+                self._drop(sid)
+                self._store._invalidate(sid)
+                for p in items:
+                    if not p.future.done():
+                        p.future.set_exception(exc)
+                continue
+            state = items[-1].state
+            with self._store._lock_for(sid):
+                state.written = items[-1].event.index + 1
+                state.written_end = items[-1].offset + len(items[-1].line)
+                state.indexed = state.written
+            for p in items:
+                if not p.future.done():
+                    p.future.set_result(p.event)
+
+        for fut in barriers:
+            fut.set_result(None)
+
+    def _open(self, session_id: str) -> tuple[BinaryIO, BinaryIO]:
+        handles = self._handles.get(session_id)
+        if handles is not None:
+            self._handles.move_to_end(session_id)
+            return handles
+        handles = (
+            self._store._log_path(session_id).open("ab"),
+            self._store._index_path(session_id).open("ab"),
+        )
+        self._handles[session_id] = handles
+        while len(self._handles) > self._max_open:
+            self._drop(next(iter(self._handles)))
+        return handles
+
+    def _drop(self, session_id: str) -> None:
+        for f in self._handles.pop(session_id, ()):
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def _close_handles(self) -> None:
+        for sid in list(self._handles):
+            self._drop(sid)
+
+
 class SessionStore:
-    """File-backed append-only event log. Swappable with any durable store."""
+    """File-backed append-only event log. Swappable with any durable store.
+
+    durability:      "none" | "flush" | "fsync" (see module docstring)
+    batch_window_ms: how long the writer waits to coalesce more events;
+                     0 commits whatever is already queued straight away
+    max_batch:       commit early once this many events are queued
+    """
 
-    def __init__(self, root_dir: str | os.PathLike[str] = "/tmp/sessions") -> None:
+    def __init__(
+        self,
+        root_dir: str | os.PathLike[str] = "/tmp/sessions",
+        durability: Durability = "flush",
+        batch_window_ms: float = 2.0,
+        max_batch: int = 64,
+    ) -> None:
+        if durability not in ("none", "flush", "fsync"):
+            raise ValueError(f"unknown durability level: {durability!r}")
         self._root = Path(root_dir)
         self._root.mkdir(parents=True, exist_ok=True)
         self._locks: dict[str, Lock] = {}
+        self._index: dict[str, _IndexState] = {}
         self._global_lock = Lock()
+        self._durability = durability
+        self._writer = _GroupCommitWriter(self, durability, batch_window_ms / 1000, max_batch)
+        _track_store(self, True)
+
+    def close(self) -> None:
+        """Drain queued events and close open file handles."""
+        self._writer.close()
+        _track_store(self, False)
+
+    def flush(self) -> None:
+        """Block until every event emitted so far is written."""
+        self._writer.barrier()
 
     # ---- lifecycle ----
     def create_session(self, session_id: str | None = None) -> str:
         sid = session_id or str(uuid.uuid4())
         self._log_path(sid).touch(exist_ok=True)
+        with self._lock_for(sid):
+            self._state(sid, write=True)
         return sid
 
     def wake(self, session_id: str) -> list[SessionEvent]:
@@ -55,18 +300,46 @@ class SessionStore:
 
     # ---- writes ----
     def emit_event(self, session_id: str, type: str, payload: dict[str, Any]) -> SessionEvent:
-        lock = self._lock_for(session_id)
-        with lock:
-            existing = self._count(session_id)
+        event, future = self._enqueue(session_id, type, payload)
+        if self._durability != "none":
+            future.result()
+        return event
+
+    async def aemit_event(
+        self, session_id: str, type: str, payload: dict[str, Any]
+    ) -> SessionEvent:
+        """emit_event for coroutines: waits for the group commit without blocking the loop."""
+        event, future = self._enqueue(session_id, type, payload)
+        if self._durability != "none":
+            await asyncio.wrap_future(future)
+        return event
+
+    def submit_event(self, session_id: str, type: str, payload: dict[str, Any]) -> Future:
+        """Queue an event without waiting for the disk.
+
+        The returned future resolves to the SessionEvent (index already
+        assigned) once its batch has been written.
+        """
+        return self._enqueue(session_id, type, payload)[1]
+
+    def _enqueue(
+        self, session_id: str, type: str, payload: dict[str, Any]
+    ) -> tuple[SessionEvent, Future]:
+        with self._lock_for(session_id):
+            state = self._state(session_id, write=True)
             event = SessionEvent(
-                index=existing,
+                index=state.count,
                 session_id=session_id,
                 type=type,
                 payload=payload,
             )
-            with self._log_path(session_id).open("a", encoding="utf-8") as f:
-                f.write(event.to_json() + "\n")
-            return event
+            line = (event.to_json() + "\n").encode("utf-8")
+            future: Future = Future()
+            # Enqueue under the session lock so queue order == index order.
+            self._writer.submit(_Pending(session_id, event, line, state.end, state, future))
+            state.count += 1
+            state.end += len(line)
+            return event, future
 
     # ---- reads ----
     def get_events(
@@ -75,25 +348,66 @@ class SessionStore:
         start: int = 0,
         end: int | None = None,
     ) -> list[SessionEvent]:
-        path = self._log_path(session_id)
-        if not path.exists():
+        if not self._log_path(session_id).exists():
             return []
-        events: list[SessionEvent] = []
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
+        with self._lock_for(session_id):
+            state = self._state(session_id)
+            behind = state.written < state.count
+        if behind:
+            # Read-your-writes: let the writer catch up before slicing.
+            self.flush()
+        with self._lock_for(session_id):
+            state = self._state(session_id)
+            # Same semantics as list slicing (negative / out-of-range bounds).
+            lo, hi, _ = slice(start, end).indices(state.written)
+            if lo >= hi:
+                return []
+            first = self._read_offset(session_id, lo)
+            last = state.written_end if hi == state.written else self._read_offset(session_id, hi)
+            with self._log_path(session_id).open("rb") as f:
+                f.seek(first)
+                chunk = f.read(last - first)
+        return [
+            SessionEvent(**json.loads(line))
+            for line in chunk.decode("utf-8").splitlines()
+            if line.strip()
+        ]
+
+    async def follow(
+        self,
+        session_id: str,
+        from_index: int = 0,
+        poll_interval: float = 0.5,
+    ) -> AsyncIterator[SessionEvent]:
+        """Yield events from `from_index` on, then each new one as it lands.
+
+        Wakes on inotify where available (Linux) and otherwise polls every
+        `poll_interval` seconds. Appends by another process sharing the
+        directory are picked up too. Runs until the consumer stops iterating.
+        """
+        watcher = _FileWatcher(self._log_path(session_id), poll_interval)
+        next_index = from_index
+        try:
+            while True:
+                events = await asyncio.to_thread(self.get_events, session_id, next_index)
+                if events:
+                    next_index = events[-1].index + 1
+                    for event in events:
+                        yield event
                     continue
-                data = json.loads(line)
-                events.append(SessionEvent(**data))
-        return events[start:end]
+                await watcher.wait()
+                self._refresh_if_grown(session_id)
+        finally:
+            watcher.close()
 
     def get_session(self, session_id: str) -> dict[str, Any]:
-        events = self.get_events(session_id)
+        last = self.get_events(session_id, start=-1)
+        with self._lock_for(session_id):
+            count = self._state(session_id).written
         return {
             "session_id": session_id,
-            "event_count": len(events),
-            "last_event_ts": events[-1].ts if events else None,
+            "event_count": count,
+            "last_event_ts": last[-1].ts if last else None,
         }
 
     # ---- helpers ----
@@ -101,15 +415,154 @@ class SessionStore:
         safe = session_id.replace("/", "_")
         return self._root / f"{safe}.jsonl"
 
+    def _index_path(self, session_id: str) -> Path:
+        return self._log_path(session_id).with_suffix(".idx")
+
     def _lock_for(self, session_id: str) -> Lock:
         with self._global_lock:
             if session_id not in self._locks:
                 self._locks[session_id] = Lock()
             return self._locks[session_id]
 
-    def _count(self, session_id: str) -> int:
-        path = self._log_path(session_id)
-        if not path.exists():
-            return 0
-        with path.open("rb") as f:
-            return sum(1 for _ in f)
+    def _read_offset(self, session_id: str, i: int) -> int:
+        state = self._index.get(session_id)
+        if state is not None and i >= state.indexed:
+            return state.extra[i - state.indexed]
+        return self._read_index_entry(self._index_path(session_id), i)
+
+    def _refresh_if_grown(self, session_id: str) -> None:
+        """Drop the cached index if another process appended to the log."""
+        with self._lock_for(session_id):
+            state = self._index.get(session_id)
+            if state is None or state.written < state.count:
+                return
+            try:
+                size = self._log_path(session_id).stat().st_size
+            except FileNotFoundError:
+                return
+            if size > state.written_end:
+                self._index.pop(session_id, None)
+
+    def _invalidate(self, session_id: str) -> None:
+        with self._lock_for(session_id):
+            self._index.pop(session_id, None)
+
+    def _state(self, session_id: str, write: bool = False) -> _IndexState:
+        """Return the cached index state, loading it on first use.
+
+        `write=True` is the writing process opening the session: the state is
+        (re)loaded with repair, once. Readers load without touching the files.
+        Caller must hold the session lock.
+        """
+        state = self._index.get(session_id)
+        if state is None or (write and not state.writable):
+            state = self._load_index(session_id, repair=write)
+            self._index[session_id] = state
+        return state
+
+    def _load_index(self, session_id: str, repair: bool) -> _IndexState:
+        log_path = self._log_path(session_id)
+        idx_path = self._index_path(session_id)
+        if not log_path.exists():
+            if repair:
+                idx_path.unlink(missing_ok=True)
+            return _IndexState(count=0, end=0, writable=repair)
+        log_size = log_path.stat().st_size
+
+        # An incomplete final line is not an event: a torn write after a crash,
+        # or, seen from a reader, a line another process is still writing.
+        # Only the writer drops it, so its next append starts on a fresh line.
+        if log_size:
+            with log_path.open("rb+" if repair else "rb") as f:
+                f.seek(log_size - 1)
+                if f.read(1) != b"\n":
+                    f.seek(0)
+                    log_size = f.read(log_size).rfind(b"\n") + 1
+                    if repair:
+                        f.truncate(log_size)
+
+        # Only the tail of the index needs checking, so this stays O(1) for
+        # an intact index regardless of session length.
+        n = idx_path.stat().st_size // _OFFSET.size if idx_path.exists() else 0
+        last_offset = 0
+        while n:
+            last_offset = self._read_index_entry(idx_path, n - 1)
+            if last_offset < log_size:
+                break
+            n -= 1  # entry points past the log (log was truncated)
+
+        # Catch up on lines the index has not seen: either everything (index
+        # missing) or whatever follows the last trusted entry, which is
+        # re-scanned so its line length is known.
+        keep = max(n - 1, 0)
+        scan_from = last_offset if n else 0
+        tail: list[int] = []
+        with log_path.open("rb") as f:
+            f.seek(scan_from)
+            pos = scan_from
+            for line in f:
+                if pos + len(line) > log_size:
+                    break
+                if line.strip():
+                    tail.append(pos)
+                pos += len(line)
+
+        if not repair:
+            return _IndexState(count=keep + len(tail), end=log_size, indexed=keep, extra=tail)
+        with idx_path.open("ab") as f:
+            f.truncate(keep * _OFFSET.size)
+            f.write(b"".join(_OFFSET.pack(o) for o in tail))
+        return _IndexState(count=keep + len(tail), end=log_size, writable=True)
+
+    @staticmethod
+    def _read_index_entry(idx_path: Path, i: int) -> int:
+        with idx_path.open("rb") as f:
+            f.seek(i * _OFFSET.size)
+            return _OFFSET.unpack(f.read(_OFFSET.size))[0]
+
+
+class _FileWatcher:
+    """Wait for a file to change: inotify on Linux, sleep-polling elsewhere."""
+
+    _IN_MODIFY = 0x00000002
+    _IN_NONBLOCK = os.O_NONBLOCK
+    _IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+    def __init__(self, path: Path, poll_interval: float) -> None:
+        self._poll = poll_interval
+        self._fd: int | None = None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+            if fd >= 0:
+                if libc.inotify_add_watch(fd, os.fsencode(path), self._IN_MODIFY) >= 0:
+                    self._fd = fd
+                else:
+                    os.close(fd)
+        except (AttributeError, OSError):
+            pass  # no inotify on this platform -> polling
+
+    async def wait(self) -> None:
+        if self._fd is None:
+            await asyncio.sleep(self._poll)
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(self._fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            # The timeout is a safety net for missed or coalesced notifications.
+            await asyncio.wait_for(ready, timeout=self._poll * 4)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self._fd)
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
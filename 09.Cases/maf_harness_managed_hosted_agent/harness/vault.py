@@ -11,17 +11,21 @@ from __future__ import annotations
 import os
 from typing import Any
 
+from .redact import Redactor, StreamRedactor
+
 
 class CredentialVault:
     def __init__(self, secrets: dict[str, str] | None = None) -> None:
         # In production, back this with Azure Key Vault, Managed Identity,
         # or an MCP OAuth broker. For the demo we read from env vars.
         self._secrets: dict[str, str] = dict(secrets or {})
+        self._redactor: Redactor | None = None  # compiled lazily, dropped on change
 
     def register_env(self, logical_name: str, env_var: str) -> None:
         value = os.getenv(env_var)
-        if value is not None:
+        if value is not None and self._secrets.get(logical_name) != value:
             self._secrets[logical_name] = value
+            self._redactor = None
 
     def resolve(self, logical_name: str) -> str | None:
         """Internal use only — never return raw secrets to the model."""
@@ -39,9 +43,14 @@ class CredentialVault:
             return {}
         return {"Authorization": f"Bearer {token}"}
 
-    def redact(self, value: Any) -> Any:
-        s = str(value)
-        for secret in self._secrets.values():
-            if secret and secret in s:
-                s = s.replace(secret, "***REDACTED***")
-        return s
+    def redactor(self) -> Redactor:
+        if self._redactor is None:
+            self._redactor = Redactor(self._secrets.values())
+        return self._redactor
+
+    def redact(self, value: Any) -> str:
+        return self.redactor().redact(str(value))
+
+    def redact_stream(self) -> StreamRedactor:
+        """Redactor for output that arrives in chunks (e.g. streamed responses)."""
+        return self.redactor().stream()
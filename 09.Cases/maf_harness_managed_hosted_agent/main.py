@@ -34,7 +34,7 @@ from agent_framework.foundry import FoundryChatClient
 from agent_framework_foundry_hosting import ResponsesHostServer
 from azure.identity.aio import DefaultAzureCredential
 
-from harness import SessionStore, SandboxPool, CredentialVault
+from harness import SessionStore, SandboxPool, CredentialVault, WarmPythonPool
 
 # --- Configuration ----------------------------------------------------------
 # Accept either FOUNDRY_PROJECT_ENDPOINT (used by agent_framework.foundry) or
@@ -51,6 +51,17 @@ MODEL_DEPLOYMENT_NAME = (
     or "gpt-4.1-mini"
 )
 SESSION_DIR = os.getenv("SESSION_DIR", "/tmp/sessions")
+# Group-commit durability for the session log: none | flush | fsync.
+SESSION_DURABILITY = os.getenv("SESSION_DURABILITY", "flush")
+SESSION_BATCH_WINDOW_MS = float(os.getenv("SESSION_BATCH_WINDOW_MS", "2"))
+# Warm python_exec interpreters (one job each, refilled in the background) and
+# the modules they import before a job arrives, e.g. "numpy,pandas".
+PYTHON_POOL_SIZE = int(os.getenv("PYTHON_POOL_SIZE", "2"))
+PYTHON_POOL_PRELOAD = [m.strip() for m in os.getenv("PYTHON_POOL_PRELOAD", "").split(",") if m.strip()]
+# Worker threads shared by all sessions for blocking hands, and the per-call
+# timeout the brain waits before getting an ERROR back.
+SANDBOX_MAX_WORKERS = int(os.getenv("SANDBOX_MAX_WORKERS", "8"))
+SANDBOX_TIMEOUT_SEC = float(os.getenv("SANDBOX_TIMEOUT_SEC", "30"))
 
 # Export the canonical names the agent_framework.foundry SDK reads from env,
 # so FoundryChatClient's internal settings loader resolves successfully even
@@ -65,11 +76,20 @@ if not PROJECT_ENDPOINT:
     )
 
 # --- Singletons held by the harness (outside the sandbox boundary) ---------
-SESSIONS = SessionStore(root_dir=SESSION_DIR)
+SESSIONS = SessionStore(
+    root_dir=SESSION_DIR,
+    durability=SESSION_DURABILITY,
+    batch_window_ms=SESSION_BATCH_WINDOW_MS,
+)
 VAULT = CredentialVault()
 # Example: register any outbound credentials by logical name.
 VAULT.register_env("github", "GITHUB_TOKEN")
-SANDBOX = SandboxPool(vault=VAULT)
+SANDBOX = SandboxPool(
+    vault=VAULT,
+    python_pool=WarmPythonPool(size=PYTHON_POOL_SIZE, preload=PYTHON_POOL_PRELOAD),
+    max_workers=SANDBOX_MAX_WORKERS,
+    timeout_sec=SANDBOX_TIMEOUT_SEC,
+)
 
 # A single "current" session id per process for this demo. A real deployment
 # derives the session id from the incoming Responses API request header so
@@ -84,8 +104,10 @@ CURRENT_SESSION_ID = SESSIONS.create_session(
 #   execute(name, input) -> string
 # plus the session interrogation tools (get_events, emit_note). This keeps
 # the harness unopinionated about the specific hands available today.
+# The tools are coroutines: hands run on the sandbox's worker threads and the
+# session log is awaited, so one slow call never stalls the other sessions.
 
-def execute(
+async def execute(
     name: Annotated[str, "Tool name, e.g. 'python_exec', 'shell_exec', 'http_fetch'."],
     input_json: Annotated[str, "JSON-encoded arguments for the tool."],
 ) -> str:
@@ -101,13 +123,13 @@ def execute(
     except json.JSONDecodeError as e:
         return f"ERROR: invalid input_json: {e}"
 
-    SESSIONS.emit_event(
+    await SESSIONS.aemit_event(
         CURRENT_SESSION_ID,
         "tool_call",
         {"name": name, "input": VAULT.redact(payload)},
     )
-    result = SANDBOX.execute(name, payload)
-    SESSIONS.emit_event(
+    result = await SANDBOX.execute(name, payload)
+    await SESSIONS.aemit_event(
         CURRENT_SESSION_ID,
         "tool_result",
         {"name": name, "output": result[:2000]},
@@ -120,7 +142,7 @@ def list_tools() -> str:
     return json.dumps(SANDBOX.list_tools())
 
 
-def get_events(
+async def get_events(
     start: Annotated[int, "First event index to return (0-based)."] = 0,
     end: Annotated[int, "Exclusive end index; -1 means 'up to latest'."] = -1,
 ) -> str:
@@ -130,19 +152,19 @@ def get_events(
     everything in your active context window.
     """
     stop = None if end < 0 else end
-    events = SESSIONS.get_events(CURRENT_SESSION_ID, start=start, end=stop)
+    events = await asyncio.to_thread(SESSIONS.get_events, CURRENT_SESSION_ID, start, stop)
     return json.dumps([
         {"i": e.index, "type": e.type, "payload": e.payload, "ts": e.ts}
         for e in events
     ])
 
 
-def emit_note(
+async def emit_note(
     note: Annotated[str, "Free-form note to persist in the durable session log."],
 ) -> str:
     """Append a note to the session. Use this to checkpoint intermediate
     reasoning that may be useful to re-read later."""
-    ev = SESSIONS.emit_event(CURRENT_SESSION_ID, "note", {"text": note})
+    ev = await SESSIONS.aemit_event(CURRENT_SESSION_ID, "note", {"text": note})
     return f"ok (event #{ev.index})"
 
 
@@ -194,7 +216,10 @@ async def main() -> None:
         print("Managed-style Agent running on http://localhost:8088")
         print(f"Session id: {CURRENT_SESSION_ID}  (log dir: {SESSION_DIR})")
         server = ResponsesHostServer(agent)
-        await server.run_async()
+        try:
+            await server.run_async()
+        finally:
+            SANDBOX.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""SandboxPool.execute runs blocking tools off the event loop, concurrently."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from harness import CredentialVault, SandboxPool, WarmPythonPool
+
+CALLS = 4
+CALL_SEC = 0.5
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(CredentialVault(), python_pool=WarmPythonPool(size=0), max_workers=CALLS)
+    pool.register("sleep", lambda input, vault: time.sleep(input["sec"]) or "done")
+    yield pool
+    pool.close()
+
+
+def test_blocking_calls_overlap_and_loop_stays_responsive(pool):
+    async def run() -> tuple[list[str], float, int]:
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(pool.execute("sleep", {"sec": CALL_SEC}) for _ in range(CALLS))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick_task
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+
+    assert results == ["done"] * CALLS
+    # Run one after another they would take CALLS * CALL_SEC.
+    assert elapsed < CALL_SEC * 2
+    # The loop kept running its other tasks while the tools blocked.
+    assert ticks >= CALL_SEC / 0.01 / 2
+    assert pool.stats()["active"] == 0
+
+
+def test_timeout_returns_error_without_waiting_for_the_tool(pool):
+    start = time.perf_counter()
+    out = asyncio.run(pool.execute("sleep", {"sec": 1.0}, timeout=0.1))
+    assert out == "ERROR: 'sleep' timed out after 0.1s"
+    assert time.perf_counter() - start < 0.5
+
+
+def test_provision_ids_are_unique_across_threads(pool):
+    ids: list[str] = []
+    barrier = threading.Barrier(16)
+
+    def provision() -> None:
+        barrier.wait()
+        ids.append(pool.provision("python_exec"))
+
+    threads = [threading.Thread(target=provision) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(ids)) == 16
+    assert pool.stats()["active"] == 16
+    for sid in ids:
+        pool.retire(sid)
+    assert pool.stats()["active"] == 0